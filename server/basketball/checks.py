@@ -0,0 +1,30 @@
+"""
+Verificaciones de configuración del módulo Basketball (manage.py check)
+"""
+
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+@register()
+def check_cache_respuestas(app_configs, **kwargs):
+    """
+    Avisa si el cache de respuestas está activo sobre un cache en memoria local.
+
+    Las generaciones que invalidan los listados viven en ese cache (ver
+    dao/generaciones.py): con memoria local una escritura en un proceso no
+    invalida los listados cacheados en los demás workers.
+    """
+    if getattr(settings, 'RESPONSE_CACHE_TTL', 0) <= 0:
+        return []
+    alias = getattr(settings, 'RESPONSE_CACHE_BACKEND', None) or 'default'
+    backend = settings.CACHES.get(alias, {}).get('BACKEND', '')
+    if backend.endswith('LocMemCache'):
+        return [Warning(
+            f"RESPONSE_CACHE_TTL está activo sobre el cache en memoria local '{alias}'.",
+            hint="Con varios procesos los listados pueden quedar desactualizados hasta RESPONSE_CACHE_TTL "
+                 "segundos: configure RESPONSE_CACHE_BACKEND con un cache compartido (archivo, redis) "
+                 "o use RESPONSE_CACHE_TTL=0.",
+            id='basketball.W001',
+        )]
+    return []
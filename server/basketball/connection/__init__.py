@@ -1,3 +1,15 @@
 from .db_connection import DatabaseConnection, ConnectionPool
+from .persona_cache import PersonaCache
+from .user_module_client import UserModuleClient
+from .async_user_module_client import AsyncUserModuleClient
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
 
-__all__ = ['DatabaseConnection', 'ConnectionPool']
+__all__ = [
+    'DatabaseConnection',
+    'ConnectionPool',
+    'PersonaCache',
+    'UserModuleClient',
+    'AsyncUserModuleClient',
+    'CircuitBreaker',
+    'CircuitOpenError',
+]
@@ -0,0 +1,146 @@
+"""
+Cliente HTTP asíncrono para el módulo de usuarios (user_module)
+
+Variante asyncio del UserModuleClient, pensada para ejecutarse en el event
+loop de ASGI. Consulta todas las personas de una página concurrentemente
+con asyncio.gather, acotando las conexiones abiertas hacia el user_module.
+
+Cada consulta abre su propio httpx.AsyncClient y lo cierra al terminar: un
+AsyncClient queda ligado al event loop donde se usa y bajo WSGI cada
+async_to_sync corre en un loop nuevo, así que un cliente compartido entre
+llamadas dejaría conexiones sin cerrar y habría que protegerlo entre hilos.
+Las personas de una misma página comparten el pool de ese cliente.
+"""
+
+import asyncio
+import time
+import logging
+import httpx
+from .circuit_breaker import CircuitOpenError
+from ..request_metrics import record_http_call
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncUserModuleClient:
+    """
+    Cliente asíncrono del user_module basado en httpx.AsyncClient.
+
+    El token de servicio y el circuit breaker se comparten con el
+    UserModuleClient síncrono, de modo que ambos caminos (WSGI y ASGI)
+    comparten un único login y un único estado de circuito por proceso.
+
+    Uso:
+        client = AsyncUserModuleClient(sync_client)
+        responses = await client.get_personas(['uuid-1', 'uuid-2'])
+    """
+
+    def __init__(self, sync_client, max_connections=20):
+        """
+        Args:
+            sync_client: UserModuleClient que provee base_url, timeout y token
+            max_connections: Conexiones simultáneas máximas hacia el user_module
+        """
+        self.sync_client = sync_client
+        self.max_connections = max_connections
+
+    @classmethod
+    def from_settings(cls, sync_client):
+        """Construye el cliente a partir de la configuración de Django"""
+        from django.conf import settings
+
+        return cls(
+            sync_client,
+            max_connections=getattr(settings, 'USER_MODULE_ASYNC_MAX_CONNECTIONS', 20),
+        )
+
+    def _crear_cliente(self):
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+        )
+        return httpx.AsyncClient(
+            base_url=self.sync_client.base_url,
+            timeout=self.sync_client.timeout,
+            # Los límites van en el transporte: httpx ignora los del cliente si se pasa uno
+            transport=httpx.AsyncHTTPTransport(limits=limits, retries=1),
+        )
+
+    async def get_token(self):
+        """Obtiene el token compartido sin bloquear el event loop"""
+        return await asyncio.to_thread(self.sync_client.get_token)
+
+    # =========================================================================
+    # Personas
+    # =========================================================================
+
+    async def get_persona(self, persona_external, token, client=None):
+        """
+        Consulta una persona por su external_id.
+
+        Reintenta una vez con un token nuevo si el user_module responde 401.
+
+        Args:
+            persona_external: UUID externo de la persona
+            token: Token de servicio vigente
+            client: httpx.AsyncClient abierto (por defecto se abre uno para la consulta)
+
+        Returns:
+            httpx.Response | None: Respuesta del user_module o None si no se
+            pudo obtener token
+        """
+        if client is None:
+            async with self._crear_cliente() as client:
+                return await self.get_persona(persona_external, token, client)
+        response = await self._get_persona(client, persona_external, token)
+        if response.status_code == 401:
+            self.sync_client.invalidate_token(token)
+            token = await self.get_token()
+            if not token:
+                return None
+            response = await self._get_persona(client, persona_external, token)
+        return response
+
+    async def get_personas(self, persona_externals):
+        """
+        Consulta varias personas concurrentemente.
+
+        Args:
+            persona_externals: Lista de UUIDs externos
+
+        Returns:
+            dict: persona_external -> httpx.Response, None o la excepción
+            producida al consultarla
+        """
+        if not persona_externals:
+            return {}
+        token = await self.get_token()
+        if not token:
+            return {p: None for p in persona_externals}
+        async with self._crear_cliente() as client:
+            results = await asyncio.gather(
+                *(self.get_persona(p, token, client) for p in persona_externals),
+                return_exceptions=True
+            )
+        return dict(zip(persona_externals, results))
+
+    async def _get_persona(self, client, persona_external, token):
+        breaker = self.sync_client.breaker
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"Circuito {breaker.name} abierto")
+        start = time.perf_counter()
+        try:
+            response = await client.get(
+                self.sync_client.PERSONA_PATH.format(persona_external=persona_external),
+                headers={'Authorization': f'Bearer {token}'},
+            )
+        except httpx.TransportError:
+            breaker.record_failure()
+            raise
+        finally:
+            record_http_call(time.perf_counter() - start)
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
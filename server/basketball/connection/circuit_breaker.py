@@ -0,0 +1,124 @@
+"""
+Circuit breaker para las llamadas al módulo de usuarios (user_module)
+
+Tras N fallos consecutivos el circuito se abre y las llamadas fallan de
+inmediato, sin esperar el timeout. Pasado recovery_timeout se deja pasar
+una llamada de prueba (half-open) que decide si el circuito se cierra o
+vuelve a abrirse.
+"""
+
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Se lanza cuando el circuito está abierto y la llamada no se realiza"""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker thread-safe.
+
+    Uso:
+        breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=30)
+        if not breaker.allow_request():
+            raise CircuitOpenError()
+        ...
+        breaker.record_success()  # o breaker.record_failure()
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name='user_module', failure_threshold=5, recovery_timeout=30,
+                 half_open_max_calls=1, time_func=time.monotonic):
+        """
+        Args:
+            name: Nombre del circuito (para logs y métricas)
+            failure_threshold: Fallos consecutivos que abren el circuito
+            recovery_timeout: Segundos que el circuito permanece abierto
+            half_open_max_calls: Llamadas de prueba simultáneas en half-open
+            time_func: Reloj inyectable en tests
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._time = time_func
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._half_open_calls = 0
+        self.rejected = 0
+        self.transitions = {}
+
+    @property
+    def state(self):
+        with self._lock:
+            self._update_state()
+            return self._state
+
+    def allow_request(self):
+        """
+        Indica si se puede realizar la llamada.
+
+        Returns:
+            bool: False si el circuito está abierto (fail fast)
+        """
+        with self._lock:
+            self._update_state()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        """Registra una llamada exitosa"""
+        with self._lock:
+            self._failures = 0
+            if self._state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self):
+        """Registra una llamada fallida"""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._transition(self.OPEN)
+                self._opened_at = self._time()
+
+    def stats(self):
+        """
+        Obtiene el estado y los contadores del circuito.
+
+        Returns:
+            dict: state, failures, rejected y transiciones por estado destino
+        """
+        with self._lock:
+            self._update_state()
+            return {
+                'name': self.name,
+                'state': self._state,
+                'failures': self._failures,
+                'rejected': self.rejected,
+                'transitions': dict(self.transitions),
+            }
+
+    def _update_state(self):
+        if self._state == self.OPEN and self._time() - self._opened_at >= self.recovery_timeout:
+            self._transition(self.HALF_OPEN)
+
+    def _transition(self, new_state):
+        logger.warning(f"Circuito {self.name}: {self._state} -> {new_state}")
+        self._state = new_state
+        self._half_open_calls = 0
+        self.transitions[new_state] = self.transitions.get(new_state, 0) + 1
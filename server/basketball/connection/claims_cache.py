@@ -0,0 +1,126 @@
+"""
+Cache de claims de JWT ya decodificados
+
+Los clientes (tablets) envían el mismo token en miles de peticiones por
+sesión; el cache guarda los claims decodificados en un LRU acotado, con
+clave el hash SHA-256 del token (no se guardan tokens en memoria), y cada
+entrada vence en el exp del token o tras ttl segundos si no tiene exp.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+# Centinela para distinguir "no está en cache" de claims vacíos
+MISS = object()
+
+
+class ClaimsCache:
+    """
+    Cache LRU thread-safe de claims de JWT.
+
+    Uso:
+        cache = ClaimsCache(max_size=1024, ttl=300)
+        claims = cache.get(token)
+        if claims is MISS:
+            claims = jwt.decode(...)
+            cache.set(token, claims)
+    """
+
+    def __init__(self, max_size=1024, ttl=300, time_func=time.time):
+        """
+        Args:
+            max_size: Número máximo de tokens en cache (0 = desactivado)
+            ttl: Segundos de vida de los claims de un token sin exp
+            time_func: Reloj (epoch en segundos) inyectable en tests
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._time = time_func
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_settings(cls):
+        """Construye el cache a partir de la configuración de Django"""
+        from django.conf import settings
+
+        return cls(
+            max_size=getattr(settings, 'JWT_CLAIMS_CACHE_MAX_SIZE', 1024),
+            ttl=getattr(settings, 'JWT_CLAIMS_CACHE_TTL', 300),
+        )
+
+    def get(self, token):
+        """
+        Obtiene los claims de un token.
+
+        Args:
+            token: JWT tal como llega en el header Authorization
+
+        Returns:
+            dict | MISS: Claims del token, o MISS si no hay entrada vigente
+        """
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= self._time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, token, claims):
+        """
+        Guarda los claims de un token hasta su exp (o ttl si no tiene).
+
+        Args:
+            token: JWT
+            claims: Claims decodificados
+        """
+        if self.max_size <= 0:
+            return
+        exp = claims.get('exp')
+        expires_at = exp if isinstance(exp, (int, float)) else self._time() + self.ttl
+        if expires_at <= self._time():
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (claims, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Vacía el cache y reinicia los contadores"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Obtiene los contadores del cache.
+
+        Returns:
+            dict: hits, misses, evictions, size y hit_ratio
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'hit_ratio': self.hits / total if total else 0.0,
+            }
+
+    @staticmethod
+    def _key(token):
+        return hashlib.sha256(token.encode()).digest()
@@ -0,0 +1,214 @@
+"""
+Cache de datos de persona del módulo de usuarios (user_module)
+
+Proporciona un cache acotado (LRU), con expiración por entrada (TTL),
+cache negativo para personas inexistentes (404) y contadores de uso.
+Las entradas expiradas se conservan durante stale_ttl para poder servir
+el último dato conocido cuando el user_module no está disponible.
+Opcionalmente puede delegar el almacenamiento en el framework de cache de
+Django para que todos los procesos compartan un mismo cache.
+"""
+
+import threading
+import time
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Centinela para distinguir "no está en cache" de "persona inexistente" (None)
+MISS = object()
+
+
+class PersonaCache:
+    """
+    Cache thread-safe para datos de persona.
+
+    Uso:
+        cache = PersonaCache(max_size=1000, ttl=300)
+        persona = cache.get(persona_external)
+        if persona is MISS:
+            ...
+    """
+
+    def __init__(self, max_size=1024, ttl=300, negative_ttl=60, stale_ttl=86400,
+                 backend=None, key_prefix='persona:', time_func=time.time):
+        """
+        Args:
+            max_size: Número máximo de entradas en memoria (LRU)
+            ttl: Segundos de vida de una persona encontrada
+            negative_ttl: Segundos de vida de una persona no encontrada (404)
+            stale_ttl: Segundos que se conserva una entrada expirada como respaldo
+            backend: Cache de Django opcional (p. ej. caches['default'])
+            key_prefix: Prefijo de las claves en el backend de Django
+            time_func: Reloj usado para la expiración (inyectable en tests)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self.backend = backend
+        self.key_prefix = key_prefix
+        self._time = time_func
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_hits = 0
+
+    @classmethod
+    def from_settings(cls):
+        """Construye el cache a partir de la configuración de Django"""
+        from django.conf import settings
+        from django.core.cache import caches
+
+        alias = getattr(settings, 'PERSONA_CACHE_BACKEND', None)
+        return cls(
+            max_size=getattr(settings, 'PERSONA_CACHE_MAX_SIZE', 1024),
+            ttl=getattr(settings, 'PERSONA_CACHE_TTL', 300),
+            negative_ttl=getattr(settings, 'PERSONA_CACHE_NEGATIVE_TTL', 60),
+            stale_ttl=getattr(settings, 'PERSONA_CACHE_STALE_TTL', 86400),
+            backend=caches[alias] if alias else None,
+        )
+
+    # =========================================================================
+    # Lectura
+    # =========================================================================
+
+    def get(self, persona_external):
+        """
+        Obtiene una persona del cache.
+
+        Args:
+            persona_external: UUID externo de la persona
+
+        Returns:
+            dict | None | MISS: Datos de persona, None si se cacheó un 404,
+            o MISS si no hay entrada vigente
+        """
+        entry = self._get_entry(persona_external)
+        with self._lock:
+            if entry is None or entry[1] <= self._time():
+                self.misses += 1
+                return MISS
+            self.hits += 1
+            return entry[0]
+
+    def get_stale(self, persona_external):
+        """
+        Obtiene el último dato conocido de una persona, aunque haya expirado.
+
+        Pensado como respaldo cuando el user_module no responde.
+
+        Args:
+            persona_external: UUID externo de la persona
+
+        Returns:
+            dict | None | MISS: Último dato conocido o MISS si no hay
+        """
+        entry = self._get_entry(persona_external)
+        if entry is None:
+            return MISS
+        with self._lock:
+            self.stale_hits += 1
+        return entry[0]
+
+    def __contains__(self, persona_external):
+        entry = self._get_entry(persona_external)
+        return entry is not None and entry[1] > self._time()
+
+    def _get_entry(self, persona_external):
+        """Devuelve (valor, expires_at) aún dentro de la ventana stale, o None"""
+        if self.backend is not None:
+            entry = self.backend.get(self._backend_key(persona_external))
+            return (entry['value'], entry['expires_at']) if entry is not None else None
+
+        with self._lock:
+            entry = self._entries.get(persona_external)
+            if entry is None:
+                return None
+            if entry[1] + self.stale_ttl <= self._time():
+                del self._entries[persona_external]
+                return None
+            self._entries.move_to_end(persona_external)
+            return entry
+
+    # =========================================================================
+    # Escritura
+    # =========================================================================
+
+    def set(self, persona_external, persona_data, ttl=None):
+        """
+        Guarda los datos de una persona.
+
+        Args:
+            persona_external: UUID externo de la persona
+            persona_data: Datos de la persona
+            ttl: Segundos de vida (por defecto self.ttl)
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = self._time() + ttl
+        if self.backend is not None:
+            # Se envuelve el valor para poder cachear None (cache negativo)
+            self.backend.set(
+                self._backend_key(persona_external),
+                {'value': persona_data, 'expires_at': expires_at},
+                ttl + self.stale_ttl
+            )
+            return
+
+        with self._lock:
+            self._entries[persona_external] = (persona_data, expires_at)
+            self._entries.move_to_end(persona_external)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def set_not_found(self, persona_external):
+        """Registra que la persona no existe en el user_module (404)"""
+        self.set(persona_external, None, ttl=self.negative_ttl)
+
+    def invalidate(self, persona_external):
+        """Elimina una persona del cache"""
+        if self.backend is not None:
+            self.backend.delete(self._backend_key(persona_external))
+            return
+        with self._lock:
+            self._entries.pop(persona_external, None)
+
+    def clear(self):
+        """
+        Vacía el cache en memoria y reinicia los contadores.
+
+        Con un backend de Django compartido las entradas no se borran,
+        expiran por TTL.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.stale_hits = 0
+
+    # =========================================================================
+    # Métricas
+    # =========================================================================
+
+    def stats(self):
+        """
+        Obtiene los contadores del cache.
+
+        Returns:
+            dict: hits, misses, evictions, stale_hits, size y hit_ratio
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'stale_hits': self.stale_hits,
+                'size': len(self._entries) if self.backend is None else None,
+                'hit_ratio': self.hits / total if total else 0.0,
+            }
+
+    def _backend_key(self, persona_external):
+        return f"{self.key_prefix}{persona_external}"
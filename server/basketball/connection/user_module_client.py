@@ -0,0 +1,201 @@
+"""
+Cliente HTTP para el módulo de usuarios (user_module)
+
+Mantiene un pool de conexiones keep-alive sobre requests.Session para que
+las consultas de personas reutilicen las conexiones TCP en lugar de abrir
+una nueva por petición. Todas las llamadas pasan por un circuit breaker.
+"""
+
+import time
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .user_module_token import TokenManager
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from ..request_metrics import record_http_call
+
+logger = logging.getLogger(__name__)
+
+
+class UserModuleClient:
+    """
+    Cliente del user_module basado en un requests.Session con pool.
+
+    Solo reintenta (con backoff exponencial) los errores de conexión; los
+    timeouts de lectura y las respuestas HTTP se devuelven tal cual. Si el
+    circuito está abierto las llamadas lanzan CircuitOpenError sin esperar.
+
+    Uso:
+        client = UserModuleClient('http://localhost:8096')
+        response = client.get_persona(persona_external)
+    """
+
+    LOGIN_PATH = '/api/person/login'
+    PERSONA_PATH = '/api/person/search_external/{persona_external}'
+
+    def __init__(self, base_url, email='admin@admin.com', password='admin123',
+                 pool_size=10, timeout=5, max_retries=3, backoff_factor=0.2,
+                 token_refresh_margin=60, breaker=None):
+        """
+        Args:
+            base_url: URL base del user_module
+            email: Email de la cuenta de servicio
+            password: Contraseña de la cuenta de servicio
+            pool_size: Conexiones keep-alive máximas hacia el user_module
+            timeout: Timeout (segundos) de cada petición
+            max_retries: Reintentos ante errores de conexión
+            backoff_factor: Factor de backoff exponencial entre reintentos
+            token_refresh_margin: Segundos antes de exp en que se renueva el token
+            breaker: CircuitBreaker a usar (por defecto uno con valores estándar)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.email = email
+        self.password = password
+        self.timeout = timeout
+        self.session = self._build_session(pool_size, max_retries, backoff_factor)
+        self.breaker = breaker or CircuitBreaker(name='user_module')
+        self.tokens = TokenManager(self.login, refresh_margin=token_refresh_margin)
+
+    @classmethod
+    def from_settings(cls):
+        """Construye el cliente a partir de la configuración de Django"""
+        from django.conf import settings
+
+        return cls(
+            base_url=getattr(settings, 'USER_MODULE_URL', 'http://localhost:8096'),
+            email=getattr(settings, 'USER_MODULE_EMAIL', 'admin@admin.com'),
+            password=getattr(settings, 'USER_MODULE_PASSWORD', 'admin123'),
+            pool_size=getattr(settings, 'USER_MODULE_POOL_SIZE', 10),
+            timeout=getattr(settings, 'USER_MODULE_TIMEOUT', 5),
+            max_retries=getattr(settings, 'USER_MODULE_MAX_RETRIES', 3),
+            backoff_factor=getattr(settings, 'USER_MODULE_RETRY_BACKOFF', 0.2),
+            token_refresh_margin=getattr(settings, 'USER_MODULE_TOKEN_REFRESH_MARGIN', 60),
+            breaker=CircuitBreaker(
+                name='user_module',
+                failure_threshold=getattr(settings, 'USER_MODULE_BREAKER_FAILURE_THRESHOLD', 5),
+                recovery_timeout=getattr(settings, 'USER_MODULE_BREAKER_RECOVERY_TIMEOUT', 30),
+            ),
+        )
+
+    @staticmethod
+    def _build_session(pool_size, max_retries, backoff_factor):
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=backoff_factor,
+            allowed_methods=None,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'Connection': 'keep-alive'})
+        return session
+
+    # =========================================================================
+    # Token
+    # =========================================================================
+
+    def login(self):
+        """
+        Inicia sesión en el user_module.
+
+        Returns:
+            str | None: Token (sin prefijo "Bearer ") o None si falló
+        """
+        response = self._request(
+            'POST',
+            self.LOGIN_PATH,
+            json={'email': self.email, 'password': self.password}
+        )
+        if response.status_code != 200:
+            logger.warning(f"Login en user_module falló con estado {response.status_code}")
+            return None
+        token = response.json().get('data', {}).get('token', '')
+        # El token ya viene con el prefijo "Bearer "
+        return token[len('Bearer '):] if token.startswith('Bearer ') else token
+
+    def get_token(self):
+        """Obtiene el token vigente (login single-flight si no existe)"""
+        return self.tokens.get_token()
+
+    def invalidate_token(self, token=None):
+        """
+        Descarta el token cacheado.
+
+        Args:
+            token: Si se indica, solo se descarta si sigue siendo el vigente
+        """
+        self.tokens.invalidate(token)
+
+    # =========================================================================
+    # Personas
+    # =========================================================================
+
+    def get_persona(self, persona_external):
+        """
+        Consulta una persona por su external_id.
+
+        Reintenta una vez con un token nuevo si el user_module responde 401.
+
+        Args:
+            persona_external: UUID externo de la persona
+
+        Returns:
+            requests.Response | None: Respuesta del user_module o None si
+            no se pudo obtener token
+        """
+        token = self.get_token()
+        if not token:
+            return None
+        response = self._get_persona(persona_external, token)
+        if response.status_code == 401:
+            self.invalidate_token(token)
+            token = self.get_token()
+            if not token:
+                return None
+            response = self._get_persona(persona_external, token)
+        return response
+
+    def _get_persona(self, persona_external, token):
+        return self._request(
+            'GET',
+            self.PERSONA_PATH.format(persona_external=persona_external),
+            headers={'Authorization': f'Bearer {token}'}
+        )
+
+    def _request(self, method, path, **kwargs):
+        """
+        Ejecuta una petición a través del circuit breaker.
+
+        Los errores de red y las respuestas 5xx cuentan como fallo.
+
+        Raises:
+            CircuitOpenError: Si el circuito está abierto
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(f"Circuito {self.breaker.name} abierto")
+        start = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, f'{self.base_url}{path}', timeout=self.timeout, **kwargs
+            )
+        except requests.RequestException:
+            self.breaker.record_failure()
+            raise
+        finally:
+            record_http_call(time.perf_counter() - start)
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    def close(self):
+        """Cierra las conexiones del pool"""
+        self.session.close()
@@ -0,0 +1,131 @@
+"""
+Gestión del token de servicio del módulo de usuarios (user_module)
+
+Lee la expiración (claim exp) del JWT y lo renueva en segundo plano poco
+antes de que expire. El login es single-flight: por proceso solo hay una
+petición de login en curso y el resto de hilos reutiliza su resultado.
+"""
+
+import threading
+import time
+import logging
+import jwt
+
+logger = logging.getLogger(__name__)
+
+
+class TokenManager:
+    """
+    Cache del token del user_module con renovación proactiva.
+
+    Uso:
+        manager = TokenManager(login_func=client.login, refresh_margin=60)
+        token = manager.get_token()
+    """
+
+    def __init__(self, login_func, refresh_margin=60, time_func=time.time):
+        """
+        Args:
+            login_func: Función sin argumentos que devuelve un token o None
+            refresh_margin: Segundos antes de exp en que se renueva el token
+            time_func: Reloj (epoch en segundos) inyectable en tests
+        """
+        self._login_func = login_func
+        self.refresh_margin = refresh_margin
+        self._time = time_func
+        self._token = None
+        self._expires_at = None
+        self._login_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._refreshing = False
+
+    @staticmethod
+    def get_expiration(token):
+        """
+        Obtiene la expiración del token.
+
+        Args:
+            token: JWT (sin prefijo "Bearer ")
+
+        Returns:
+            float | None: exp en epoch o None si no es un JWT con exp
+        """
+        try:
+            payload = jwt.decode(token, options={'verify_signature': False})
+        except jwt.PyJWTError:
+            return None
+        exp = payload.get('exp')
+        return float(exp) if exp is not None else None
+
+    # =========================================================================
+    # Token
+    # =========================================================================
+
+    def get_token(self):
+        """
+        Obtiene un token vigente.
+
+        Si el token está por expirar se devuelve el actual y se renueva en
+        segundo plano; si ya expiró (o no existe) se hace login single-flight.
+
+        Returns:
+            str | None: Token o None si el login falló
+        """
+        token, expires_at = self._token, self._expires_at
+        if token:
+            if expires_at is None:
+                return token
+            remaining = expires_at - self._time()
+            if remaining > self.refresh_margin:
+                return token
+            if remaining > 0:
+                self._refresh_in_background()
+                return token
+        return self._login(stale_token=token)
+
+    def invalidate(self, token=None):
+        """
+        Descarta el token cacheado.
+
+        Args:
+            token: Si se indica, solo se descarta si sigue siendo el vigente
+        """
+        with self._state_lock:
+            if token is None or self._token == token:
+                self._token = None
+                self._expires_at = None
+
+    def _login(self, stale_token=None):
+        with self._login_lock:
+            # Otro hilo pudo haber renovado el token mientras se esperaba el lock
+            current = self._token
+            if current and current != stale_token and not self._is_expired():
+                return current
+            token = self._login_func()
+            with self._state_lock:
+                self._token = token
+                self._expires_at = self.get_expiration(token) if token else None
+            if token:
+                logger.info("Token del user_module renovado")
+            return token
+
+    def _is_expired(self):
+        return self._expires_at is not None and self._expires_at <= self._time()
+
+    def _refresh_in_background(self):
+        with self._state_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        stale_token = self._token
+
+        def refresh():
+            try:
+                self._login(stale_token=stale_token)
+            except Exception as e:
+                logger.error(f"Error renovando token del user_module: {e}")
+            finally:
+                with self._state_lock:
+                    self._refreshing = False
+
+        threading.Thread(target=refresh, name='user-module-token-refresh', daemon=True).start()
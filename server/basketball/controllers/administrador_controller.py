@@ -3,6 +3,9 @@ from rest_framework.response import Response
 from ..services.administrador_service import AdministradorService
 from ..serializers import AdministradorSerializer
 from ..permissions import IsAdmin
+from .pagination import paginate_list
+from .condicional import respuesta_condicional
+from .cache_respuestas import respuesta_cacheada
 
 class AdministradorController(viewsets.ViewSet):
     """
@@ -12,7 +15,12 @@ class AdministradorController(viewsets.ViewSet):
     permission_classes = [IsAdmin]
     service = AdministradorService()
 
+    @respuesta_condicional('get_validador_listado')
+    @respuesta_cacheada()
     def list(self, request):
+        paginated = paginate_list(request, self.service.get_administradores_paginated, AdministradorSerializer)
+        if paginated is not None:
+            return paginated
         administradores = self.service.get_all_administradores()
         serializer = AdministradorSerializer(administradores, many=True)
         return Response(serializer.data)
@@ -26,6 +34,7 @@ class AdministradorController(viewsets.ViewSet):
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    @respuesta_condicional('get_validador')
     def retrieve(self, request, pk=None):
         administrador = self.service.get_administrador_by_id(pk)
         if not administrador:
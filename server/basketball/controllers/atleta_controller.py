@@ -1,9 +1,14 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from django.core.exceptions import ValidationError
 from ..services.atleta_service import AtletaService
 from ..serializers import AtletaSerializer
-from ..permissions import IsAdminOrEntrenadorOrPasante
+from ..permissions import IsAdminOrEntrenadorOrPasante, IsAdminOrEntrenador
+from .pagination import paginate_list
+from .condicional import respuesta_condicional
+from .cache_respuestas import respuesta_cacheada
+from .exportacion import get_filtros_exportacion, exportar_streaming
 
 class AtletaController(viewsets.ViewSet):
     """
@@ -13,7 +18,12 @@ class AtletaController(viewsets.ViewSet):
     permission_classes = [IsAdminOrEntrenadorOrPasante]
     service = AtletaService()
 
+    @respuesta_condicional('get_validador_listado')
+    @respuesta_cacheada()
     def list(self, request):
+        paginated = paginate_list(request, self.service.get_atletas_paginated, AtletaSerializer)
+        if paginated is not None:
+            return paginated
         atletas = self.service.get_all_atletas()
         serializer = AtletaSerializer(atletas, many=True)
         return Response(serializer.data)
@@ -27,6 +37,7 @@ class AtletaController(viewsets.ViewSet):
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    @respuesta_condicional('get_validador')
     def retrieve(self, request, pk=None):
         atleta = self.service.get_atleta_by_id(pk)
         if not atleta:
@@ -61,3 +72,27 @@ class AtletaController(viewsets.ViewSet):
         if success:
             return Response({'status': 'Grupo asignado correctamente'})
         return Response({'error': 'No se pudo asignar el grupo'}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAdminOrEntrenador])
+    def membresias(self, request):
+        """
+        Agrega y quita atletas de grupos en lote, en una sola transacción:
+        {"agregar": [{"atleta": 1, "grupo": 2}, ...], "quitar": [...]}
+        """
+        try:
+            resultado = self.service.actualizar_membresias(
+                request.data.get('agregar', []), request.data.get('quitar', [])
+            )
+            return Response(resultado)
+        except ValidationError as e:
+            return Response({'error': ' '.join(e.messages)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['get'])
+    def exportar(self, request):
+        """Exporta los atletas activos en CSV/NDJSON (?formato=) filtrados por ?sexo=, ?edad_min=, ?edad_max= o ?grupo="""
+        try:
+            filtros = get_filtros_exportacion(request, ['sexo', 'edad_min', 'edad_max', 'grupo'])
+            columnas, filas = self.service.exportar_atletas(**filtros)
+            return exportar_streaming(request, 'atletas', columnas, filas)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
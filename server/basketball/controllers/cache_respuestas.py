@@ -0,0 +1,100 @@
+"""
+Cache de respuestas de las acciones list, invalidado por generación.
+
+La respuesta serializada de un listado se guarda en el cache de Django
+(RESPONSE_CACHE_BACKEND) con una clave formada por la ruta, los parámetros
+de la petición, el rol y la generación del modelo del service (ver
+dao/generaciones.py). Una escritura del modelo cambia su generación y con
+ella la clave, así que nunca se sirve un listado anterior a la escritura y
+no hace falta enumerar ni borrar entradas. RESPONSE_CACHE_TTL = 0 lo desactiva.
+"""
+
+import hashlib
+import threading
+from collections import defaultdict
+from functools import wraps
+from django.conf import settings
+from rest_framework.response import Response
+from ..dao.generaciones import get_cache, get_generaciones
+from ..permissions import get_request_role
+
+_lock = threading.Lock()
+_contadores = defaultdict(lambda: {'hits': 0, 'misses': 0})
+
+
+def respuesta_cacheada(datos_externos: bool = False):
+    """
+    Decorador de list que sirve la respuesta desde el cache si el modelo no cambió.
+
+    Args:
+        datos_externos: La respuesta incluye datos del módulo de usuarios; el TTL
+            se limita a PERSONA_CACHE_TTL para no servirlos más tiempo que su cache
+    """
+    def decorador(view):
+        @wraps(view)
+        def wrapper(self, request, *args, **kwargs):
+            ttl = getattr(settings, 'RESPONSE_CACHE_TTL', 60)
+            if datos_externos:
+                ttl = min(ttl, getattr(settings, 'PERSONA_CACHE_TTL', 300))
+            if ttl <= 0:
+                return view(self, request, *args, **kwargs)
+
+            cache = get_cache()
+            ruta = getattr(self, 'basename', None) or type(self).__name__
+            clave = _calcular_clave(request, ruta, get_generaciones([self.service.dao.model]))
+            datos = cache.get(clave)
+            if datos is not None:
+                _contar(ruta, 'hits')
+                return Response(datos)
+
+            _contar(ruta, 'misses')
+            response = view(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(clave, response.data, ttl)
+            return response
+        return wrapper
+    return decorador
+
+
+def stats():
+    """
+    Obtiene los aciertos del cache de respuestas del proceso.
+
+    Returns:
+        dict: hits, misses y hit_ratio totales y por listado
+    """
+    with _lock:
+        por_ruta = {ruta: _con_ratio(dict(valores)) for ruta, valores in _contadores.items()}
+    total = _con_ratio({
+        'hits': sum(valores['hits'] for valores in por_ruta.values()),
+        'misses': sum(valores['misses'] for valores in por_ruta.values()),
+    })
+    return {**total, 'listados': por_ruta}
+
+
+def reset_stats():
+    """Reinicia los contadores (no borra las respuestas cacheadas)"""
+    with _lock:
+        _contadores.clear()
+
+
+def _contar(ruta: str, campo: str) -> None:
+    with _lock:
+        _contadores[ruta][campo] += 1
+
+
+def _con_ratio(valores):
+    total = valores['hits'] + valores['misses']
+    valores['hit_ratio'] = valores['hits'] / total if total else 0.0
+    return valores
+
+
+def _calcular_clave(request, ruta: str, generaciones) -> str:
+    partes = [
+        request.path,
+        repr(sorted(request.query_params.lists())),
+        getattr(request.accepted_renderer, 'format', ''),
+        get_request_role(request) or '',
+        ','.join(str(generacion) for generacion in generaciones),
+    ]
+    return f"respuesta:{ruta}:{hashlib.md5('|'.join(partes).encode()).hexdigest()}"
@@ -0,0 +1,78 @@
+"""
+Respuestas condicionales (ETag/Last-Modified) para las acciones list y retrieve.
+
+Antes de ejecutar la acción se pide al service un validador barato del
+listado o del registro (COUNT + MAX(fecha_actualizacion), ver
+GenericDAO.get_validador). Si el cliente envía If-None-Match o
+If-Modified-Since y el recurso no cambió se responde 304 sin consultar las
+filas ni serializar el cuerpo; si cambió, la respuesta 200 lleva el ETag y
+el Last-Modified nuevos.
+
+El ETag incluye la ruta y los parámetros de la petición (página, cursor,
+page_size), así que cada página de un listado tiene el suyo.
+"""
+
+import hashlib
+import time
+from functools import wraps
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def respuesta_condicional(validador: str, datos_externos: bool = False):
+    """
+    Decorador de list/retrieve que responde 304 si el recurso no cambió.
+
+    Args:
+        validador: Método del service que devuelve {'total', 'ultima_modificacion'};
+            recibe el pk en retrieve y nada en list
+        datos_externos: La respuesta incluye datos del módulo de usuarios que pueden
+            cambiar sin tocar la base de datos local. El ETag se renueva cada
+            PERSONA_CACHE_TTL segundos y no se envía Last-Modified.
+    """
+    def decorador(view):
+        @wraps(view)
+        def wrapper(self, request, *args, **kwargs):
+            argumentos = [kwargs['pk']] if 'pk' in kwargs else []
+            try:
+                estado = getattr(self.service, validador)(*argumentos)
+            except (ValueError, ValidationError):
+                # pk con formato inválido: la acción responde el error
+                return view(self, request, *args, **kwargs)
+
+            etag = _calcular_etag(request, estado, datos_externos)
+            ultima_modificacion = estado['ultima_modificacion']
+            last_modified = None
+            if ultima_modificacion is not None and not datos_externos:
+                last_modified = int(ultima_modificacion.timestamp())
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is not None:
+                response['ETag'] = etag
+                return response
+
+            response = view(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                response['ETag'] = etag
+                if last_modified is not None:
+                    response['Last-Modified'] = http_date(last_modified)
+            return response
+        return wrapper
+    return decorador
+
+
+def _calcular_etag(request, estado, datos_externos: bool) -> str:
+    ultima_modificacion = estado['ultima_modificacion']
+    partes = [
+        request.path,
+        repr(sorted(request.query_params.lists())),
+        getattr(request.accepted_renderer, 'format', ''),
+        str(estado['total']),
+        ultima_modificacion.isoformat() if ultima_modificacion else '',
+    ]
+    if datos_externos:
+        ttl = max(getattr(settings, 'PERSONA_CACHE_TTL', 300), 1)
+        partes.append(str(int(time.time() // ttl)))
+    return '"%s"' % hashlib.md5('|'.join(partes).encode()).hexdigest()
@@ -4,6 +4,9 @@ from rest_framework.permissions import IsAuthenticated
 from ..services.entrenador_service import EntrenadorService
 from ..serializers import EntrenadorSerializer
 from ..permissions import IsAdmin, IsAdminOrEntrenadorOrPasante
+from .pagination import paginate_list
+from .condicional import respuesta_condicional
+from .cache_respuestas import respuesta_cacheada
 
 class EntrenadorController(viewsets.ViewSet):
     """
@@ -17,7 +20,12 @@ class EntrenadorController(viewsets.ViewSet):
             return [IsAdminOrEntrenadorOrPasante()]
         return [IsAdmin()]
 
+    @respuesta_condicional('get_validador_listado', datos_externos=True)
+    @respuesta_cacheada(datos_externos=True)
     def list(self, request):
+        paginated = paginate_list(request, self.service.get_entrenadores_paginated, EntrenadorSerializer)
+        if paginated is not None:
+            return paginated
         entrenadores = self.service.get_all_entrenadores()
         serializer = EntrenadorSerializer(entrenadores, many=True)
         return Response(serializer.data)
@@ -31,6 +39,7 @@ class EntrenadorController(viewsets.ViewSet):
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    @respuesta_condicional('get_validador', datos_externos=True)
     def retrieve(self, request, pk=None):
         entrenador = self.service.get_entrenador_by_id(pk)
         if not entrenador:
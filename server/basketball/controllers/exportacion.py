@@ -0,0 +1,131 @@
+"""
+Exportación CSV/NDJSON en streaming para las acciones exportar de los controllers.
+
+Las filas llegan del service como un iterador de tuplas (values_list +
+iterator) y se escriben a la respuesta a medida que se leen, así que la
+memoria no depende de la cantidad de filas exportadas. El formato se elige
+con ?formato=csv (por defecto) o ?formato=ndjson (?format lo reserva DRF).
+"""
+
+import csv
+import json
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+# Líneas por bloque escrito a la respuesta (evita un write por fila)
+LINEAS_POR_BLOQUE = 500
+
+FORMATOS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def _fecha(valor: str) -> date:
+    return date.fromisoformat(valor)
+
+
+def _booleano(valor: str) -> bool:
+    if valor.lower() not in ('true', 'false', '1', '0'):
+        raise ValueError(valor)
+    return valor.lower() in ('true', '1')
+
+
+# Parámetro de la petición -> (argumento de get_para_exportar, conversión)
+FILTROS = {
+    'fecha_desde': ('fecha_inicio', _fecha),
+    'fecha_hasta': ('fecha_fin', _fecha),
+    'tipo': (None, str.upper),
+    'grupo': ('grupo_id', int),
+    'atleta': ('atleta_id', int),
+    'sexo': (None, str.upper),
+    'edad_min': (None, int),
+    'edad_max': (None, int),
+    'habilitada': (None, _booleano),
+}
+
+
+def get_filtros_exportacion(request, permitidos: List[str], alias: Dict[str, str] = None) -> Dict[str, Any]:
+    """
+    Lee los filtros de la exportación de la petición.
+
+    Args:
+        request: Petición de DRF
+        permitidos: Parámetros de FILTROS que acepta el endpoint
+        alias: Nombre del argumento en el DAO cuando difiere del de FILTROS (p.ej. tipo -> tipo_prueba)
+
+    Returns:
+        Dict[str, Any]: Argumentos para el get_para_exportar del DAO
+
+    Raises:
+        ValueError: Si un filtro no tiene el formato esperado
+    """
+    alias = alias or {}
+    filtros = {}
+    for parametro in permitidos:
+        valor = request.query_params.get(parametro)
+        if valor in (None, ''):
+            continue
+        argumento, convertir = FILTROS[parametro]
+        try:
+            filtros[alias.get(parametro, argumento or parametro)] = convertir(valor)
+        except ValueError:
+            raise ValueError(f"Valor inválido para {parametro}: '{valor}'")
+    return filtros
+
+
+def exportar_streaming(request, nombre: str, columnas: List[str], filas: Iterable[tuple]) -> StreamingHttpResponse:
+    """
+    Construye la respuesta en streaming con las filas exportadas.
+
+    Args:
+        request: Petición de DRF (?formato=csv|ndjson)
+        nombre: Nombre base del archivo descargado
+        columnas: Encabezados/claves en el orden de las tuplas
+        filas: Iterador de tuplas
+
+    Returns:
+        StreamingHttpResponse: Respuesta con Content-Disposition de descarga
+
+    Raises:
+        ValueError: Si el formato no es soportado
+    """
+    formato = request.query_params.get('formato', 'csv').lower()
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato no soportado, use {' o '.join(FORMATOS)}")
+    lineas = (_csv if formato == 'csv' else _ndjson)(columnas, filas)
+    response = StreamingHttpResponse(_agrupar(lineas), content_type=FORMATOS[formato])
+    response['Content-Disposition'] = f'attachment; filename="{nombre}.{formato}"'
+    return response
+
+
+class _Eco:
+    """Buffer de csv.writer que devuelve la línea en vez de guardarla"""
+
+    def write(self, valor: str) -> str:
+        return valor
+
+
+def _csv(columnas: List[str], filas: Iterable[tuple]) -> Iterator[str]:
+    writer = csv.writer(_Eco())
+    yield writer.writerow(columnas)
+    for fila in filas:
+        yield writer.writerow(fila)
+
+
+def _ndjson(columnas: List[str], filas: Iterable[tuple]) -> Iterator[str]:
+    for fila in filas:
+        yield json.dumps(dict(zip(columnas, fila)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def _agrupar(lineas: Iterator[str]) -> Iterator[str]:
+    bloque = []
+    for linea in lineas:
+        bloque.append(linea)
+        if len(bloque) == LINEAS_POR_BLOQUE:
+            yield ''.join(bloque)
+            bloque = []
+    if bloque:
+        yield ''.join(bloque)
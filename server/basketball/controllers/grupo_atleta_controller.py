@@ -4,6 +4,9 @@ from rest_framework.decorators import action
 from ..services.grupo_atleta_service import GrupoAtletaService
 from ..serializers import GrupoAtletaSerializer, AtletaSerializer
 from ..permissions import IsAdmin, IsAdminOrEntrenadorOrPasante, IsAdminOrEntrenador
+from .pagination import paginate_list
+from .condicional import respuesta_condicional
+from .cache_respuestas import respuesta_cacheada
 
 class GrupoAtletaController(viewsets.ViewSet):
     """
@@ -15,9 +18,16 @@ class GrupoAtletaController(viewsets.ViewSet):
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
             return [IsAdminOrEntrenadorOrPasante()]
+        if self.action == 'asignacion_por_edad':
+            return [IsAdminOrEntrenador()]
         return [IsAdmin()]
 
+    @respuesta_condicional('get_validador_listado')
+    @respuesta_cacheada()
     def list(self, request):
+        paginated = paginate_list(request, self.service.get_grupos_paginated, GrupoAtletaSerializer)
+        if paginated is not None:
+            return paginated
         grupos = self.service.get_all_grupos()
         serializer = GrupoAtletaSerializer(grupos, many=True)
         return Response(serializer.data)
@@ -31,6 +41,7 @@ class GrupoAtletaController(viewsets.ViewSet):
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    @respuesta_condicional('get_validador')
     def retrieve(self, request, pk=None):
         grupo = self.service.get_grupo_by_id(pk)
         if not grupo:
@@ -61,7 +72,7 @@ class GrupoAtletaController(viewsets.ViewSet):
         grupo = self.service.get_grupo_by_id(pk)
         if not grupo:
             return Response({'error': 'Grupo no encontrado'}, status=status.HTTP_404_NOT_FOUND)
-        atletas = grupo.atletas.all()
+        atletas = self.service.get_atletas_de_grupo(grupo.pk)
         serializer = AtletaSerializer(atletas, many=True)
         return Response(serializer.data)
 
@@ -77,3 +88,14 @@ class GrupoAtletaController(viewsets.ViewSet):
             return Response(serializer.data)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['post'])
+    def asignacion_por_edad(self, request):
+        """
+        Asigna los atletas sin grupo según su edad. Por defecto solo devuelve
+        el plan; con {"aplicar": true} lo guarda.
+        """
+        aplicar = request.data.get('aplicar', False)
+        if isinstance(aplicar, str):
+            aplicar = aplicar.lower() in ('true', '1')
+        return Response(self.service.asignar_por_edad(aplicar=bool(aplicar)))
@@ -1,8 +1,13 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
+from rest_framework.decorators import action
 from ..services.inscripcion_service import InscripcionService
 from ..serializers import InscripcionSerializer
 from ..permissions import IsAdminOrEntrenadorOrPasante
+from .pagination import paginate_list
+from .condicional import respuesta_condicional
+from .cache_respuestas import respuesta_cacheada
+from .exportacion import get_filtros_exportacion, exportar_streaming
 
 class InscripcionController(viewsets.ViewSet):
     """
@@ -12,7 +17,12 @@ class InscripcionController(viewsets.ViewSet):
     permission_classes = [IsAdminOrEntrenadorOrPasante]
     service = InscripcionService()
 
+    @respuesta_condicional('get_validador_listado')
+    @respuesta_cacheada()
     def list(self, request):
+        paginated = paginate_list(request, self.service.get_inscripciones_paginated, InscripcionSerializer)
+        if paginated is not None:
+            return paginated
         inscripciones = self.service.get_all_inscripciones()
         serializer = InscripcionSerializer(inscripciones, many=True)
         return Response(serializer.data)
@@ -29,6 +39,7 @@ class InscripcionController(viewsets.ViewSet):
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    @respuesta_condicional('get_validador')
     def retrieve(self, request, pk=None):
         inscripcion = self.service.get_inscripcion_by_id(pk)
         if not inscripcion:
@@ -55,3 +66,13 @@ class InscripcionController(viewsets.ViewSet):
         if not success:
             return Response({'error': 'Inscripción no encontrada'}, status=status.HTTP_404_NOT_FOUND)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['get'])
+    def exportar(self, request):
+        """Exporta las inscripciones en CSV/NDJSON (?formato=) filtradas por ?fecha_desde=, ?fecha_hasta=, ?tipo=, ?habilitada= o ?grupo="""
+        try:
+            filtros = get_filtros_exportacion(request, ['fecha_desde', 'fecha_hasta', 'tipo', 'habilitada', 'grupo'])
+            columnas, filas = self.service.exportar_inscripciones(**filtros)
+            return exportar_streaming(request, 'inscripciones', columnas, filas)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
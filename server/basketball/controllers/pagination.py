@@ -0,0 +1,88 @@
+"""
+Paginación opcional para las acciones list de los controllers.
+
+Se activa solo si la petición incluye ?page= o ?page_size=; sin esos
+parámetros los controllers mantienen la respuesta original (lista completa).
+Los controllers de tablas históricas aceptan además ?cursor= para paginar
+por keyset (el primer request usa ?cursor= vacío).
+"""
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def get_pagination_params(request):
+    """
+    Lee los parámetros de paginación de la petición.
+
+    Args:
+        request: Petición de DRF
+
+    Returns:
+        tuple | None: (page, page_size) o None si no se pidió paginación
+
+    Raises:
+        ValueError: Si page o page_size no son enteros positivos
+    """
+    params = request.query_params
+    if 'page' not in params and 'page_size' not in params:
+        return None
+
+    try:
+        page = int(params.get('page', 1))
+    except (TypeError, ValueError):
+        raise ValueError("page y page_size deben ser números enteros")
+    if page < 1:
+        raise ValueError("page y page_size deben ser mayores a 0")
+    return page, get_page_size(request)
+
+
+def get_page_size(request):
+    """
+    Lee page_size de la petición, acotado por PAGINATION_MAX_PAGE_SIZE.
+
+    Raises:
+        ValueError: Si page_size no es un entero positivo
+    """
+    default_size = getattr(settings, 'PAGINATION_DEFAULT_PAGE_SIZE', 20)
+    max_size = getattr(settings, 'PAGINATION_MAX_PAGE_SIZE', 100)
+    try:
+        page_size = int(request.query_params.get('page_size', default_size))
+    except (TypeError, ValueError):
+        raise ValueError("page y page_size deben ser números enteros")
+    if page_size < 1:
+        raise ValueError("page y page_size deben ser mayores a 0")
+    return min(page_size, max_size)
+
+
+def paginate_list(request, get_page, serializer_class, get_cursor_page=None):
+    """
+    Responde una página de resultados si la petición la solicita.
+
+    Args:
+        request: Petición de DRF
+        get_page: Método del servicio que recibe (page, page_size)
+        serializer_class: Serializer de los elementos
+        get_cursor_page: Método del servicio que recibe (cursor, page_size,
+            include_total); habilita la paginación por cursor
+
+    Returns:
+        Response | None: Respuesta paginada, o None si no se pidió paginación
+    """
+    try:
+        if get_cursor_page is not None and 'cursor' in request.query_params:
+            include_total = request.query_params.get('include_total', '').lower() in ('1', 'true')
+            result = get_cursor_page(
+                request.query_params.get('cursor') or None, get_page_size(request), include_total
+            )
+        else:
+            pagination = get_pagination_params(request)
+            if pagination is None:
+                return None
+            result = get_page(*pagination)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    result['items'] = serializer_class(result['items'], many=True).data
+    return Response(result)
@@ -3,6 +3,9 @@ from rest_framework.response import Response
 from ..services.pasante_service import PasanteService
 from ..serializers import PasanteSerializer
 from ..permissions import IsAdmin, IsAdminOrEntrenadorOrPasante
+from .pagination import paginate_list
+from .condicional import respuesta_condicional
+from .cache_respuestas import respuesta_cacheada
 
 class PasanteController(viewsets.ViewSet):
     """
@@ -16,7 +19,12 @@ class PasanteController(viewsets.ViewSet):
             return [IsAdminOrEntrenadorOrPasante()]
         return [IsAdmin()]
 
+    @respuesta_condicional('get_validador_listado', datos_externos=True)
+    @respuesta_cacheada(datos_externos=True)
     def list(self, request):
+        paginated = paginate_list(request, self.service.get_pasantes_paginated, PasanteSerializer)
+        if paginated is not None:
+            return paginated
         pasantes = self.service.get_all_pasantes()
         serializer = PasanteSerializer(pasantes, many=True)
         return Response(serializer.data)
@@ -30,6 +38,7 @@ class PasanteController(viewsets.ViewSet):
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    @respuesta_condicional('get_validador', datos_externos=True)
     def retrieve(self, request, pk=None):
         pasante = self.service.get_pasante_by_id(pk)
         if not pasante:
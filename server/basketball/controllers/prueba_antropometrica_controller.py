@@ -1,8 +1,15 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from django.core.exceptions import ValidationError
 from ..services.prueba_antropometrica_service import PruebaAntropometricaService
 from ..serializers import PruebaAntropometricaSerializer
 from ..permissions import IsAdminOrEntrenadorOrPasante
+from .pagination import paginate_list
+from .condicional import respuesta_condicional
+from .cache_respuestas import respuesta_cacheada
+from .exportacion import get_filtros_exportacion, exportar_streaming
 
 class PruebaAntropometricaController(viewsets.ViewSet):
     """
@@ -12,7 +19,15 @@ class PruebaAntropometricaController(viewsets.ViewSet):
     permission_classes = [IsAdminOrEntrenadorOrPasante]
     service = PruebaAntropometricaService()
 
+    @respuesta_condicional('get_validador_listado')
+    @respuesta_cacheada()
     def list(self, request):
+        paginated = paginate_list(
+            request, self.service.get_pruebas_paginated, PruebaAntropometricaSerializer,
+            get_cursor_page=self.service.get_pruebas_cursor
+        )
+        if paginated is not None:
+            return paginated
         pruebas = self.service.get_all_pruebas()
         serializer = PruebaAntropometricaSerializer(pruebas, many=True)
         return Response(serializer.data)
@@ -29,6 +44,7 @@ class PruebaAntropometricaController(viewsets.ViewSet):
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    @respuesta_condicional('get_validador')
     def retrieve(self, request, pk=None):
         prueba = self.service.get_prueba_by_id(pk)
         if not prueba:
@@ -55,3 +71,35 @@ class PruebaAntropometricaController(viewsets.ViewSet):
         if not success:
             return Response({'error': 'Prueba no encontrada'}, status=status.HTTP_404_NOT_FOUND)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['get'])
+    def estadisticas_grupo(self, request):
+        """Estadísticas antropométricas por atleta y totales de un grupo (?grupo=1)"""
+        try:
+            grupo_id = int(request.query_params['grupo'])
+        except (KeyError, ValueError):
+            return Response({'error': 'Debe indicar el ID numérico del grupo'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.service.get_estadisticas_grupo(grupo_id))
+
+    @action(detail=False, methods=['post'], parser_classes=[MultiPartParser])
+    def importar(self, request):
+        """Importación masiva desde un archivo CSV/XLSX (campo 'archivo') con reporte de errores por fila"""
+        archivo = request.FILES.get('archivo')
+        if archivo is None:
+            return Response({'error': 'Debe adjuntar el archivo en el campo archivo'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            reporte = self.service.importar_pruebas(archivo)
+        except ValidationError as e:
+            return Response({'error': ' '.join(e.messages)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(reporte)
+
+    @action(detail=False, methods=['get'])
+    def exportar(self, request):
+        """Exporta el historial en CSV/NDJSON (?formato=) filtrado por ?fecha_desde=, ?fecha_hasta=, ?grupo= o ?atleta="""
+        try:
+            filtros = get_filtros_exportacion(request, ['fecha_desde', 'fecha_hasta', 'grupo', 'atleta'])
+            columnas, filas = self.service.exportar_pruebas(**filtros)
+            return exportar_streaming(request, 'pruebas_antropometricas', columnas, filas)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
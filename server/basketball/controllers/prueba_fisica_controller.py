@@ -1,8 +1,16 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from django.core.exceptions import ValidationError
 from ..services.prueba_fisica_service import PruebaFisicaService
-from ..serializers import PruebaFisicaSerializer
+from ..services.ranking_service import RankingService
+from ..serializers import PruebaFisicaSerializer, RankingPruebaFisicaSerializer
 from ..permissions import IsAdminOrEntrenadorOrPasante
+from .pagination import paginate_list
+from .condicional import respuesta_condicional
+from .cache_respuestas import respuesta_cacheada
+from .exportacion import get_filtros_exportacion, exportar_streaming
 
 class PruebaFisicaController(viewsets.ViewSet):
     """
@@ -11,8 +19,17 @@ class PruebaFisicaController(viewsets.ViewSet):
     """
     permission_classes = [IsAdminOrEntrenadorOrPasante]
     service = PruebaFisicaService()
+    ranking_service = RankingService()
 
+    @respuesta_condicional('get_validador_listado')
+    @respuesta_cacheada()
     def list(self, request):
+        paginated = paginate_list(
+            request, self.service.get_pruebas_paginated, PruebaFisicaSerializer,
+            get_cursor_page=self.service.get_pruebas_cursor
+        )
+        if paginated is not None:
+            return paginated
         pruebas = self.service.get_all_pruebas()
         serializer = PruebaFisicaSerializer(pruebas, many=True)
         return Response(serializer.data)
@@ -29,6 +46,7 @@ class PruebaFisicaController(viewsets.ViewSet):
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    @respuesta_condicional('get_validador')
     def retrieve(self, request, pk=None):
         prueba = self.service.get_prueba_by_id(pk)
         if not prueba:
@@ -55,3 +73,70 @@ class PruebaFisicaController(viewsets.ViewSet):
         if not success:
             return Response({'error': 'Prueba no encontrada'}, status=status.HTTP_404_NOT_FOUND)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['get'])
+    def estadisticas(self, request):
+        """Estadísticas por tipo de prueba de varios atletas (?atletas=1,2) o de un grupo (?grupo=1)"""
+        try:
+            if 'grupo' in request.query_params:
+                estadisticas = self.service.get_estadisticas_grupo(int(request.query_params['grupo']))
+            elif 'atletas' in request.query_params:
+                ids = [int(i) for i in request.query_params['atletas'].split(',') if i.strip()]
+                estadisticas = self.service.get_estadisticas_atletas(ids)
+            else:
+                return Response({'error': 'Debe indicar atletas o grupo'}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError:
+            return Response({'error': 'atletas y grupo deben ser IDs numéricos'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(estadisticas)
+
+    @action(detail=False, methods=['post'], parser_classes=[MultiPartParser])
+    def importar(self, request):
+        """Importación masiva desde un archivo CSV/XLSX (campo 'archivo') con reporte de errores por fila"""
+        archivo = request.FILES.get('archivo')
+        if archivo is None:
+            return Response({'error': 'Debe adjuntar el archivo en el campo archivo'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            reporte = self.service.importar_pruebas(archivo)
+        except ValidationError as e:
+            return Response({'error': ' '.join(e.messages)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(reporte)
+
+    @action(detail=False, methods=['get'])
+    def ranking(self, request):
+        """Leaderboard de una prueba (?nombre_prueba=) general o por ?sexo=, ?edad= o ?grupo="""
+        params = request.query_params
+        nombre_prueba = params.get('nombre_prueba')
+        if not nombre_prueba:
+            return Response({'error': 'Debe indicar nombre_prueba'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limite = int(params.get('limite', 10))
+        except ValueError:
+            limite = 0
+        if limite < 1:
+            return Response({'error': 'limite debe ser un entero mayor o igual a 1'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            ranking = self.ranking_service.get_ranking(
+                nombre_prueba,
+                sexo=params.get('sexo'),
+                edad=int(params['edad']) if 'edad' in params else None,
+                grupo_id=int(params['grupo']) if 'grupo' in params else None,
+                limit=min(limite, 100),
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = RankingPruebaFisicaSerializer(ranking, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def exportar(self, request):
+        """Exporta el historial en CSV/NDJSON (?formato=) filtrado por ?fecha_desde=, ?fecha_hasta=, ?tipo=, ?grupo= o ?atleta="""
+        try:
+            filtros = get_filtros_exportacion(
+                request, ['fecha_desde', 'fecha_hasta', 'tipo', 'grupo', 'atleta'], alias={'tipo': 'tipo_prueba'}
+            )
+            columnas, filas = self.service.exportar_pruebas(**filtros)
+            return exportar_streaming(request, 'pruebas_fisicas', columnas, filas)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
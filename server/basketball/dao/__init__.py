@@ -6,6 +6,8 @@ from .grupo_atleta_dao import GrupoAtletaDAO
 from .inscripcion_dao import InscripcionDAO
 from .prueba_antropometrica_dao import PruebaAntropometricaDAO
 from .prueba_fisica_dao import PruebaFisicaDAO
+from .ranking_prueba_fisica_dao import RankingPruebaFisicaDAO
+from .rol_dao import RolDAO
 
 __all__ = [
     'GenericDAO',
@@ -16,4 +18,6 @@ __all__ = [
     'InscripcionDAO',
     'PruebaAntropometricaDAO',
     'PruebaFisicaDAO',
+    'RankingPruebaFisicaDAO',
+    'RolDAO',
 ]
@@ -2,16 +2,66 @@
 DAO para el modelo Atleta
 """
 
-from typing import Optional, List
-from django.db.models import QuerySet
+import logging
+from datetime import date
+from typing import Any, Optional, List, Dict, Iterable, Set, Tuple
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet, Case, When, Value, IntegerField, Min
+from django.utils import timezone
 from .generic_dao import GenericDAO
+from .generaciones import incrementar_generacion
 from ..models import Atleta
 
+logger = logging.getLogger(__name__)
+
+# Edades por UPDATE en recalcular_edades (acota los parámetros de cada consulta)
+EDADES_POR_CONSULTA = 25
+
+
+def fecha_corte_edad(edad: int, hoy: date) -> date:
+    """
+    Última fecha de nacimiento con la que en `hoy` se tienen al menos `edad` años.
+    
+    Args:
+        edad: Años cumplidos
+        hoy: Fecha de referencia
+        
+    Returns:
+        date: Fecha de corte (los nacidos el 29 de febrero cumplen el 1 de marzo en años no bisiestos)
+    """
+    try:
+        return hoy.replace(year=hoy.year - edad)
+    except ValueError:
+        return date(hoy.year - edad, 2, 28)
+
+
+def calcular_edad(fecha_nacimiento: date, hoy: date) -> int:
+    """
+    Años cumplidos en `hoy` (0 para fechas de nacimiento futuras).
+    
+    Args:
+        fecha_nacimiento: Fecha de nacimiento
+        hoy: Fecha de referencia
+        
+    Returns:
+        int: Edad en años
+    """
+    cumplio = (hoy.month, hoy.day) >= (fecha_nacimiento.month, fecha_nacimiento.day)
+    return max(hoy.year - fecha_nacimiento.year - (0 if cumplio else 1), 0)
+
 
 class AtletaDAO(GenericDAO[Atleta]):
     """DAO para operaciones CRUD de Atleta"""
     
     model = Atleta
+    # AtletaSerializer incluye el M2M grupos
+    prefetch_related = ['grupos']
+    # Columnas de la exportación (CSV/NDJSON); los grupos se filtran, no se exportan
+    campos_exportacion = [
+        'id', 'nombre_atleta', 'apellido_atleta', 'dni', 'fecha_nacimiento', 'edad', 'sexo',
+        'email', 'telefono', 'tipo_sangre', 'datos_representante', 'telefono_representante', 'fecha_registro',
+    ]
     
     def get_by_dni(self, dni: str) -> Optional[Atleta]:
         """
@@ -57,11 +107,22 @@ class AtletaDAO(GenericDAO[Atleta]):
         Returns:
             QuerySet[Atleta]: QuerySet con atletas en el rango de edad
         """
-        return self.get_by_filter(
-            edad__gte=edad_min,
-            edad__lte=edad_max,
-            estado=True
-        )
+        return self.get_by_filter(estado=True, **self._filtros_edad(edad_min, edad_max))
+    
+    def _filtros_edad(self, edad_min: Optional[int], edad_max: Optional[int]) -> Dict[str, Any]:
+        """
+        Filtros de un rango de edad (los extremos en None quedan en None).
+        
+        Con EDAD_POR_FECHA_NACIMIENTO se filtra por fecha_nacimiento, que no
+        depende de que edad esté recalculada, en lugar de por la edad guardada.
+        """
+        if not getattr(settings, 'EDAD_POR_FECHA_NACIMIENTO', False):
+            return {'edad__gte': edad_min, 'edad__lte': edad_max}
+        hoy = timezone.localdate()
+        return {
+            'fecha_nacimiento__lte': None if edad_min is None else fecha_corte_edad(edad_min, hoy),
+            'fecha_nacimiento__gt': None if edad_max is None else fecha_corte_edad(edad_max + 1, hoy),
+        }
     
     def get_by_grupo(self, grupo_id: int) -> QuerySet[Atleta]:
         """
@@ -75,6 +136,18 @@ class AtletaDAO(GenericDAO[Atleta]):
         """
         return self.get_by_filter(grupos__id=grupo_id, estado=True)
     
+    def get_miembros_grupo(self, grupo_id: int) -> QuerySet[Atleta]:
+        """
+        Obtiene todos los atletas de un grupo, activos o no.
+        
+        Args:
+            grupo_id: ID del grupo
+            
+        Returns:
+            QuerySet[Atleta]: QuerySet con los miembros del grupo
+        """
+        return self.get_by_filter(grupos__id=grupo_id)
+    
     def get_sin_grupo(self) -> QuerySet[Atleta]:
         """
         Obtiene atletas que no están asignados a ningún grupo.
@@ -82,7 +155,7 @@ class AtletaDAO(GenericDAO[Atleta]):
         Returns:
             QuerySet[Atleta]: QuerySet con atletas sin grupo
         """
-        return self.model.objects.filter(grupos__isnull=True, estado=True)
+        return self.get_by_filter(grupos__isnull=True, estado=True)
     
     def get_sin_inscripcion(self) -> QuerySet[Atleta]:
         """
@@ -91,7 +164,26 @@ class AtletaDAO(GenericDAO[Atleta]):
         Returns:
             QuerySet[Atleta]: QuerySet con atletas sin inscripción
         """
-        return self.model.objects.filter(inscripcion__isnull=True, estado=True)
+        return self.get_by_filter(inscripcion__isnull=True, estado=True)
+    
+    def get_para_exportar(self, sexo: Optional[str] = None, edad_min: Optional[int] = None,
+                          edad_max: Optional[int] = None, grupo_id: Optional[int] = None) -> QuerySet[Atleta]:
+        """
+        Obtiene los atletas activos a exportar; los filtros en None se ignoran.
+        
+        Args:
+            sexo: M, F u O
+            edad_min: Edad mínima
+            edad_max: Edad máxima
+            grupo_id: ID del grupo
+            
+        Returns:
+            QuerySet[Atleta]: QuerySet ordenado por id
+        """
+        filtros = {'sexo': sexo, 'grupos__id': grupo_id, **self._filtros_edad(edad_min, edad_max)}
+        return self.get_by_filter(
+            estado=True, **{campo: valor for campo, valor in filtros.items() if valor is not None}
+        ).order_by('id')
     
     def search_atletas(self, search_term: str) -> QuerySet[Atleta]:
         """
@@ -124,6 +216,20 @@ class AtletaDAO(GenericDAO[Atleta]):
             queryset = queryset.exclude(pk=exclude_id)
         return queryset.exists()
     
+    def get_ids_by_dni(self, dnis: Iterable[str]) -> Dict[str, int]:
+        """
+        Resuelve varios DNI de atletas activos en una sola consulta.
+        
+        Args:
+            dnis: DNIs a resolver
+        
+        Returns:
+            Dict[str, int]: {dni: atleta_id}; los DNI sin atleta activo no aparecen
+        """
+        return dict(
+            self.model.objects.filter(dni__in=set(dnis), estado=True).order_by().values_list('dni', 'id')
+        )
+    
     def asignar_grupo(self, atleta_id: int, grupo_id: int) -> bool:
         """
         Asigna un atleta a un grupo.
@@ -163,3 +269,136 @@ class AtletaDAO(GenericDAO[Atleta]):
             return False
         except Exception:
             return False
+    
+    def recalcular_edades(self, hoy: Optional[date] = None) -> int:
+        """
+        Recalcula la edad guardada de todos los atletas a partir de fecha_nacimiento.
+        
+        El cálculo se hace en la base de datos: cada fecha de corte
+        (fecha_corte_edad) delimita un rango de fechas de nacimiento con la
+        misma edad, y un UPDATE con CASE por bloque de EDADES_POR_CONSULTA
+        edades escribe solo las filas cuya edad cambió, sin leerlas. Los
+        rangos de fecha usan el índice atleta_fecha_nac_idx. Los atletas que
+        cambian de banda de edad recalculan esas bandas en sus rankings.
+        
+        Args:
+            hoy: Fecha de referencia (por defecto la fecha local actual)
+            
+        Returns:
+            int: Atletas cuya edad cambió
+        """
+        from ..signals import recalcular_rankings_de_atletas
+        
+        hoy = hoy or timezone.localdate()
+        mas_antigua = self.model.objects.aggregate(fecha=Min('fecha_nacimiento'))['fecha']
+        if mas_antigua is None:
+            return 0
+        
+        edades = range(calcular_edad(mas_antigua, hoy) + 1)
+        banda = getattr(settings, 'RANKING_BANDA_EDAD', 2)
+        cambios, particiones = set(), set()
+        actualizados = 0
+        with transaction.atomic():
+            for inicio in range(0, len(edades), EDADES_POR_CONSULTA):
+                bloque = edades[inicio:inicio + EDADES_POR_CONSULTA]
+                # El primer When que se cumple es la edad (fechas futuras -> 0)
+                edad = Case(
+                    *[When(fecha_nacimiento__gt=fecha_corte_edad(e + 1, hoy), then=Value(e)) for e in bloque],
+                    output_field=IntegerField()
+                )
+                queryset = self.model.objects.filter(fecha_nacimiento__gt=fecha_corte_edad(bloque[-1] + 1, hoy))
+                if inicio:
+                    queryset = queryset.filter(fecha_nacimiento__lte=fecha_corte_edad(bloque[0], hoy))
+                queryset = queryset.exclude(edad=edad)
+                # Solo se leen las filas que cambian, para las bandas de edad de los rankings
+                for atleta_id, anterior, nueva in queryset.annotate(nueva=edad).values_list('id', 'edad', 'nueva'):
+                    if anterior // banda != nueva // banda:
+                        cambios.add(atleta_id)
+                        particiones |= {f'edad:{anterior // banda * banda}', f'edad:{nueva // banda * banda}'}
+                actualizados += self.bulk_update(queryset, edad=edad)
+            recalcular_rankings_de_atletas(cambios, particiones)
+        
+        logger.info(f"Edades recalculadas al {hoy.isoformat()}: {actualizados} atletas actualizados")
+        return actualizados
+    
+    # =========================================================================
+    # Membresía en grupos (tabla intermedia atleta_grupos)
+    # =========================================================================
+    
+    def get_ids_atletas_de_grupo(self, grupo_id: int) -> Set[int]:
+        """
+        Obtiene los IDs de todos los atletas de un grupo desde la tabla intermedia.
+        
+        Args:
+            grupo_id: ID del grupo
+            
+        Returns:
+            Set[int]: IDs de los atletas (activos o no)
+        """
+        through, campo_atleta, campo_grupo = self._tabla_grupos()
+        return set(through.objects.filter(**{campo_grupo: grupo_id}).values_list(campo_atleta, flat=True))
+    
+    def actualizar_grupos(self, agregar: Iterable[Tuple[int, int]],
+                          quitar: Iterable[Tuple[int, int]] = ()) -> Dict[str, int]:
+        """
+        Aplica altas y bajas de pares (atleta_id, grupo_id) en la tabla intermedia.
+        
+        Calcula la diferencia contra las filas existentes leyendo solo IDs
+        y la aplica con un INSERT masivo y un DELETE por IDs, en una sola
+        transacción. Como no pasa por el manager del M2M (ni sus señales),
+        marca la fecha_actualizacion de los atletas afectados, invalida sus
+        listados cacheados y recalcula las particiones de grupo de sus rankings.
+        
+        Args:
+            agregar: Pares (atleta_id, grupo_id) a asociar (los ya asociados se ignoran)
+            quitar: Pares (atleta_id, grupo_id) a desasociar (los inexistentes se ignoran)
+            
+        Returns:
+            Dict[str, int]: {'agregadas': n, 'quitadas': n}
+        """
+        from ..signals import recalcular_rankings_de_atletas
+        
+        agregar, quitar = set(agregar), set(quitar)
+        pares = agregar | quitar
+        if not pares:
+            return {'agregadas': 0, 'quitadas': 0}
+        
+        through, campo_atleta, campo_grupo = self._tabla_grupos()
+        with transaction.atomic():
+            existentes = {
+                (atleta_id, grupo_id): pk
+                for pk, atleta_id, grupo_id in through.objects.filter(**{
+                    f'{campo_atleta}__in': {atleta_id for atleta_id, _ in pares},
+                    f'{campo_grupo}__in': {grupo_id for _, grupo_id in pares},
+                }).values_list('pk', campo_atleta, campo_grupo)
+            }
+            nuevas = sorted(par for par in agregar if par not in existentes)
+            borrar = {par: existentes[par] for par in quitar if par in existentes}
+            if nuevas:
+                through.objects.bulk_create(
+                    [through(**{campo_atleta: atleta_id, campo_grupo: grupo_id}) for atleta_id, grupo_id in nuevas],
+                    ignore_conflicts=True
+                )
+            if borrar:
+                through.objects.filter(pk__in=borrar.values()).delete()
+            
+            afectados = {atleta_id for atleta_id, _ in nuevas} | {atleta_id for atleta_id, _ in borrar}
+            if afectados:
+                self.model.objects.filter(pk__in=afectados).update(fecha_actualizacion=timezone.now())
+                incrementar_generacion(self.model)
+                recalcular_rankings_de_atletas(
+                    afectados, {f'grupo:{grupo_id}' for _, grupo_id in list(nuevas) + list(borrar)}
+                )
+        
+        logger.info(f"Membresías de grupos: {len(nuevas)} agregadas, {len(borrar)} quitadas")
+        return {'agregadas': len(nuevas), 'quitadas': len(borrar)}
+    
+    def _tabla_grupos(self):
+        """Modelo intermedio de Atleta.grupos y sus columnas (atleta_id, grupoatleta_id)"""
+        field = self.model._meta.get_field('grupos')
+        through = field.remote_field.through
+        return (
+            through,
+            through._meta.get_field(field.m2m_field_name()).attname,
+            through._meta.get_field(field.m2m_reverse_field_name()).attname,
+        )
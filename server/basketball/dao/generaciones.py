@@ -0,0 +1,86 @@
+"""
+Contadores de generación por modelo para invalidar caches de lectura
+
+Cada escritura de GenericDAO (y los cambios de Atleta.grupos) incrementa la
+generación de su modelo. Las claves de cache incluyen las generaciones de
+los modelos de los que dependen, así que una escritura deja huérfanas las
+entradas anteriores (expiran por TTL) sin enumerar ni borrar claves.
+
+Los contadores viven en el cache de Django configurado en
+RESPONSE_CACHE_BACKEND (memoria local, archivo o uno compartido). Si un
+contador no existe o fue desalojado se reinicia con un valor basado en el
+reloj, mayor que cualquier valor anterior, para no reutilizar claves viejas.
+"""
+
+import logging
+import time
+from typing import List
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache():
+    """Cache de Django donde se guardan las generaciones y las respuestas cacheadas"""
+    return caches[getattr(settings, 'RESPONSE_CACHE_BACKEND', None) or 'default']
+
+
+def get_generaciones(modelos) -> List[int]:
+    """
+    Obtiene la generación actual de varios modelos con una sola lectura.
+
+    Args:
+        modelos: Clases de modelo
+
+    Returns:
+        List[int]: Generación de cada modelo, en el mismo orden
+    """
+    cache = get_cache()
+    claves = [_clave(model) for model in modelos]
+    valores = cache.get_many(claves)
+    faltantes = [clave for clave in claves if clave not in valores]
+    if faltantes:
+        for clave in faltantes:
+            cache.add(clave, _valor_inicial(), timeout=None)
+        valores.update(cache.get_many(faltantes))
+    return [valores.get(clave, 0) for clave in claves]
+
+
+def incrementar_generacion(model) -> None:
+    """
+    Invalida las entradas de cache que dependen de un modelo.
+
+    Dentro de una transacción se incrementa ahora (para el propio proceso)
+    y otra vez después del commit, para que una lectura concurrente que se
+    cacheó con los datos anteriores al commit tampoco se reutilice.
+
+    Args:
+        model: Clase del modelo modificado
+    """
+    clave = _clave(model)
+    _incrementar(clave)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _incrementar(clave))
+
+
+def _incrementar(clave: str) -> None:
+    cache = get_cache()
+    try:
+        cache.incr(clave)
+    except ValueError:
+        # No existe (primer uso o desalojado): se reinicia, salvo que otro proceso se adelante
+        if not cache.add(clave, _valor_inicial(), timeout=None):
+            cache.incr(clave)
+    except Exception as e:
+        logger.error(f"Error incrementando la generación {clave}: {e}")
+
+
+def _valor_inicial() -> int:
+    # Microsegundos: crece más rápido que cualquier secuencia de incrementos
+    return time.time_ns() // 1000
+
+
+def _clave(model) -> str:
+    return f"generacion:{model._meta.label_lower}"
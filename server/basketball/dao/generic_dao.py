@@ -4,11 +4,18 @@ DAO Genérico (Data Access Object) para el módulo Basketball
 Proporciona una interfaz genérica para operaciones CRUD sobre los modelos.
 """
 
-from typing import TypeVar, Generic, List, Optional, Dict, Any
+from typing import TypeVar, Generic, Iterable, Iterator, List, Optional, Dict, Any, Set, Tuple
 from django.db import models, transaction
-from django.db.models import QuerySet, Q
+from django.db.models import QuerySet, Q, Count, Max
 from django.core.exceptions import ObjectDoesNotExist
+from django.utils import timezone
+from django.core.serializers.json import DjangoJSONEncoder
+import base64
+import binascii
+import json
 import logging
+from .search_backends import get_search_backend
+from .generaciones import incrementar_generacion
 
 logger = logging.getLogger(__name__)
 
@@ -23,9 +30,23 @@ class GenericDAO(Generic[T]):
     Uso:
         class AtletaDAO(GenericDAO[Atleta]):
             model = Atleta
+            prefetch_related = ['grupos']
+    
+    select_related y prefetch_related indican las relaciones que el
+    serializer del modelo recorre; las lecturas de listados las cargan por
+    adelantado para evitar una consulta por fila (N+1).
+    
+    campo_actualizacion es el timestamp (auto_now) con el que get_validador
+    detecta cambios para las respuestas condicionales (ETag/Last-Modified).
+    
+    Todas las escrituras incrementan la generación del modelo (ver
+    generaciones.py), que invalida las respuestas cacheadas de sus listados.
     """
     
     model: type[T] = None
+    select_related: List[str] = []
+    prefetch_related: List[str] = []
+    campo_actualizacion: str = 'fecha_actualizacion'
     
     def __init__(self):
         if self.model is None:
@@ -47,25 +68,29 @@ class GenericDAO(Generic[T]):
         """
         try:
             instance = self.model.objects.create(**kwargs)
+            incrementar_generacion(self.model)
             logger.info(f"{self.model.__name__} creado con ID: {instance.pk}")
             return instance
         except Exception as e:
             logger.error(f"Error al crear {self.model.__name__}: {e}")
             raise
     
-    def bulk_create(self, objects_data: List[Dict[str, Any]]) -> List[T]:
+    def bulk_create(self, objects_data: List[Dict[str, Any]],
+                    batch_size: Optional[int] = None) -> List[T]:
         """
         Crea múltiples instancias del modelo.
         
         Args:
             objects_data: Lista de diccionarios con datos de los objetos
+            batch_size: Filas por INSERT (None = las que permita el motor)
             
         Returns:
             List[T]: Lista de instancias creadas
         """
         try:
             instances = [self.model(**data) for data in objects_data]
-            created = self.model.objects.bulk_create(instances)
+            created = self.model.objects.bulk_create(instances, batch_size=batch_size)
+            incrementar_generacion(self.model)
             logger.info(f"Creados {len(created)} registros de {self.model.__name__}")
             return created
         except Exception as e:
@@ -76,6 +101,20 @@ class GenericDAO(Generic[T]):
     # READ Operations
     # =========================================================================
     
+    def get_queryset(self) -> QuerySet[T]:
+        """
+        QuerySet base de las lecturas, con las relaciones del DAO precargadas.
+        
+        Returns:
+            QuerySet[T]: QuerySet con select_related/prefetch_related aplicados
+        """
+        queryset = self.model.objects.all()
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+    
     def get_by_id(self, pk: int) -> Optional[T]:
         """
         Obtiene una instancia por su ID.
@@ -99,7 +138,7 @@ class GenericDAO(Generic[T]):
         Returns:
             QuerySet[T]: QuerySet con todos los registros
         """
-        return self.model.objects.all()
+        return self.get_queryset()
     
     def get_by_filter(self, **filters) -> QuerySet[T]:
         """
@@ -111,7 +150,7 @@ class GenericDAO(Generic[T]):
         Returns:
             QuerySet[T]: QuerySet filtrado
         """
-        return self.model.objects.filter(**filters)
+        return self.get_queryset().filter(**filters)
     
     def get_by_q_filter(self, q_filter: Q) -> QuerySet[T]:
         """
@@ -123,7 +162,7 @@ class GenericDAO(Generic[T]):
         Returns:
             QuerySet[T]: QuerySet filtrado
         """
-        return self.model.objects.filter(q_filter)
+        return self.get_queryset().filter(q_filter)
     
     def exists(self, **filters) -> bool:
         """
@@ -137,6 +176,19 @@ class GenericDAO(Generic[T]):
         """
         return self.model.objects.filter(**filters).exists()
     
+    def get_ids_existentes(self, ids: Iterable[int], **filters) -> Set[int]:
+        """
+        Filtra una lista de IDs a los que existen, sin instanciar modelos.
+        
+        Args:
+            ids: IDs a verificar
+            **filters: Criterios adicionales (p.ej. estado=True)
+            
+        Returns:
+            Set[int]: IDs existentes que cumplen los criterios
+        """
+        return set(self.model.objects.filter(pk__in=set(ids), **filters).order_by().values_list('pk', flat=True))
+    
     def count(self, **filters) -> int:
         """
         Cuenta los registros que cumplen los criterios.
@@ -195,6 +247,7 @@ class GenericDAO(Generic[T]):
             for field, value in kwargs.items():
                 setattr(instance, field, value)
             instance.save()
+            incrementar_generacion(self.model)
             logger.info(f"{self.model.__name__} con ID {pk} actualizado")
             return instance
         except ObjectDoesNotExist:
@@ -208,6 +261,10 @@ class GenericDAO(Generic[T]):
         """
         Actualiza múltiples registros.
         
+        QuerySet.update no pasa por save(), así que los campos auto_now
+        (fecha_actualizacion) se asignan aquí para que el cambio sea visible
+        en get_validador.
+        
         Args:
             queryset: QuerySet de objetos a actualizar
             **kwargs: Campos a actualizar
@@ -216,7 +273,13 @@ class GenericDAO(Generic[T]):
             int: Número de registros actualizados
         """
         try:
+            ahora = timezone.now()
+            for field in self.model._meta.concrete_fields:
+                if getattr(field, 'auto_now', False):
+                    kwargs.setdefault(field.name, ahora)
             updated = queryset.update(**kwargs)
+            if updated:
+                incrementar_generacion(self.model)
             logger.info(f"Actualizados {updated} registros de {self.model.__name__}")
             return updated
         except Exception as e:
@@ -240,6 +303,7 @@ class GenericDAO(Generic[T]):
         try:
             instance = self.model.objects.get(pk=pk)
             instance.delete()
+            incrementar_generacion(self.model)
             logger.info(f"{self.model.__name__} con ID {pk} eliminado")
             return True
         except ObjectDoesNotExist:
@@ -264,6 +328,7 @@ class GenericDAO(Generic[T]):
             instance = self.model.objects.get(pk=pk)
             setattr(instance, field, False)
             instance.save()
+            incrementar_generacion(self.model)
             logger.info(f"{self.model.__name__} con ID {pk} desactivado (soft delete)")
             return True
         except ObjectDoesNotExist:
@@ -282,6 +347,8 @@ class GenericDAO(Generic[T]):
         """
         try:
             deleted, _ = self.model.objects.filter(**filters).delete()
+            if deleted:
+                incrementar_generacion(self.model)
             logger.info(f"Eliminados {deleted} registros de {self.model.__name__}")
             return deleted
         except Exception as e:
@@ -319,23 +386,57 @@ class GenericDAO(Generic[T]):
         """
         return self.update(pk, **kwargs)
     
+    # =========================================================================
+    # Conditional requests
+    # =========================================================================
+    
+    def get_validador(self, pk: Optional[int] = None, **filters) -> Dict[str, Any]:
+        """
+        Resume el estado de un listado o de un registro para las respuestas
+        condicionales (ETag/Last-Modified).
+        
+        Una sola consulta COUNT + MAX(campo_actualizacion) sin relaciones ni
+        ordenamiento. Los filtros se aplican solo al conteo: el máximo se toma
+        sobre toda la tabla para que una fila que sale del listado (soft
+        delete, inscripción deshabilitada) también cambie ultima_modificacion.
+        
+        Args:
+            pk: ID del registro (detalle) o None (listado)
+            **filters: Criterios del listado (p.ej. estado=True)
+            
+        Returns:
+            dict: {'total': int, 'ultima_modificacion': datetime | None}
+        """
+        queryset = self.model.objects.order_by()
+        if pk is not None:
+            queryset = queryset.filter(pk=pk)
+        return queryset.aggregate(
+            total=Count('pk', filter=Q(**filters) if filters else None),
+            ultima_modificacion=Max(self.campo_actualizacion),
+        )
+    
     # =========================================================================
     # Pagination
     # =========================================================================
     
-    def get_paginated(self, page: int = 1, page_size: int = 10, **filters) -> Dict[str, Any]:
+    def get_paginated(self, page: int = 1, page_size: int = 10,
+                      queryset: Optional[QuerySet[T]] = None, **filters) -> Dict[str, Any]:
         """
         Obtiene registros paginados.
         
         Args:
             page: Número de página (1-indexed)
             page_size: Tamaño de página
+            queryset: QuerySet base a paginar (por defecto todos los registros)
             **filters: Criterios de filtrado
             
         Returns:
             dict: Diccionario con datos paginados
         """
-        queryset = self.get_by_filter(**filters) if filters else self.get_all()
+        if queryset is None:
+            queryset = self.get_all()
+        if filters:
+            queryset = queryset.filter(**filters)
         total = queryset.count()
         
         start = (page - 1) * page_size
@@ -353,6 +454,122 @@ class GenericDAO(Generic[T]):
             'has_previous': page > 1,
         }
     
+    def get_cursor_paginated(self, cursor: Optional[str] = None, page_size: int = 10,
+                             queryset: Optional[QuerySet[T]] = None,
+                             ordering: Optional[List[str]] = None,
+                             include_total: bool = False, **filters) -> Dict[str, Any]:
+        """
+        Obtiene registros paginados por cursor (keyset).
+        
+        En lugar de OFFSET filtra por los valores de ordenamiento del último
+        registro de la página anterior, por lo que el costo de una página
+        profunda es el mismo que el de la primera.
+        
+        Args:
+            cursor: Token opaco devuelto como next_cursor (None = primera página)
+            page_size: Tamaño de página
+            queryset: QuerySet base a paginar (por defecto todos los registros)
+            ordering: Campos de ordenamiento (por defecto Meta.ordering + id)
+            include_total: Si se calcula el total (COUNT) de registros
+            **filters: Criterios de filtrado
+            
+        Returns:
+            dict: Diccionario con items, next_cursor y has_next
+            
+        Raises:
+            ValueError: Si el cursor no es válido
+        """
+        if queryset is None:
+            queryset = self.get_all()
+        if filters:
+            queryset = queryset.filter(**filters)
+        
+        ordering = self._get_keyset_ordering(ordering)
+        paged = queryset.order_by(*ordering)
+        if cursor:
+            paged = paged.filter(self._get_keyset_filter(ordering, self._decode_cursor(cursor, ordering)))
+        
+        items = list(paged[:page_size + 1])
+        has_next = len(items) > page_size
+        items = items[:page_size]
+        
+        result = {
+            'items': items,
+            'page_size': page_size,
+            'next_cursor': self._encode_cursor(items[-1], ordering) if has_next else None,
+            'has_next': has_next,
+        }
+        if include_total:
+            result['total'] = queryset.count()
+        return result
+    
+    def _get_keyset_ordering(self, ordering: Optional[List[str]] = None) -> List[str]:
+        """Ordenamiento del modelo con la PK como desempate para que sea total"""
+        ordering = list(ordering or self.model._meta.ordering or [])
+        pk_name = self.model._meta.pk.name
+        if not any(field.lstrip('-') in (pk_name, 'pk') for field in ordering):
+            ordering.append(pk_name)
+        return ordering
+    
+    def _get_keyset_filter(self, ordering: List[str], values: List[Any]) -> Q:
+        """
+        Construye el filtro "después de values" para un ordenamiento mixto.
+        
+        Para (a DESC, b ASC) genera: a < va OR (a = va AND b > vb)
+        """
+        keyset = Q()
+        for i, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition = Q(**{f"{name}__{lookup}": values[i]})
+            for previous, value in zip(ordering[:i], values[:i]):
+                condition &= Q(**{previous.lstrip('-'): value})
+            keyset |= condition
+        return keyset
+    
+    def _encode_cursor(self, instance: T, ordering: List[str]) -> str:
+        values = []
+        for field in ordering:
+            name = field.lstrip('-')
+            attname = self.model._meta.pk.attname if name == 'pk' else self.model._meta.get_field(name).attname
+            values.append(getattr(instance, attname))
+        raw = json.dumps(values, cls=DjangoJSONEncoder).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+    
+    def _decode_cursor(self, cursor: str, ordering: List[str]) -> List[Any]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            values = json.loads(raw)
+        except (binascii.Error, ValueError, UnicodeDecodeError):
+            raise ValueError("Cursor inválido")
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise ValueError("Cursor inválido")
+        return values
+    
+    # =========================================================================
+    # Export
+    # =========================================================================
+    
+    def iter_values(self, queryset: QuerySet[T], fields: List[str],
+                    chunk_size: int = 2000) -> Iterator[Tuple]:
+        """
+        Recorre un queryset como tuplas de campos, por bloques.
+        
+        No instancia modelos ni guarda el resultado en la caché del
+        queryset, así que la memoria no depende de la cantidad de filas.
+        
+        Args:
+            queryset: QuerySet a recorrer (se ignoran sus relaciones precargadas)
+            fields: Campos a proyectar (admite relaciones, p.ej. 'atleta__dni')
+            chunk_size: Filas que se leen de la base de datos por bloque
+            
+        Returns:
+            Iterator[Tuple]: Una tupla por fila en el orden de fields
+        """
+        return queryset.select_related(None).prefetch_related(None).values_list(*fields).iterator(
+            chunk_size=chunk_size
+        )
+    
     # =========================================================================
     # Search Operations
     # =========================================================================
@@ -361,6 +578,9 @@ class GenericDAO(Generic[T]):
         """
         Busca registros por término en múltiples campos.
         
+        Usa el backend de búsqueda del motor de base de datos (FTS5 en
+        SQLite, pg_trgm en PostgreSQL; ver search_backends.py).
+        
         Args:
             search_fields: Lista de campos donde buscar
             search_term: Término de búsqueda
@@ -371,8 +591,5 @@ class GenericDAO(Generic[T]):
         if not search_term:
             return self.get_all()
         
-        q_objects = Q()
-        for field in search_fields:
-            q_objects |= Q(**{f"{field}__icontains": search_term})
-        
-        return self.model.objects.filter(q_objects)
+        queryset = self.get_queryset()
+        return get_search_backend(queryset.db).search(queryset, search_fields, search_term)
@@ -2,7 +2,7 @@
 DAO para el modelo GrupoAtleta
 """
 
-from typing import Optional
+from typing import List, Optional, Tuple
 from django.db.models import QuerySet, Count
 from .generic_dao import GenericDAO
 from ..models import GrupoAtleta
@@ -81,10 +81,21 @@ class GrupoAtletaDAO(GenericDAO[GrupoAtleta]):
         Returns:
             QuerySet[GrupoAtleta]: QuerySet con anotación de cantidad de atletas
         """
-        return self.model.objects.filter(estado=True).annotate(
+        return self.get_by_filter(estado=True).annotate(
             cantidad_atletas=Count('atletas')
         )
     
+    def get_rangos_activos(self) -> List[Tuple[int, str, int, int, int]]:
+        """
+        Obtiene los rangos de edad de los grupos activos en una sola consulta.
+        
+        Returns:
+            List[Tuple]: (id, nombre, edad mínima, edad máxima, cantidad de atletas) por grupo
+        """
+        return list(self.get_con_atletas_count().values_list(
+            'id', 'nombre', 'rango_edad_minima', 'rango_edad_maxima', 'cantidad_atletas'
+        ).order_by('id'))
+    
     def search_grupos(self, search_term: str) -> QuerySet[GrupoAtleta]:
         """
         Busca grupos por término en nombre o categoría.
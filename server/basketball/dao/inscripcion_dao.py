@@ -12,6 +12,11 @@ class InscripcionDAO(GenericDAO[Inscripcion]):
     """DAO para operaciones CRUD de Inscripcion"""
     
     model = Inscripcion
+    # Columnas de la exportación (CSV/NDJSON)
+    campos_exportacion = [
+        'id', 'atleta_id', 'atleta__dni', 'atleta__nombre_atleta', 'atleta__apellido_atleta',
+        'fecha_inscripcion', 'tipo_inscripcion', 'habilitada', 'observaciones', 'registrado_por',
+    ]
     
     def get_by_atleta(self, atleta_id: int) -> Optional[Inscripcion]:
         """
@@ -112,6 +117,29 @@ class InscripcionDAO(GenericDAO[Inscripcion]):
         inscripcion = self.update(pk, habilitada=False)
         return inscripcion is not None
     
+    def get_para_exportar(self, fecha_inicio=None, fecha_fin=None, tipo: Optional[str] = None,
+                          habilitada: Optional[bool] = None, grupo_id: Optional[int] = None) -> QuerySet[Inscripcion]:
+        """
+        Obtiene las inscripciones a exportar; los filtros en None se ignoran.
+        
+        Args:
+            fecha_inicio: Fecha de inscripción mínima
+            fecha_fin: Fecha de inscripción máxima
+            tipo: Tipo de inscripción (FEDERADO, NO_FEDERADO, INVITADO)
+            habilitada: Solo habilitadas (True) o deshabilitadas (False)
+            grupo_id: ID del grupo del atleta
+            
+        Returns:
+            QuerySet[Inscripcion]: QuerySet ordenado por (fecha_inscripcion, id)
+        """
+        filtros = {
+            'fecha_inscripcion__gte': fecha_inicio, 'fecha_inscripcion__lte': fecha_fin,
+            'tipo_inscripcion': tipo, 'habilitada': habilitada, 'atleta__grupos__id': grupo_id,
+        }
+        return self.get_by_filter(
+            **{campo: valor for campo, valor in filtros.items() if valor is not None}
+        ).order_by('-fecha_inscripcion', 'id')
+    
     def search_inscripciones(self, search_term: str) -> QuerySet[Inscripcion]:
         """
         Busca inscripciones por término en datos del atleta.
@@ -122,11 +150,8 @@ class InscripcionDAO(GenericDAO[Inscripcion]):
         Returns:
             QuerySet[Inscripcion]: QuerySet con resultados
         """
-        from django.db.models import Q
-        
-        return self.model.objects.filter(
-            Q(atleta__nombre_atleta__icontains=search_term) |
-            Q(atleta__apellido_atleta__icontains=search_term) |
-            Q(atleta__dni__icontains=search_term) |
-            Q(tipo_inscripcion__icontains=search_term)
+        return self.search(
+            search_fields=['atleta__nombre_atleta', 'atleta__apellido_atleta', 'atleta__dni',
+                           'tipo_inscripcion'],
+            search_term=search_term
         )
@@ -2,16 +2,51 @@
 DAO para el modelo PruebaAntropometrica
 """
 
-from typing import Optional
-from django.db.models import QuerySet, Avg
+import math
+import statistics
+from typing import Optional, Dict, Any, List
+from django.db.models import QuerySet, Avg, Min, Max, Count, F, Q, OuterRef, Subquery
 from .generic_dao import GenericDAO
-from ..models import PruebaAntropometrica
+from ..models import PruebaAntropometrica, Atleta
+
+# Medidas incluidas en las estadísticas de grupo: nombre en la respuesta -> campo del modelo
+MEDIDAS_GRUPO = {
+    'peso': 'peso',
+    'estatura': 'estatura',
+    'imc': 'indice_masa_corporal',
+    'envergadura': 'envergadura',
+    'porcentaje_grasa': 'porcentaje_grasa',
+}
 
 
 class PruebaAntropometricaDAO(GenericDAO[PruebaAntropometrica]):
     """DAO para operaciones CRUD de PruebaAntropometrica"""
     
     model = PruebaAntropometrica
+    # Columnas de la exportación (CSV/NDJSON)
+    campos_exportacion = [
+        'id', 'atleta_id', 'atleta__dni', 'atleta__nombre_atleta', 'atleta__apellido_atleta',
+        'fecha_registro', 'peso', 'estatura', 'indice_masa_corporal', 'altura_sentado', 'envergadura',
+        'indice_cornico', 'porcentaje_grasa', 'observaciones', 'registrado_por',
+    ]
+    
+    def bulk_create(self, objects_data: List[Dict[str, Any]],
+                    batch_size: Optional[int] = None) -> List[PruebaAntropometrica]:
+        """
+        Crea múltiples pruebas calculando antes los índices derivados (IMC, córnico).
+        
+        bulk_create no llama a save(), así que los índices se calculan aquí
+        para todo el lote con PruebaAntropometrica.calcular_indices_lote.
+        
+        Args:
+            objects_data: Lista de diccionarios con datos de las pruebas
+            batch_size: Filas por INSERT (None = las que permita el motor)
+            
+        Returns:
+            List[PruebaAntropometrica]: Lista de instancias creadas
+        """
+        self.model.calcular_indices_lote(objects_data)
+        return super().bulk_create(objects_data, batch_size=batch_size)
     
     def get_by_atleta(self, atleta_id: int) -> QuerySet[PruebaAntropometrica]:
         """
@@ -100,14 +135,7 @@ class PruebaAntropometricaDAO(GenericDAO[PruebaAntropometrica]):
         Returns:
             dict: Estadísticas del atleta
         """
-        from django.db.models import Min, Max
-        
-        pruebas = self.get_by_atleta(atleta_id)
-        
-        if not pruebas.exists():
-            return None
-        
-        stats = pruebas.aggregate(
+        stats = self.get_by_atleta(atleta_id).aggregate(
             peso_min=Min('peso'),
             peso_max=Max('peso'),
             peso_promedio=Avg('peso'),
@@ -115,12 +143,117 @@ class PruebaAntropometricaDAO(GenericDAO[PruebaAntropometrica]):
             estatura_max=Max('estatura'),
             imc_min=Min('indice_masa_corporal'),
             imc_max=Max('indice_masa_corporal'),
-            imc_promedio=Avg('indice_masa_corporal')
+            imc_promedio=Avg('indice_masa_corporal'),
+            total_pruebas=Count('id')
         )
-        stats['total_pruebas'] = pruebas.count()
+        
+        if not stats['total_pruebas']:
+            return None
         
         return stats
     
+    def get_estadisticas_grupo(self, grupo_id: int) -> Dict[str, Any]:
+        """
+        Obtiene estadísticas antropométricas de todos los atletas de un grupo.
+        
+        Una sola consulta agrupada por atleta calcula min/max/promedio/desviación
+        de cada medida sobre su historial y trae su última medición (subconsulta
+        correlacionada). Los totales del grupo se calculan sobre las últimas
+        mediciones, que ya vienen en el resultado.
+        
+        Args:
+            grupo_id: ID del grupo
+            
+        Returns:
+            dict: 'atletas' (estadísticas por atleta) y 'totales' del grupo
+        """
+        activas = Q(pruebas_antropometricas__estado=True)
+        ultima = self.model.objects.filter(
+            atleta_id=OuterRef('pk'), estado=True
+        ).order_by('-fecha_registro', '-id')
+        
+        anotaciones = {
+            'total_pruebas': Count('pruebas_antropometricas', filter=activas),
+            'ultima_fecha': Subquery(ultima.values('fecha_registro')[:1]),
+        }
+        for nombre, campo in MEDIDAS_GRUPO.items():
+            relacion = f'pruebas_antropometricas__{campo}'
+            anotaciones.update({
+                f'{nombre}_min': Min(relacion, filter=activas),
+                f'{nombre}_max': Max(relacion, filter=activas),
+                f'{nombre}_promedio': Avg(relacion, filter=activas),
+                # Desviación como sqrt(E[x²] - E[x]²): STDDEV_POP de SQLite falla sin filas
+                f'{nombre}_cuadrado': Avg(F(relacion) * F(relacion), filter=activas),
+                f'{nombre}_ultima': Subquery(ultima.values(campo)[:1]),
+            })
+        
+        filas = Atleta.objects.filter(grupos__id=grupo_id, estado=True).values(
+            'id', 'nombre_atleta', 'apellido_atleta'
+        ).annotate(**anotaciones).order_by('apellido_atleta', 'nombre_atleta', 'id')
+        
+        atletas = []
+        for fila in filas:
+            atleta = {
+                'atleta_id': fila['id'],
+                'nombre_atleta': fila['nombre_atleta'],
+                'apellido_atleta': fila['apellido_atleta'],
+                'total_pruebas': fila['total_pruebas'],
+                'ultima_fecha': fila['ultima_fecha'],
+            }
+            for nombre in MEDIDAS_GRUPO:
+                atleta[nombre] = {
+                    'min': fila[f'{nombre}_min'],
+                    'max': fila[f'{nombre}_max'],
+                    'promedio': fila[f'{nombre}_promedio'],
+                    'desviacion_estandar': self._desviacion(fila[f'{nombre}_promedio'], fila[f'{nombre}_cuadrado']),
+                    'ultima': fila[f'{nombre}_ultima'],
+                }
+            atletas.append(atleta)
+        
+        totales = {
+            'atletas': len(atletas),
+            'atletas_con_pruebas': sum(1 for a in atletas if a['total_pruebas']),
+        }
+        for nombre in MEDIDAS_GRUPO:
+            valores = [a[nombre]['ultima'] for a in atletas if a[nombre]['ultima'] is not None]
+            totales[nombre] = {
+                'min': min(valores) if valores else None,
+                'max': max(valores) if valores else None,
+                'promedio': statistics.fmean(valores) if valores else None,
+                'desviacion_estandar': statistics.pstdev(float(v) for v in valores) if valores else None,
+            }
+        
+        return {'grupo_id': grupo_id, 'atletas': atletas, 'totales': totales}
+    
+    @staticmethod
+    def _desviacion(promedio, promedio_cuadrado) -> Optional[float]:
+        """Desviación estándar poblacional a partir de E[x] y E[x²]"""
+        if promedio is None or promedio_cuadrado is None:
+            return None
+        return math.sqrt(max(0.0, float(promedio_cuadrado) - float(promedio) ** 2))
+    
+    def get_para_exportar(self, fecha_inicio=None, fecha_fin=None, grupo_id: Optional[int] = None,
+                          atleta_id: Optional[int] = None) -> QuerySet[PruebaAntropometrica]:
+        """
+        Obtiene las pruebas activas a exportar; los filtros en None se ignoran.
+        
+        Args:
+            fecha_inicio: Fecha de registro mínima
+            fecha_fin: Fecha de registro máxima
+            grupo_id: ID del grupo de los atletas
+            atleta_id: ID del atleta
+            
+        Returns:
+            QuerySet[PruebaAntropometrica]: QuerySet ordenado por (-fecha_registro, id): más recientes primero
+        """
+        filtros = {
+            'fecha_registro__gte': fecha_inicio, 'fecha_registro__lte': fecha_fin,
+            'atleta__grupos__id': grupo_id, 'atleta_id': atleta_id,
+        }
+        return self.get_by_filter(
+            estado=True, **{campo: valor for campo, valor in filtros.items() if valor is not None}
+        ).order_by('-fecha_registro', 'id')
+    
     def search_pruebas(self, search_term: str) -> QuerySet[PruebaAntropometrica]:
         """
         Busca pruebas por término en datos del atleta.
@@ -131,12 +264,8 @@ class PruebaAntropometricaDAO(GenericDAO[PruebaAntropometrica]):
         Returns:
             QuerySet[PruebaAntropometrica]: QuerySet con resultados
         """
-        from django.db.models import Q
-        
-        return self.model.objects.filter(
-            Q(atleta__nombre_atleta__icontains=search_term) |
-            Q(atleta__apellido_atleta__icontains=search_term) |
-            Q(atleta__dni__icontains=search_term) |
-            Q(observaciones__icontains=search_term),
-            estado=True
-        )
+        return self.search(
+            search_fields=['atleta__nombre_atleta', 'atleta__apellido_atleta', 'atleta__dni',
+                           'observaciones'],
+            search_term=search_term
+        ).filter(estado=True)
@@ -2,8 +2,8 @@
 DAO para el modelo PruebaFisica
 """
 
-from typing import Optional
-from django.db.models import QuerySet, Avg, Max, Min
+from typing import Optional, Dict, Any, Iterable
+from django.db.models import QuerySet, Avg, Max, Min, Count
 from .generic_dao import GenericDAO
 from ..models import PruebaFisica
 
@@ -12,6 +12,12 @@ class PruebaFisicaDAO(GenericDAO[PruebaFisica]):
     """DAO para operaciones CRUD de PruebaFisica"""
     
     model = PruebaFisica
+    # Columnas de la exportación (CSV/NDJSON)
+    campos_exportacion = [
+        'id', 'atleta_id', 'atleta__dni', 'atleta__nombre_atleta', 'atleta__apellido_atleta',
+        'fecha_registro', 'tipo_prueba', 'nombre_prueba', 'resultado', 'unidad_medida',
+        'valoracion', 'observaciones', 'registrado_por',
+    ]
     
     def get_by_atleta(self, atleta_id: int) -> QuerySet[PruebaFisica]:
         """
@@ -110,24 +116,60 @@ class PruebaFisicaDAO(GenericDAO[PruebaFisica]):
         Returns:
             dict: Estadísticas del atleta por tipo de prueba
         """
-        pruebas = self.get_by_atleta(atleta_id)
+        estadisticas = self._agregar_por_tipo(self.get_by_atleta(atleta_id))
+        return estadisticas.get(int(atleta_id))
+    
+    def get_estadisticas_atletas(self, atleta_ids: Iterable[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+        """
+        Obtiene las estadísticas de varios atletas en una sola consulta.
         
-        if not pruebas.exists():
-            return None
+        Args:
+            atleta_ids: IDs de los atletas
+            
+        Returns:
+            dict: atleta_id -> estadísticas por tipo (None si no tiene pruebas)
+        """
+        atleta_ids = [int(atleta_id) for atleta_id in atleta_ids]
+        estadisticas = self._agregar_por_tipo(
+            self.get_by_filter(atleta_id__in=atleta_ids, estado=True)
+        )
+        return {atleta_id: estadisticas.get(atleta_id) for atleta_id in atleta_ids}
+    
+    def get_estadisticas_grupo(self, grupo_id: int) -> Dict[int, Dict[str, Any]]:
+        """
+        Obtiene las estadísticas de los atletas de un grupo en una sola consulta.
         
-        # Agrupar por tipo de prueba
-        estadisticas = {}
-        tipos = pruebas.values_list('tipo_prueba', flat=True).distinct()
+        Args:
+            grupo_id: ID del grupo
+            
+        Returns:
+            dict: atleta_id -> estadísticas por tipo (solo atletas con pruebas)
+        """
+        return self._agregar_por_tipo(
+            self.get_by_filter(atleta__grupos__id=grupo_id, estado=True)
+        )
+    
+    def _agregar_por_tipo(self, pruebas: QuerySet[PruebaFisica]) -> Dict[int, Dict[str, Any]]:
+        """
+        Agrupa por (atleta, tipo_prueba) con un único GROUP BY.
         
-        for tipo in tipos:
-            pruebas_tipo = pruebas.filter(tipo_prueba=tipo)
-            estadisticas[tipo] = {
-                'total': pruebas_tipo.count(),
-                'resultado_min': pruebas_tipo.aggregate(Min('resultado'))['resultado__min'],
-                'resultado_max': pruebas_tipo.aggregate(Max('resultado'))['resultado__max'],
-                'resultado_promedio': pruebas_tipo.aggregate(Avg('resultado'))['resultado__avg'],
-            }
+        order_by explícito: el ordering del modelo se sumaría al GROUP BY.
+        """
+        filas = pruebas.values('atleta_id', 'tipo_prueba').annotate(
+            total=Count('id'),
+            resultado_min=Min('resultado'),
+            resultado_max=Max('resultado'),
+            resultado_promedio=Avg('resultado'),
+        ).order_by('atleta_id', 'tipo_prueba')
         
+        estadisticas = {}
+        for fila in filas:
+            estadisticas.setdefault(fila['atleta_id'], {})[fila['tipo_prueba']] = {
+                'total': fila['total'],
+                'resultado_min': fila['resultado_min'],
+                'resultado_max': fila['resultado_max'],
+                'resultado_promedio': fila['resultado_promedio'],
+            }
         return estadisticas
     
     def get_ranking_by_tipo(self, tipo_prueba: str, limit: int = 10):
@@ -146,6 +188,29 @@ class PruebaFisicaDAO(GenericDAO[PruebaFisica]):
             estado=True
         ).order_by('-resultado')[:limit]
     
+    def get_para_exportar(self, fecha_inicio=None, fecha_fin=None, tipo_prueba: Optional[str] = None,
+                          grupo_id: Optional[int] = None, atleta_id: Optional[int] = None) -> QuerySet[PruebaFisica]:
+        """
+        Obtiene las pruebas activas a exportar; los filtros en None se ignoran.
+        
+        Args:
+            fecha_inicio: Fecha de registro mínima
+            fecha_fin: Fecha de registro máxima
+            tipo_prueba: Tipo de prueba física
+            grupo_id: ID del grupo de los atletas
+            atleta_id: ID del atleta
+            
+        Returns:
+            QuerySet[PruebaFisica]: QuerySet ordenado por (-fecha_registro, id): más recientes primero
+        """
+        filtros = {
+            'fecha_registro__gte': fecha_inicio, 'fecha_registro__lte': fecha_fin,
+            'tipo_prueba': tipo_prueba, 'atleta__grupos__id': grupo_id, 'atleta_id': atleta_id,
+        }
+        return self.get_by_filter(
+            estado=True, **{campo: valor for campo, valor in filtros.items() if valor is not None}
+        ).order_by('-fecha_registro', 'id')
+    
     def search_pruebas(self, search_term: str) -> QuerySet[PruebaFisica]:
         """
         Busca pruebas por término en datos del atleta o tipo.
@@ -156,14 +221,8 @@ class PruebaFisicaDAO(GenericDAO[PruebaFisica]):
         Returns:
             QuerySet[PruebaFisica]: QuerySet con resultados
         """
-        from django.db.models import Q
-        
-        return self.model.objects.filter(
-            Q(atleta__nombre_atleta__icontains=search_term) |
-            Q(atleta__apellido_atleta__icontains=search_term) |
-            Q(atleta__dni__icontains=search_term) |
-            Q(tipo_prueba__icontains=search_term) |
-            Q(nombre_prueba__icontains=search_term) |
-            Q(observaciones__icontains=search_term),
-            estado=True
-        )
+        return self.search(
+            search_fields=['atleta__nombre_atleta', 'atleta__apellido_atleta', 'atleta__dni',
+                           'tipo_prueba', 'nombre_prueba', 'observaciones'],
+            search_term=search_term
+        ).filter(estado=True)
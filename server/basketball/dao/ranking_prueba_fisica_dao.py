@@ -0,0 +1,167 @@
+"""
+DAO para el modelo RankingPruebaFisica
+"""
+
+from typing import Iterable, List, Dict, Any, Optional, Set
+from django.db import transaction
+from django.db.models import QuerySet, F, Q, Window
+from django.db.models.functions import Rank, RowNumber
+from .generic_dao import GenericDAO
+from ..models import Atleta, RankingPruebaFisica, PruebaFisica
+
+
+class RankingPruebaFisicaDAO(GenericDAO[RankingPruebaFisica]):
+    """DAO del leaderboard precalculado de pruebas físicas"""
+
+    model = RankingPruebaFisica
+    select_related = ['atleta', 'prueba']
+
+    def get_ranking(self, nombre_prueba: str, particion: str = 'general',
+                    limit: int = 10) -> QuerySet[RankingPruebaFisica]:
+        """
+        Obtiene las primeras posiciones de una partición del leaderboard.
+
+        Args:
+            nombre_prueba: Nombre de la prueba
+            particion: 'general', 'sexo:<M|F|O>', 'edad:<inicio banda>' o 'grupo:<id>'
+            limit: Cantidad de posiciones
+
+        Returns:
+            QuerySet[RankingPruebaFisica]: Posiciones ordenadas
+        """
+        return self.get_by_filter(
+            nombre_prueba=nombre_prueba, particion=particion
+        ).order_by('posicion', 'atleta_id')[:limit]
+
+    def get_nombres_prueba(self, atleta_ids: Optional[Iterable[int]] = None) -> List[str]:
+        """Nombres de prueba con pruebas activas, de todos los atletas o de los indicados"""
+        queryset = PruebaFisica.objects.filter(estado=True)
+        if atleta_ids is not None:
+            queryset = queryset.filter(atleta_id__in=atleta_ids)
+        return list(queryset.order_by('nombre_prueba').values_list('nombre_prueba', flat=True).distinct())
+
+    def get_particiones_de_atletas(self, atleta_ids: Iterable[int], banda_edad: int) -> Set[str]:
+        """
+        Particiones del leaderboard a las que pertenecen hoy unos atletas.
+
+        Args:
+            atleta_ids: IDs de los atletas
+            banda_edad: Años por banda de edad
+
+        Returns:
+            Set[str]: 'general', sus sexos, sus bandas de edad y sus grupos
+        """
+        atleta_ids = list(atleta_ids)
+        particiones = {'general'}
+        for sexo, edad in Atleta.objects.filter(pk__in=atleta_ids).values_list('sexo', 'edad'):
+            particiones |= {f'sexo:{sexo}', f'edad:{edad // banda_edad * banda_edad}'}
+        grupos = Atleta.objects.filter(pk__in=atleta_ids, grupos__isnull=False).values_list('grupos__id', flat=True)
+        particiones |= {f'grupo:{grupo_id}' for grupo_id in grupos.distinct()}
+        return particiones
+
+    def get_tipo_prueba(self, nombre_prueba: str):
+        """Tipo de la prueba más reciente con ese nombre (define la dirección por defecto)"""
+        return PruebaFisica.objects.filter(nombre_prueba=nombre_prueba).order_by(
+            '-fecha_registro', '-id'
+        ).values_list('tipo_prueba', flat=True).first()
+
+    @transaction.atomic
+    def recalcular(self, nombre_prueba: str, menor_es_mejor: bool, banda_edad: int,
+                   particiones: Optional[Iterable[str]] = None) -> int:
+        """
+        Recalcula el leaderboard de una prueba con funciones de ventana.
+
+        ROW_NUMBER() por atleta elige su mejor intento; sobre esos intentos,
+        RANK() por partición (general, sexo, banda de edad y grupo) asigna la
+        posición, compartida en caso de empate.
+
+        Con particiones solo se reescriben esas particiones (una consulta por
+        partición): las posiciones de una partición solo dependen de sus
+        atletas, así que el resto del leaderboard no cambia.
+
+        Args:
+            nombre_prueba: Nombre de la prueba a recalcular
+            menor_es_mejor: True si un resultado menor es mejor (p.ej. tiempos)
+            banda_edad: Años por banda de edad
+            particiones: Claves de partición a recalcular (None = todo el leaderboard)
+
+        Returns:
+            int: Filas escritas en el leaderboard
+        """
+        def orden():
+            return F('resultado').asc() if menor_es_mejor else F('resultado').desc()
+
+        mejores = PruebaFisica.objects.filter(
+            nombre_prueba=nombre_prueba, estado=True, atleta__estado=True
+        ).annotate(
+            intento=Window(
+                RowNumber(),
+                partition_by=[F('atleta_id')],
+                order_by=[orden(), F('fecha_registro').asc(), F('id').asc()],
+            )
+        ).filter(intento=1).values('id')
+        base = PruebaFisica.objects.filter(id__in=mejores).order_by()
+
+        ranking: List[Dict[str, Any]] = []
+
+        def agregar(fila, particion, posicion):
+            ranking.append({
+                'nombre_prueba': nombre_prueba,
+                'particion': particion,
+                'posicion': posicion,
+                'atleta_id': fila['atleta_id'],
+                'prueba_id': fila['id'],
+                'resultado': fila['resultado'],
+            })
+
+        if particiones is not None:
+            particiones = set(particiones)
+            for particion in sorted(particiones):
+                filas = base.filter(self._filtro_particion(particion, banda_edad)).annotate(
+                    posicion=Window(Rank(), order_by=[orden()]),
+                ).values('id', 'atleta_id', 'resultado', 'posicion')
+                for fila in filas:
+                    agregar(fila, particion, fila['posicion'])
+            self.bulk_delete(nombre_prueba=nombre_prueba, particion__in=particiones)
+            self.bulk_create(ranking)
+            return len(ranking)
+
+        # División entera: inicio de la banda de edad del atleta
+        banda = F('atleta__edad') / banda_edad * banda_edad
+
+        filas = base.annotate(
+            banda=banda,
+            pos_general=Window(Rank(), order_by=[orden()]),
+            pos_sexo=Window(Rank(), partition_by=[F('atleta__sexo')], order_by=[orden()]),
+            pos_edad=Window(Rank(), partition_by=[banda], order_by=[orden()]),
+        ).values('id', 'atleta_id', 'resultado', 'atleta__sexo', 'banda',
+                 'pos_general', 'pos_sexo', 'pos_edad')
+        filas_grupo = base.filter(atleta__grupos__estado=True).annotate(
+            grupo_id=F('atleta__grupos__id'),
+            pos_grupo=Window(Rank(), partition_by=[F('atleta__grupos__id')], order_by=[orden()]),
+        ).values('id', 'atleta_id', 'resultado', 'grupo_id', 'pos_grupo')
+
+        for fila in filas:
+            agregar(fila, 'general', fila['pos_general'])
+            agregar(fila, f"sexo:{fila['atleta__sexo']}", fila['pos_sexo'])
+            agregar(fila, f"edad:{fila['banda']}", fila['pos_edad'])
+        for fila in filas_grupo:
+            agregar(fila, f"grupo:{fila['grupo_id']}", fila['pos_grupo'])
+
+        self.bulk_delete(nombre_prueba=nombre_prueba)
+        self.bulk_create(ranking)
+        return len(ranking)
+
+    @staticmethod
+    def _filtro_particion(particion: str, banda_edad: int) -> Q:
+        """Filtro de los intentos (PruebaFisica) que pertenecen a una partición"""
+        tipo, _, valor = particion.partition(':')
+        if tipo == 'general':
+            return Q()
+        if tipo == 'sexo':
+            return Q(atleta__sexo=valor)
+        if tipo == 'edad':
+            return Q(atleta__edad__gte=int(valor), atleta__edad__lt=int(valor) + banda_edad)
+        if tipo == 'grupo':
+            return Q(atleta__grupos__id=int(valor), atleta__grupos__estado=True)
+        raise ValueError(f"Partición desconocida: {particion}")
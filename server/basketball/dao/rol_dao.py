@@ -0,0 +1,45 @@
+"""
+DAO del directorio de roles (Administrador, Entrenador, Pasante)
+
+No extiende GenericDAO porque no opera sobre un único modelo: resuelve en
+qué tablas de personal está activa una persona con una sola consulta UNION.
+"""
+
+from typing import List
+from django.db.models import CharField, Value
+from ..models import Administrador, Entrenador, Pasante
+
+
+class RolDAO:
+    """Consulta de los roles activos de una persona"""
+
+    # Orden de prioridad del rol cuando una persona está en varias tablas
+    MODELOS = (
+        ('ADMIN', Administrador),
+        ('ENTRENADOR', Entrenador),
+        ('PASANTE', Pasante),
+    )
+
+    def get_roles(self, persona_external: str) -> List[str]:
+        """
+        Obtiene los roles activos de una persona con una sola consulta.
+
+        Args:
+            persona_external: UUID externo de la persona
+
+        Returns:
+            List[str]: Roles en orden de prioridad (ADMIN, ENTRENADOR, PASANTE)
+        """
+        consultas = [
+            model.objects.filter(persona_external=persona_external, estado=True)
+            .order_by()
+            .annotate(rol=Value(rol, output_field=CharField()))
+            .values_list('rol', flat=True)
+            for rol, model in self.MODELOS
+        ]
+        encontrados = set(consultas[0].union(*consultas[1:], all=True))
+        return [rol for rol, _ in self.MODELOS if rol in encontrados]
+
+    def get_modelos(self):
+        """Modelos del directorio, para invalidar caches que dependen de él"""
+        return [model for _, model in self.MODELOS]
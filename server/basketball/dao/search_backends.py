@@ -0,0 +1,213 @@
+"""
+Backends de búsqueda de texto para GenericDAO.search
+
+- BasicSearchBackend: OR de __icontains (recorrido secuencial), siempre disponible.
+- PostgresTrigramSearchBackend: el mismo filtro, acelerado por índices GIN
+  pg_trgm sobre UPPER(col::text) y ordenado por similitud.
+- SQLiteFTS5SearchBackend: tablas FTS5 con tokenizer trigram (<tabla>_fts)
+  sincronizadas por triggers.
+
+Las columnas indexadas se declaran en SEARCH_INDEXES y las crea la
+migración 0003_search_indexes; los campos sin índice se siguen buscando con
+__icontains, así que los resultados no cambian entre backends.
+
+En SQLite los triggers viven en la tabla y desaparecen cuando una migración
+la reconstruye (_remake_table); asegurar_triggers_fts los vuelve a crear
+después de cada migrate (señal post_migrate).
+"""
+
+import logging
+from functools import reduce
+from operator import or_
+from typing import Dict, List, Optional, Type
+from django.conf import settings
+from django.db import connections, models
+from django.db.models import Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+# db_table -> columnas con índice de texto (deben coincidir con la migración)
+SEARCH_INDEXES: Dict[str, List[str]] = {
+    'atleta': ['nombre_atleta', 'apellido_atleta', 'dni', 'email'],
+    'prueba_fisica': ['tipo_prueba', 'nombre_prueba', 'observaciones'],
+    'prueba_antropometrica': ['observaciones'],
+}
+
+# El tokenizer trigram de FTS5 no indexa términos de menos de 3 caracteres
+MIN_TRIGRAM_LENGTH = 3
+
+
+class BasicSearchBackend:
+    """Búsqueda con OR de __icontains (comportamiento original de GenericDAO.search)"""
+
+    name = 'basic'
+
+    def search(self, queryset: QuerySet, search_fields: List[str], search_term: str) -> QuerySet:
+        return queryset.filter(self.icontains(search_fields, search_term))
+
+    @staticmethod
+    def icontains(search_fields: List[str], search_term: str) -> Q:
+        q_objects = Q()
+        for field in search_fields:
+            q_objects |= Q(**{f"{field}__icontains": search_term})
+        return q_objects
+
+
+class PostgresTrigramSearchBackend(BasicSearchBackend):
+    """
+    PostgreSQL + pg_trgm.
+
+    Django traduce __icontains a UPPER(col::text) LIKE UPPER(%term%); los
+    índices GIN gin_trgm_ops sobre esa misma expresión lo resuelven sin
+    recorrer la tabla. Los resultados se ordenan por similitud con el término.
+    """
+
+    name = 'postgres_trigram'
+
+    def search(self, queryset: QuerySet, search_fields: List[str], search_term: str) -> QuerySet:
+        from django.contrib.postgres.search import TrigramSimilarity
+        from django.db.models.functions import Greatest
+
+        queryset = super().search(queryset, search_fields, search_term)
+        similitudes = [TrigramSimilarity(field, search_term) for field in search_fields]
+        rank = similitudes[0] if len(similitudes) == 1 else Greatest(*similitudes)
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        return queryset.annotate(search_rank=rank).order_by('-search_rank', *ordering)
+
+
+class SQLiteFTS5SearchBackend(BasicSearchBackend):
+    """
+    SQLite + FTS5 (tokenizer trigram).
+
+    Agrupa los campos por tabla (propios o de una relación, p.ej.
+    atleta__dni) y consulta cada tabla <tabla>_fts con un filtro de columnas;
+    el resultado se combina con pk__in / <relación>_id__in.
+    """
+
+    name = 'sqlite_fts5'
+
+    def search(self, queryset: QuerySet, search_fields: List[str], search_term: str) -> QuerySet:
+        if len(search_term) < MIN_TRIGRAM_LENGTH:
+            return super().search(queryset, search_fields, search_term)
+
+        por_tabla: Dict[str, tuple] = {}
+        sin_indice = []
+        for field in search_fields:
+            prefix, model, column = self._resolve(queryset.model, field)
+            if column in SEARCH_INDEXES.get(model._meta.db_table, []):
+                por_tabla.setdefault(prefix, (model, []))[1].append(column)
+            else:
+                sin_indice.append(field)
+
+        condiciones = [self.icontains(sin_indice, search_term)] if sin_indice else []
+        for prefix, (model, columns) in por_tabla.items():
+            tabla_fts = f'{model._meta.db_table}_fts'
+            match = '{%s} : "%s"' % (' '.join(columns), search_term.replace('"', '""'))
+            rowids = RawSQL(f'SELECT rowid FROM "{tabla_fts}" WHERE "{tabla_fts}" MATCH %s', [match])
+            condiciones.append(Q(**{f'{prefix}pk__in': rowids}))
+        return queryset.filter(reduce(or_, condiciones))
+
+    @staticmethod
+    def _resolve(model: Type[models.Model], field: str):
+        """Separa 'atleta__dni' en ('atleta__', Atleta, 'dni')"""
+        *path, name = field.split('__')
+        for step in path:
+            model = model._meta.get_field(step).related_model
+        column = model._meta.get_field(name).column
+        return ''.join(f'{step}__' for step in path), model, column
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (BasicSearchBackend, PostgresTrigramSearchBackend, SQLiteFTS5SearchBackend)
+}
+
+_fts5_disponible: Dict[str, bool] = {}
+
+
+def _sqlite_fts5_disponible(alias: str) -> bool:
+    # Sin la migración (SQLite sin trigram) no existen las tablas _fts
+    if alias not in _fts5_disponible:
+        tablas = connections[alias].introspection.table_names()
+        _fts5_disponible[alias] = all(f'{tabla}_fts' in tablas for tabla in SEARCH_INDEXES)
+    return _fts5_disponible[alias]
+
+
+def asegurar_triggers_fts(alias: str = 'default') -> List[str]:
+    """
+    Vuelve a crear los triggers de sincronización de las tablas <tabla>_fts
+    que los hayan perdido y reconstruye su índice.
+
+    Es idempotente: las tablas con sus tres triggers no se tocan, y sin
+    tablas FTS5 (otro motor o SQLite sin trigram) no hace nada.
+
+    Args:
+        alias: Alias de la base de datos
+
+    Returns:
+        List[str]: Tablas cuyos triggers se recrearon
+    """
+    connection = connections[alias]
+    if connection.vendor != 'sqlite':
+        return []
+    recreadas = []
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existentes = set(cursor.fetchall())
+        for tabla, columnas in SEARCH_INDEXES.items():
+            fts = f'{tabla}_fts'
+            if ('table', fts) not in existentes:
+                continue
+            triggers = [f'{fts}_{sufijo}' for sufijo in ('ai', 'ad', 'au')]
+            if all(('trigger', trigger) in existentes for trigger in triggers):
+                continue
+            cols = ', '.join(columnas)
+            new = ', '.join(f'new.{c}' for c in columnas)
+            old = ', '.join(f'old.{c}' for c in columnas)
+            for trigger in triggers:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+            cursor.execute(
+                f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {tabla} BEGIN "
+                f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {tabla} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER {fts}_au AFTER UPDATE ON {tabla} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+                f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END"
+            )
+            # Las filas escritas sin triggers no están en el índice
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            recreadas.append(tabla)
+    if recreadas:
+        logger.warning('Triggers FTS5 recreados en %s: %s', alias, ', '.join(recreadas))
+    return recreadas
+
+
+def get_search_backend(alias: str = 'default') -> BasicSearchBackend:
+    """
+    Obtiene el backend de búsqueda según SEARCH_BACKEND.
+
+    'auto' (por defecto) elige según el motor de la base de datos y cae al
+    backend básico si los índices no están disponibles.
+
+    Args:
+        alias: Alias de la base de datos
+
+    Returns:
+        BasicSearchBackend: Instancia del backend
+    """
+    name: Optional[str] = getattr(settings, 'SEARCH_BACKEND', 'auto')
+    if name == 'auto':
+        vendor = connections[alias].vendor
+        if vendor == 'postgresql':
+            name = PostgresTrigramSearchBackend.name
+        elif vendor == 'sqlite' and _sqlite_fts5_disponible(alias):
+            name = SQLiteFTS5SearchBackend.name
+        else:
+            name = BasicSearchBackend.name
+    return BACKENDS[name]()
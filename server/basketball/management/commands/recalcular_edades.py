@@ -0,0 +1,29 @@
+"""
+Recalcula la edad guardada de los atletas a partir de su fecha de nacimiento
+
+Atleta.edad no se actualiza sola al cumplir años; ejecutarlo a diario
+(servicio edades de docker-compose o cron) mantiene correctos los filtros
+por edad y la asignación automática a grupos. Solo escribe las filas cuya
+edad cambió.
+
+Ejecutar: python manage.py recalcular_edades [--fecha 2026-03-01]
+"""
+
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from basketball.services.atleta_service import AtletaService
+
+
+class Command(BaseCommand):
+    help = 'Recalcula la edad de los atletas desde su fecha de nacimiento'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fecha', default=None, help='Fecha de referencia AAAA-MM-DD (por defecto hoy)')
+
+    def handle(self, *args, **options):
+        try:
+            hoy = date.fromisoformat(options['fecha']) if options['fecha'] else None
+        except ValueError:
+            raise CommandError(f"Fecha inválida: {options['fecha']}")
+        actualizados = AtletaService().recalcular_edades(hoy)
+        self.stdout.write(self.style.SUCCESS(f'Edades recalculadas ({actualizados} atletas actualizados)'))
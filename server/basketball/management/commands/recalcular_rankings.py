@@ -0,0 +1,26 @@
+"""
+Recalcula el leaderboard precalculado de pruebas físicas
+
+Necesario tras cargas masivas (bulk_create no dispara señales) o cambios en
+la configuración de dirección/bandas de edad.
+
+Ejecutar: python manage.py recalcular_rankings [--prueba "Sprint 20m"]
+"""
+
+from django.core.management.base import BaseCommand
+from basketball.services.ranking_service import RankingService
+
+
+class Command(BaseCommand):
+    help = 'Recalcula los rankings de pruebas físicas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prueba', default=None, help='Nombre de la prueba (por defecto todas)')
+
+    def handle(self, *args, **options):
+        service = RankingService()
+        if options['prueba']:
+            filas = service.recalcular_ranking(options['prueba'])
+        else:
+            filas = service.recalcular_todos()
+        self.stdout.write(self.style.SUCCESS(f'Rankings recalculados ({filas} filas)'))
@@ -0,0 +1,64 @@
+"""
+Reporte por ruta de las métricas de peticiones
+
+Fusiona los agregados que cada proceso del servidor persiste en
+REQUEST_METRICS_DIR y muestra conteo, latencia, consultas SQL y llamadas al
+user_module (promedio y p50/p95/p99) por ruta.
+
+Ejecutar: python manage.py request_metrics_report [--dir DIR] [--json] [--sort total_ms] [--reset]
+"""
+
+import json
+import os
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from basketball.request_metrics import METRIC_FIELDS, build_report, load_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Muestra las métricas agregadas por ruta (consultas SQL, llamadas HTTP y latencia)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', default=None,
+                            help='Directorio de snapshots (por defecto REQUEST_METRICS_DIR)')
+        parser.add_argument('--json', action='store_true', help='Imprime el reporte como JSON')
+        parser.add_argument('--sort', default='total_ms', choices=('count',) + METRIC_FIELDS,
+                            help='Métrica por la que se ordenan las rutas (p95, descendente)')
+        parser.add_argument('--reset', action='store_true',
+                            help='Elimina los snapshots después de reportar')
+
+    def handle(self, *args, **options):
+        directory = options['dir'] or getattr(settings, 'REQUEST_METRICS_DIR', None)
+        if not directory:
+            raise CommandError('Configure REQUEST_METRICS_DIR o indique --dir')
+
+        report = build_report(load_snapshots(directory))
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        elif not report:
+            self.stdout.write(f'Sin métricas en {directory}')
+        else:
+            self._write_table(report, options['sort'])
+
+        if options['reset']:
+            for name in os.listdir(directory):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(directory, name))
+            self.stdout.write(self.style.SUCCESS('Snapshots eliminados'))
+
+    def _write_table(self, report, sort):
+        def sort_key(item):
+            stats = item[1]
+            return stats['count'] if sort == 'count' else stats[sort]['p95']
+
+        header = (f"{'ruta':<40} {'n':>7} {'total p50':>10} {'p95':>9} {'p99':>9} "
+                  f"{'sql avg':>8} {'sql p95':>8} {'db p95':>8} {'http avg':>9} {'http p95':>9}")
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for route, stats in sorted(report.items(), key=sort_key, reverse=True):
+            total = stats['total_ms']
+            self.stdout.write(
+                f"{route[:40]:<40} {stats['count']:>7} {total['p50']:>10.1f} {total['p95']:>9.1f} "
+                f"{total['p99']:>9.1f} {stats['db_queries']['avg']:>8.1f} {stats['db_queries']['p95']:>8} "
+                f"{stats['db_ms']['p95']:>8.1f} {stats['http_calls']['avg']:>9.1f} {stats['http_calls']['p95']:>9}"
+            )
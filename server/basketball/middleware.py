@@ -0,0 +1,73 @@
+"""
+Middlewares del módulo Basketball
+"""
+
+import random
+import logging
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+from . import request_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetricsMiddleware:
+    """
+    Mide consultas SQL, llamadas HTTP salientes y latencia de cada petición.
+
+    Solo mide una fracción REQUEST_METRICS_SAMPLE_RATE de las peticiones
+    bajo REQUEST_METRICS_PATH_PREFIX; el resto pasa sin ningún costo extra.
+    Las peticiones medidas reciben el header Server-Timing y se agregan por
+    ruta en request_metrics.store.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self._should_sample(request):
+            return self.get_response(request)
+
+        metrics = request_metrics.RequestMetrics()
+        token = request_metrics.activate(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            request_metrics.deactivate(token)
+
+        sample = metrics.sample()
+        response['Server-Timing'] = request_metrics.format_server_timing(sample)
+        request_metrics.store.add(self._get_route(request), sample)
+        self._flush()
+        return response
+
+    @staticmethod
+    def _should_sample(request):
+        if not request.path.startswith(getattr(settings, 'REQUEST_METRICS_PATH_PREFIX', '/api/')):
+            return False
+        rate = getattr(settings, 'REQUEST_METRICS_SAMPLE_RATE', 1.0)
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+    @staticmethod
+    def _get_route(request):
+        # Se agrupa por patrón de URL (no por path) para no crear una ruta por ID
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return f'{request.method} <sin ruta>'
+        return f'{request.method} {match.view_name or match.route}'
+
+    @staticmethod
+    def _flush():
+        directory = getattr(settings, 'REQUEST_METRICS_DIR', None)
+        if not directory:
+            return
+        if not request_metrics.store.should_flush(getattr(settings, 'REQUEST_METRICS_FLUSH_INTERVAL', 60)):
+            return
+        try:
+            request_metrics.store.flush(directory)
+        except OSError as e:
+            logger.warning(f"No se pudieron persistir las métricas de peticiones: {e}")
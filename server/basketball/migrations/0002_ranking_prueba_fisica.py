@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('basketball', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankingPruebaFisica',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre_prueba', models.CharField(max_length=100, verbose_name='Nombre de la prueba')),
+                ('particion', models.CharField(max_length=40, verbose_name='Partición')),
+                ('posicion', models.PositiveIntegerField(verbose_name='Posición')),
+                ('resultado', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Resultado')),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('atleta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rankings', to='basketball.atleta', verbose_name='Atleta')),
+                ('prueba', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rankings', to='basketball.pruebafisica', verbose_name='Mejor intento')),
+            ],
+            options={
+                'verbose_name': 'Ranking de Prueba Física',
+                'verbose_name_plural': 'Rankings de Pruebas Físicas',
+                'db_table': 'ranking_prueba_fisica',
+                'ordering': ['nombre_prueba', 'particion', 'posicion'],
+                'indexes': [models.Index(fields=['nombre_prueba', 'particion', 'posicion'], name='ranking_lectura_idx')],
+                'constraints': [models.UniqueConstraint(fields=('nombre_prueba', 'particion', 'atleta'), name='ranking_unico_por_atleta')],
+            },
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Índices de texto para GenericDAO.search (ver basketball/dao/search_backends.py)
+
+from django.db import migrations
+
+# db_table -> columnas indexadas (congelado: no importar SEARCH_INDEXES aquí)
+INDEXES = {
+    'atleta': ['nombre_atleta', 'apellido_atleta', 'dni', 'email'],
+    'prueba_fisica': ['tipo_prueba', 'nombre_prueba', 'observaciones'],
+    'prueba_antropometrica': ['observaciones'],
+}
+
+
+def _sqlite_trigram_disponible(cursor):
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE temp.trigram_check USING fts5(x, tokenize='trigram')")
+        cursor.execute("DROP TABLE temp.trigram_check")
+        return True
+    except Exception:
+        return False
+
+
+def crear_indices(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == 'postgresql':
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            for tabla, columnas in INDEXES.items():
+                for columna in columnas:
+                    # Misma expresión que genera Django para __icontains
+                    cursor.execute(
+                        f'CREATE INDEX IF NOT EXISTS "{tabla}_{columna}_trgm" ON "{tabla}" '
+                        f'USING gin ((UPPER("{columna}"::text)) gin_trgm_ops)'
+                    )
+        elif vendor == 'sqlite':
+            if not _sqlite_trigram_disponible(cursor):
+                # Sin tokenizer trigram (SQLite < 3.34) se usa la búsqueda básica
+                return
+            for tabla, columnas in INDEXES.items():
+                fts = f'{tabla}_fts'
+                cols = ', '.join(columnas)
+                new = ', '.join(f'new.{c}' for c in columnas)
+                old = ', '.join(f'old.{c}' for c in columnas)
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{tabla}', "
+                    f"content_rowid='id', tokenize='trigram')"
+                )
+                cursor.execute(
+                    f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {tabla} BEGIN "
+                    f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END"
+                )
+                cursor.execute(
+                    f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {tabla} BEGIN "
+                    f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END"
+                )
+                cursor.execute(
+                    f"CREATE TRIGGER {fts}_au AFTER UPDATE ON {tabla} BEGIN "
+                    f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+                    f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END"
+                )
+                cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def eliminar_indices(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    with schema_editor.connection.cursor() as cursor:
+        for tabla, columnas in INDEXES.items():
+            if vendor == 'postgresql':
+                for columna in columnas:
+                    cursor.execute(f'DROP INDEX IF EXISTS "{tabla}_{columna}_trgm"')
+            elif vendor == 'sqlite':
+                for sufijo in ('ai', 'ad', 'au'):
+                    cursor.execute(f'DROP TRIGGER IF EXISTS {tabla}_fts_{sufijo}')
+                cursor.execute(f'DROP TABLE IF EXISTS {tabla}_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('basketball', '0002_ranking_prueba_fisica'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, eliminar_indices),
+    ]
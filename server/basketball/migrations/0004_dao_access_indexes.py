@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('basketball', '0003_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='atleta',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['apellido_atleta', 'nombre_atleta'], name='atleta_activos_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='atleta',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['sexo', 'apellido_atleta', 'nombre_atleta'], name='atleta_sexo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='atleta',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['edad'], name='atleta_edad_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grupoatleta',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['rango_edad_minima', 'rango_edad_maxima'], name='grupo_rango_edad_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inscripcion',
+            index=models.Index(condition=models.Q(('habilitada', True)), fields=['-fecha_inscripcion'], name='insc_habilitadas_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inscripcion',
+            index=models.Index(condition=models.Q(('habilitada', True)), fields=['tipo_inscripcion', '-fecha_inscripcion'], name='insc_tipo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inscripcion',
+            index=models.Index(fields=['fecha_inscripcion'], name='insc_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inscripcion',
+            index=models.Index(fields=['registrado_por'], name='insc_registrador_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pruebaantropometrica',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['atleta', '-fecha_registro'], name='pa_atleta_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pruebaantropometrica',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['-fecha_registro', 'id'], name='pa_activas_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pruebaantropometrica',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['registrado_por'], name='pa_registrador_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pruebafisica',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['atleta', '-fecha_registro'], name='pf_atleta_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pruebafisica',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['atleta', 'tipo_prueba', 'resultado'], name='pf_atleta_tipo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pruebafisica',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['tipo_prueba', '-resultado'], name='pf_tipo_resultado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pruebafisica',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['nombre_prueba', 'atleta', 'resultado'], name='pf_nombre_prueba_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pruebafisica',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['-fecha_registro', 'id'], name='pf_activas_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pruebafisica',
+            index=models.Index(condition=models.Q(('estado', True)), fields=['registrado_por'], name='pf_registrador_idx'),
+        ),
+    ]
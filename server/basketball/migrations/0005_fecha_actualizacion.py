@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:49
+
+from django.db import migrations, models
+
+# Tablas con índice FTS5 de 0003_search_indexes (congelado). En SQLite AddField
+# reconstruye la tabla y elimina sus triggers, así que se vuelven a crear.
+INDEXES = {
+    'atleta': ['nombre_atleta', 'apellido_atleta', 'dni', 'email'],
+    'prueba_fisica': ['tipo_prueba', 'nombre_prueba', 'observaciones'],
+    'prueba_antropometrica': ['observaciones'],
+}
+
+
+def restaurar_triggers_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for tabla, columnas in INDEXES.items():
+            fts = f'{tabla}_fts'
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [fts])
+            if cursor.fetchone() is None:
+                # Sin tokenizer trigram no se creó el índice (búsqueda básica)
+                continue
+            cols = ', '.join(columnas)
+            new = ', '.join(f'new.{c}' for c in columnas)
+            old = ', '.join(f'old.{c}' for c in columnas)
+            for sufijo in ('ai', 'ad', 'au'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {fts}_{sufijo}')
+            cursor.execute(
+                f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {tabla} BEGIN "
+                f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {tabla} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER {fts}_au AFTER UPDATE ON {tabla} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+                f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END"
+            )
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('basketball', '0004_dao_access_indexes'),
+    ]
+
+    operations = [
+        # Al revertir, RemoveField también reconstruye las tablas
+        migrations.RunPython(migrations.RunPython.noop, restaurar_triggers_fts),
+        migrations.AddField(
+            model_name='administrador',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización'),
+        ),
+        migrations.AddField(
+            model_name='atleta',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización'),
+        ),
+        migrations.AddField(
+            model_name='entrenador',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización'),
+        ),
+        migrations.AddField(
+            model_name='grupoatleta',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización'),
+        ),
+        migrations.AddField(
+            model_name='pasante',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización'),
+        ),
+        migrations.AddField(
+            model_name='pruebaantropometrica',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización'),
+        ),
+        migrations.AddField(
+            model_name='pruebafisica',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización'),
+        ),
+        migrations.RunPython(restaurar_triggers_fts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('basketball', '0005_fecha_actualizacion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='atleta',
+            index=models.Index(fields=['fecha_nacimiento'], name='atleta_fecha_nac_idx'),
+        ),
+    ]
@@ -52,6 +52,7 @@ class Entrenador(models.Model):
     especialidad = models.CharField(max_length=100, verbose_name='Especialidad')
     club_asignado = models.CharField(max_length=100, verbose_name='Club asignado')
     fecha_registro = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de registro')
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')
     estado = models.BooleanField(default=True, verbose_name='Estado')
 
     class Meta:
@@ -84,6 +85,7 @@ class Pasante(models.Model):
     fecha_inicio = models.DateField(verbose_name='Fecha de inicio de vinculación')
     fecha_fin = models.DateField(blank=True, null=True, verbose_name='Fecha de fin de vinculación')
     fecha_registro = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de registro')
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')
     estado = models.BooleanField(default=True, verbose_name='Estado')
 
     class Meta:
@@ -112,6 +114,7 @@ class Administrador(models.Model):
     )
     cargo = models.CharField(max_length=100, blank=True, null=True, verbose_name='Cargo')
     fecha_registro = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de registro')
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')
     estado = models.BooleanField(default=True, verbose_name='Estado')
 
     class Meta:
@@ -141,6 +144,7 @@ class GrupoAtleta(models.Model):
     categoria = models.CharField(max_length=50, verbose_name='Categoría')
     descripcion = models.TextField(blank=True, null=True, verbose_name='Descripción')
     fecha_creacion = models.DateField(auto_now_add=True, verbose_name='Fecha de creación')
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')
     estado = models.BooleanField(default=True, verbose_name='Estado')
     
     # Relación con Entrenador - Un entrenador puede tener múltiples grupos
@@ -156,6 +160,13 @@ class GrupoAtleta(models.Model):
         verbose_name = 'Grupo de Atleta'
         verbose_name_plural = 'Grupos de Atletas'
         ordering = ['nombre']
+        indexes = [
+            # GrupoAtletaDAO.get_by_rango_edad
+            models.Index(
+                fields=['rango_edad_minima', 'rango_edad_maxima'], name='grupo_rango_edad_idx',
+                condition=models.Q(estado=True)
+            ),
+        ]
 
     def __str__(self):
         return f"{self.nombre} - {self.categoria}"
@@ -186,6 +197,7 @@ class Atleta(models.Model):
     telefono_representante = models.CharField(max_length=20, blank=True, null=True, verbose_name='Teléfono representante')
     foto = models.CharField(max_length=255, blank=True, null=True, verbose_name='Foto')
     fecha_registro = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de registro')
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')
     estado = models.BooleanField(default=True, verbose_name='Estado')
     
     # Relación con GrupoAtleta - ManyToMany
@@ -201,6 +213,22 @@ class Atleta(models.Model):
         verbose_name = 'Atleta'
         verbose_name_plural = 'Atletas'
         ordering = ['apellido_atleta', 'nombre_atleta']
+        indexes = [
+            # AtletaDAO.get_activos / listado ordenado
+            models.Index(
+                fields=['apellido_atleta', 'nombre_atleta'], name='atleta_activos_idx',
+                condition=models.Q(estado=True)
+            ),
+            # AtletaDAO.get_by_sexo
+            models.Index(
+                fields=['sexo', 'apellido_atleta', 'nombre_atleta'], name='atleta_sexo_idx',
+                condition=models.Q(estado=True)
+            ),
+            # AtletaDAO.get_by_rango_edad
+            models.Index(fields=['edad'], name='atleta_edad_idx', condition=models.Q(estado=True)),
+            # AtletaDAO.recalcular_edades y filtros de edad por fecha de nacimiento
+            models.Index(fields=['fecha_nacimiento'], name='atleta_fecha_nac_idx'),
+        ]
 
     def __str__(self):
         return f"{self.nombre_atleta} {self.apellido_atleta}"
@@ -241,6 +269,21 @@ class Inscripcion(models.Model):
         verbose_name = 'Inscripción'
         verbose_name_plural = 'Inscripciones'
         ordering = ['-fecha_inscripcion']
+        indexes = [
+            # InscripcionDAO.get_habilitadas (ordenadas por fecha)
+            models.Index(
+                fields=['-fecha_inscripcion'], name='insc_habilitadas_idx',
+                condition=models.Q(habilitada=True)
+            ),
+            # InscripcionDAO.get_by_tipo
+            models.Index(
+                fields=['tipo_inscripcion', '-fecha_inscripcion'], name='insc_tipo_idx',
+                condition=models.Q(habilitada=True)
+            ),
+            # InscripcionDAO.get_by_fecha_range / get_by_registrador
+            models.Index(fields=['fecha_inscripcion'], name='insc_fecha_idx'),
+            models.Index(fields=['registrado_por'], name='insc_registrador_idx'),
+        ]
 
     def __str__(self):
         return f"Inscripción {self.id} - {self.atleta}"
@@ -310,6 +353,7 @@ class PruebaAntropometrica(models.Model):
     )
     observaciones = models.TextField(blank=True, null=True, verbose_name='Observaciones')
     fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')
     estado = models.BooleanField(default=True, verbose_name='Estado')
     
     # Referencia a quien registró la prueba
@@ -325,18 +369,65 @@ class PruebaAntropometrica(models.Model):
         verbose_name = 'Prueba Antropométrica'
         verbose_name_plural = 'Pruebas Antropométricas'
         ordering = ['-fecha_registro']
+        indexes = [
+            # get_by_atleta / get_ultima_by_atleta / última medición por atleta
+            models.Index(
+                fields=['atleta', '-fecha_registro'], name='pa_atleta_fecha_idx',
+                condition=models.Q(estado=True)
+            ),
+            # get_activas (cursor por fecha_registro, id) / get_by_fecha_range
+            models.Index(
+                fields=['-fecha_registro', 'id'], name='pa_activas_fecha_idx',
+                condition=models.Q(estado=True)
+            ),
+            # get_by_registrador
+            models.Index(
+                fields=['registrado_por'], name='pa_registrador_idx',
+                condition=models.Q(estado=True)
+            ),
+        ]
 
     def __str__(self):
         return f"Prueba Antropométrica {self.id} - {self.atleta}"
     
+    # Índices derivados: campo -> (medidas de las que depende, fórmula).
+    # save() los calcula por instancia y calcular_indices_lote por lote
+    # (bulk_create no llama a save()).
+    INDICES_DERIVADOS = {
+        # IMC = peso(kg) / estatura(m)²
+        'indice_masa_corporal': (('peso', 'estatura'), lambda peso, estatura: peso / ((estatura / 100) ** 2)),
+        # Índice córnico = altura sentado / estatura × 100
+        'indice_cornico': (
+            ('altura_sentado', 'estatura'),
+            lambda altura_sentado, estatura: altura_sentado / estatura * 100
+        ),
+    }
+
     def save(self, *args, **kwargs):
-        """Calcula automáticamente el IMC si no se proporciona"""
-        if self.peso and self.estatura and not self.indice_masa_corporal:
-            # IMC = peso(kg) / estatura(m)²
-            estatura_metros = self.estatura / 100
-            self.indice_masa_corporal = self.peso / (estatura_metros ** 2)
+        """Calcula automáticamente el IMC y el índice córnico si no se proporcionan"""
+        for campo, (medidas, formula) in self.INDICES_DERIVADOS.items():
+            valores = [getattr(self, medida) for medida in medidas]
+            if all(valores) and not getattr(self, campo):
+                setattr(self, campo, formula(*valores))
         super().save(*args, **kwargs)
 
+    @classmethod
+    def calcular_indices_lote(cls, filas: list) -> None:
+        """
+        Calcula los índices derivados de un lote de filas (dicts de campos) antes de bulk_create.
+
+        Recorre el lote una vez por índice con la misma fórmula y condición
+        que save(), así que ambos caminos guardan los mismos valores.
+
+        Args:
+            filas: Datos de las pruebas; se completan en el lugar
+        """
+        for campo, (medidas, formula) in cls.INDICES_DERIVADOS.items():
+            for fila in filas:
+                valores = [fila.get(medida) for medida in medidas]
+                if all(valores) and not fila.get(campo):
+                    fila[campo] = formula(*valores)
+
 
 # =============================================================================
 # Modelo PruebaFisica
@@ -371,6 +462,7 @@ class PruebaFisica(models.Model):
     )
     observaciones = models.TextField(blank=True, null=True, verbose_name='Observaciones')
     fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')
     estado = models.BooleanField(default=True, verbose_name='Estado')
     
     # Referencia a quien registró la prueba
@@ -386,6 +478,87 @@ class PruebaFisica(models.Model):
         verbose_name = 'Prueba Física'
         verbose_name_plural = 'Pruebas Físicas'
         ordering = ['-fecha_registro']
+        indexes = [
+            # get_by_atleta / get_ultima_by_atleta
+            models.Index(
+                fields=['atleta', '-fecha_registro'], name='pf_atleta_fecha_idx',
+                condition=models.Q(estado=True)
+            ),
+            # get_by_atleta_y_tipo / estadísticas (GROUP BY atleta, tipo) sin leer la tabla
+            models.Index(
+                fields=['atleta', 'tipo_prueba', 'resultado'], name='pf_atleta_tipo_idx',
+                condition=models.Q(estado=True)
+            ),
+            # get_by_tipo / get_ranking_by_tipo
+            models.Index(
+                fields=['tipo_prueba', '-resultado'], name='pf_tipo_resultado_idx',
+                condition=models.Q(estado=True)
+            ),
+            # Recalculo del ranking por nombre_prueba
+            models.Index(
+                fields=['nombre_prueba', 'atleta', 'resultado'], name='pf_nombre_prueba_idx',
+                condition=models.Q(estado=True)
+            ),
+            # get_activas (cursor por fecha_registro, id) / get_by_fecha_range
+            models.Index(
+                fields=['-fecha_registro', 'id'], name='pf_activas_fecha_idx',
+                condition=models.Q(estado=True)
+            ),
+            # get_by_registrador
+            models.Index(
+                fields=['registrado_por'], name='pf_registrador_idx',
+                condition=models.Q(estado=True)
+            ),
+        ]
 
     def __str__(self):
         return f"Prueba Física {self.id} - {self.atleta} - {self.tipo_prueba}"
+
+
+# =============================================================================
+# Modelo RankingPruebaFisica
+# =============================================================================
+class RankingPruebaFisica(models.Model):
+    """
+    Leaderboard precalculado de pruebas físicas.
+
+    Una fila por atleta, nombre de prueba y partición (general, sexo, banda
+    de edad o grupo) con su mejor intento y su posición. Se recalcula por
+    partición al cambiar una PruebaFisica o el sexo, la edad, el estado o
+    los grupos de un atleta (ver signals.py).
+    """
+    nombre_prueba = models.CharField(max_length=100, verbose_name='Nombre de la prueba')
+    # 'general', 'sexo:M', 'edad:14' (inicio de la banda) o 'grupo:<id>'
+    particion = models.CharField(max_length=40, verbose_name='Partición')
+    posicion = models.PositiveIntegerField(verbose_name='Posición')
+    atleta = models.ForeignKey(
+        Atleta,
+        on_delete=models.CASCADE,
+        related_name='rankings',
+        verbose_name='Atleta'
+    )
+    prueba = models.ForeignKey(
+        PruebaFisica,
+        on_delete=models.CASCADE,
+        related_name='rankings',
+        verbose_name='Mejor intento'
+    )
+    resultado = models.DecimalField(max_digits=10, decimal_places=2, verbose_name='Resultado')
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')
+
+    class Meta:
+        db_table = 'ranking_prueba_fisica'
+        verbose_name = 'Ranking de Prueba Física'
+        verbose_name_plural = 'Rankings de Pruebas Físicas'
+        ordering = ['nombre_prueba', 'particion', 'posicion']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['nombre_prueba', 'particion', 'atleta'], name='ranking_unico_por_atleta'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['nombre_prueba', 'particion', 'posicion'], name='ranking_lectura_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.nombre_prueba} [{self.particion}] #{self.posicion} - {self.atleta}"
@@ -2,6 +2,7 @@ import jwt
 from rest_framework import permissions
 from django.conf import settings
 import logging
+from .connection.claims_cache import ClaimsCache, MISS
 
 logger = logging.getLogger(__name__)
 
@@ -9,6 +10,9 @@ logger = logging.getLogger(__name__)
 # En producción esto debería estar en variables de entorno
 JWT_SECRET_KEY = '1234567FDUCAMETB'
 
+# Claims decodificados por token (LRU con vencimiento en el exp del token)
+_claims_cache = ClaimsCache.from_settings()
+
 def map_stament_to_role(value):
     if not value:
         return None
@@ -22,57 +26,97 @@ def map_stament_to_role(value):
     return None
 
 
+def _normalize_role(role_value):
+    if not role_value:
+        return None
+    return map_stament_to_role(role_value) or str(role_value).upper()
+
+
+def decode_token_claims(token):
+    """
+    Decodifica un JWT reutilizando los claims ya decodificados del mismo token.
+
+    Args:
+        token: JWT sin el prefijo 'Bearer '
+
+    Returns:
+        dict | None: Claims del token, o None si no es un JWT válido o expiró
+    """
+    claims = _claims_cache.get(token)
+    if claims is not MISS:
+        return claims
+    try:
+        claims = jwt.decode(
+            token,
+            JWT_SECRET_KEY,
+            algorithms=['HS256'],
+            options={"verify_signature": False, "verify_exp": True}
+        )
+    except Exception as e:
+        logger.error(f"Error validando token JWT: {e}")
+        return None
+    _claims_cache.set(token, claims)
+    return claims
+
+
+def _get_header_role(request):
+    if not hasattr(request, '_header_role'):
+        request._header_role = _normalize_role(request.headers.get('X-Role') or request.headers.get('Role'))
+    return request._header_role
+
+
+def _get_token_role(request):
+    if not hasattr(request, '_token_role'):
+        role = None
+        auth_header = request.headers.get('Authorization') or ''
+        if auth_header.startswith('Bearer '):
+            token = auth_header.split(' ')[1]
+            # Intentar decodificar solo si parece JWT (tres partes separadas por '.')
+            if token.count('.') == 2:
+                claims = decode_token_claims(token) or {}
+                role = _normalize_role(claims.get('role') or claims.get('stament') or claims.get('type_stament'))
+        request._token_role = role
+    return request._token_role
+
+
+def get_request_role(request):
+    """
+    Rol de la petición (header X-Role/Role o claim del JWT), normalizado.
+
+    Se resuelve una sola vez por petición y queda en request (_header_role,
+    _token_role) para las demás clases de permiso y para quien lo necesite.
+
+    Returns:
+        str | None: ADMIN, ENTRENADOR, ESTUDIANTE_VINCULACION u otro valor en mayúsculas
+    """
+    return _get_header_role(request) or _get_token_role(request)
+
+
 class BaseRolePermission(permissions.BasePermission):
     """
     Verifica rol desde:
       1) Header 'X-Role' o 'Role' (enviado por el frontend)
-      2) Token JWT (si es JWT válido)
+      2) Token JWT (si es JWT válido y no expiró)
+
+    El rol se resuelve una vez por petición y los claims del JWT se cachean
+    por token (ver connection/claims_cache.py), así que evaluar varias
+    clases de permiso o el mismo token en muchas peticiones no vuelve a
+    decodificarlo.
     """
     allowed_roles = []
 
     def _is_allowed(self, role_value: str) -> bool:
-        if not role_value:
-            return False
-        role = map_stament_to_role(role_value) or str(role_value).upper()
-
-        if 'ADMIN' in self.allowed_roles and role == 'ADMIN':
-            return True
-        if 'ENTRENADOR' in self.allowed_roles and role == 'ENTRENADOR':
-            return True
-        if 'ESTUDIANTE_VINCULACION' in self.allowed_roles and role == 'ESTUDIANTE_VINCULACION':
-            return True
-        return False
+        return _normalize_role(role_value) in self.allowed_roles
 
     def has_permission(self, request, view):
         # 1) Revisar header de rol directo (evita depender de JWT del módulo externo)
-        header_role = request.headers.get('X-Role') or request.headers.get('Role')
-        if header_role and self._is_allowed(header_role):
+        header_role = _get_header_role(request)
+        if header_role and header_role in self.allowed_roles:
             return True
 
         # 2) Revisar Authorization Bearer
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return False
-
-        token = auth_header.split(' ')[1]
-
-        # Intentar decodificar solo si parece JWT (tres partes separadas por '.')
-        if token.count('.') == 2:
-            try:
-                payload = jwt.decode(
-                    token,
-                    JWT_SECRET_KEY,
-                    algorithms=['HS256'],
-                    options={"verify_signature": False}
-                )
-                user_role = payload.get('role') or payload.get('stament') or payload.get('type_stament')
-                if self._is_allowed(user_role):
-                    return True
-            except Exception as e:
-                logger.error(f"Error validando token JWT: {e}")
-
-        # Si no es JWT o no cumple rol
-        return False
+        token_role = _get_token_role(request)
+        return token_role is not None and token_role in self.allowed_roles
 
 class IsAdmin(BaseRolePermission):
     allowed_roles = ['ADMIN']
@@ -0,0 +1,259 @@
+"""
+Métricas por petición: consultas SQL, llamadas HTTP salientes y latencia
+
+RequestMetrics acumula los contadores de una petición (el middleware lo
+publica en un ContextVar) y RouteMetricsStore agrega las muestras por ruta
+en memoria, con una ventana acotada para calcular p50/p95/p99.
+"""
+
+import contextvars
+import json
+import math
+import os
+import socket
+import threading
+import time
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+METRIC_FIELDS = ('total_ms', 'db_ms', 'db_queries', 'http_ms', 'http_calls')
+PERCENTILES = (50, 95, 99)
+
+
+class RequestMetrics:
+    """Contadores de una petición; thread-safe porque el fan-out usa hilos"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.http_calls = 0
+        self.http_time = 0.0
+        self._lock = threading.Lock()
+
+    def record_query(self, duration):
+        with self._lock:
+            self.db_queries += 1
+            self.db_time += duration
+
+    def record_http(self, duration):
+        with self._lock:
+            self.http_calls += 1
+            self.http_time += duration
+
+    def __call__(self, execute, sql, params, many, context):
+        # Firma de connection.execute_wrapper
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record_query(time.perf_counter() - start)
+
+    def sample(self):
+        """
+        Obtiene la muestra de la petición (tiempos en milisegundos).
+
+        Returns:
+            dict: total_ms, db_ms, db_queries, http_ms y http_calls
+        """
+        with self._lock:
+            return {
+                'total_ms': (time.perf_counter() - self.start) * 1000,
+                'db_ms': self.db_time * 1000,
+                'db_queries': self.db_queries,
+                'http_ms': self.http_time * 1000,
+                'http_calls': self.http_calls,
+            }
+
+
+def activate(metrics):
+    """Publica metrics como las de la petición en curso; devuelve el token para reset"""
+    return _current.set(metrics)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+def record_http_call(duration):
+    """
+    Registra una llamada HTTP saliente en la petición en curso (si se mide).
+
+    Args:
+        duration: Duración de la llamada en segundos
+    """
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.record_http(duration)
+
+
+def bind_context(func):
+    """
+    Envuelve func para que cada ejecución corra en una copia del contexto
+    actual; así las llamadas hechas desde un ThreadPoolExecutor se siguen
+    atribuyendo a la petición que las originó.
+    """
+    context = contextvars.copy_context()
+
+    def wrapper(*args, **kwargs):
+        return context.copy().run(func, *args, **kwargs)
+    return wrapper
+
+
+def percentile(values, pct):
+    """Percentil por rango más cercano de una lista ordenada"""
+    if not values:
+        return 0
+    index = min(len(values) - 1, max(0, math.ceil(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+class RouteMetricsStore:
+    """
+    Agregado en memoria de las muestras por ruta.
+
+    Cada ruta conserva las últimas `window` muestras, por lo que la memoria
+    y el costo del reporte son acotados sin importar el tráfico.
+
+    Uso:
+        store = RouteMetricsStore(window=1000)
+        store.add('GET atleta-list', metrics.sample())
+        store.report()
+    """
+
+    def __init__(self, window=1000):
+        """
+        Args:
+            window: Muestras que se conservan por ruta
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._routes = {}
+        self._last_flush = time.monotonic()
+
+    @classmethod
+    def from_settings(cls):
+        """Construye el agregado a partir de la configuración de Django"""
+        from django.conf import settings
+
+        return cls(window=getattr(settings, 'REQUEST_METRICS_WINDOW', 1000))
+
+    def add(self, route, sample):
+        with self._lock:
+            entry = self._routes.get(route)
+            if entry is None:
+                entry = self._routes[route] = {'count': 0, 'samples': deque(maxlen=self.window)}
+            entry['count'] += 1
+            entry['samples'].append(tuple(sample[field] for field in METRIC_FIELDS))
+
+    def snapshot(self):
+        """
+        Copia serializable del agregado (para persistir o fusionar).
+
+        Returns:
+            dict: ruta -> {'count', 'samples'}
+        """
+        with self._lock:
+            return {
+                route: {'count': entry['count'], 'samples': [list(s) for s in entry['samples']]}
+                for route, entry in self._routes.items()
+            }
+
+    def report(self):
+        """Reporte por ruta del agregado de este proceso"""
+        return build_report([self.snapshot()])
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    def should_flush(self, interval):
+        """Indica (una sola vez por intervalo) si toca persistir el agregado"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_flush < interval:
+                return False
+            self._last_flush = now
+            return True
+
+    def flush(self, directory):
+        """
+        Persiste el agregado de este proceso en directory/<host>-<pid>.json.
+
+        Cada proceso escribe su propio archivo; el reporte los fusiona.
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{socket.gethostname()}-{os.getpid()}.json')
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+
+def load_snapshots(directory):
+    """
+    Lee los agregados persistidos por los procesos del servidor.
+
+    Returns:
+        list: Snapshots de RouteMetricsStore
+    """
+    snapshots = []
+    if not directory or not os.path.isdir(directory):
+        return snapshots
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"No se pudo leer el snapshot de métricas {name}: {e}")
+    return snapshots
+
+
+def build_report(snapshots):
+    """
+    Fusiona snapshots y calcula promedios y percentiles por ruta.
+
+    Args:
+        snapshots: Lista de snapshots de RouteMetricsStore
+
+    Returns:
+        dict: ruta -> {'count', 'window', <métrica>: {'avg', 'p50', 'p95', 'p99', 'max'}}
+    """
+    merged = {}
+    for snapshot in snapshots:
+        for route, entry in snapshot.items():
+            target = merged.setdefault(route, {'count': 0, 'samples': []})
+            target['count'] += entry['count']
+            target['samples'].extend(entry['samples'])
+
+    report = {}
+    for route, entry in sorted(merged.items()):
+        samples = entry['samples']
+        route_report = {'count': entry['count'], 'window': len(samples)}
+        for i, field in enumerate(METRIC_FIELDS):
+            values = sorted(s[i] for s in samples)
+            stats = {'avg': sum(values) / len(values) if values else 0}
+            for pct in PERCENTILES:
+                stats[f'p{pct}'] = percentile(values, pct)
+            stats['max'] = values[-1] if values else 0
+            route_report[field] = stats
+        report[route] = route_report
+    return report
+
+
+def format_server_timing(sample):
+    """Formatea una muestra como valor del header Server-Timing"""
+    return ', '.join([
+        f'db;dur={sample["db_ms"]:.1f};desc="{sample["db_queries"]} queries"',
+        f'http;dur={sample["http_ms"]:.1f};desc="{sample["http_calls"]} calls"',
+        f'total;dur={sample["total_ms"]:.1f}',
+    ])
+
+
+store = RouteMetricsStore.from_settings()
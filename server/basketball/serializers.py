@@ -1,95 +1,196 @@
 from rest_framework import serializers
 from .models import (
     Entrenador, Pasante, Administrador, GrupoAtleta, Atleta,
-    Inscripcion, PruebaAntropometrica, PruebaFisica
+    Inscripcion, PruebaAntropometrica, PruebaFisica, RankingPruebaFisica
 )
-import requests
-import os
+from django.conf import settings
+from django.db import models
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import async_to_sync
+from .connection.persona_cache import PersonaCache, MISS
+from .connection.user_module_client import UserModuleClient
+from .connection.async_user_module_client import AsyncUserModuleClient
+from .connection.circuit_breaker import CircuitOpenError
+from .request_metrics import bind_context
 
-# Cache global para tokens y datos de persona
-_user_module_token = None
-_persona_cache = {}
+# Clientes (con pool de conexiones y token) y cache global de datos de persona
+_user_module_client = UserModuleClient.from_settings()
+_async_user_module_client = AsyncUserModuleClient.from_settings(_user_module_client)
+_persona_cache = PersonaCache.from_settings()
 
 def get_user_module_token():
     """Obtiene token del user_module con cache"""
-    global _user_module_token
-    if _user_module_token:
-        return _user_module_token
-    
     try:
-        user_module_url = os.environ.get('USER_MODULE_URL', 'http://localhost:8096')
-        response = requests.post(
-            f'{user_module_url}/api/person/login',
-            json={'email': 'admin@admin.com', 'password': 'admin123'},
-            timeout=5
-        )
-        if response.status_code == 200:
-            token = response.json().get('data', {}).get('token', '')
-            # El token ya viene con el prefijo "Bearer "
-            _user_module_token = token.replace('Bearer ', '') if token.startswith('Bearer ') else token
-            return _user_module_token
+        return _user_module_client.get_token()
     except Exception as e:
         print(f"Error obteniendo token: {e}")
     return None
 
 def get_persona_from_user_module(persona_external):
-    """Obtiene datos de persona del user_module con cache"""
+    """
+    Obtiene datos de persona del user_module con cache.
+
+    Si el user_module no responde (o el circuito está abierto) se devuelve
+    el último dato conocido marcado con '_stale'.
+    """
     # Verificar cache
-    if persona_external in _persona_cache:
-        return _persona_cache[persona_external]
-    
-    token = get_user_module_token()
-    if not token:
-        return None
+    cached = _persona_cache.get(persona_external)
+    if cached is not MISS:
+        return cached
     
     try:
-        user_module_url = os.environ.get('USER_MODULE_URL', 'http://localhost:8096')
-        headers = {'Authorization': f'Bearer {token}'}
-        response = requests.get(
-            f'{user_module_url}/api/person/search_external/{persona_external}',
-            headers=headers,
-            timeout=5
-        )
+        response = _user_module_client.get_persona(persona_external)
+        if response is None:
+            return get_stale_persona(persona_external)
         
         if response.status_code == 200:
             persona_data = response.json().get('data', {})
-            _persona_cache[persona_external] = persona_data
+            _persona_cache.set(persona_external, persona_data)
             return persona_data
-        elif response.status_code == 401:
-            # Token expiró, limpiar cache y reintentar
-            global _user_module_token
-            _user_module_token = None
-            token = get_user_module_token()
-            if token:
-                headers = {'Authorization': f'Bearer {token}'}
-                response = requests.get(
-                    f'{user_module_url}/api/person/search_external/{persona_external}',
-                    headers=headers,
-                    timeout=5
-                )
-                if response.status_code == 200:
-                    persona_data = response.json().get('data', {})
-                    _persona_cache[persona_external] = persona_data
-                    return persona_data
+        elif response.status_code == 404:
+            _persona_cache.set_not_found(persona_external)
+            return None
+    except CircuitOpenError:
+        pass
     except Exception as e:
         print(f"Error obteniendo datos de persona {persona_external}: {e}")
     
-    return None
+    return get_stale_persona(persona_external)
+
+def get_stale_persona(persona_external):
+    """Obtiene el último dato conocido de la persona marcado como desactualizado"""
+    stale = _persona_cache.get_stale(persona_external)
+    if stale is MISS or stale is None:
+        return None
+    return {**stale, '_stale': True}
+
+def get_user_module_metrics():
+    """Obtiene el estado del circuit breaker y los contadores del cache de personas"""
+    return {
+        'circuit_breaker': _user_module_client.breaker.stats(),
+        'persona_cache': _persona_cache.stats(),
+    }
+
+def get_personas_from_user_module(persona_externals):
+    """
+    Obtiene datos de varias personas del user_module en paralelo.
+
+    El user_module no expone un endpoint de búsqueda masiva, por lo que se
+    hace un fan-out concurrente acotado por USER_MODULE_MAX_WORKERS, o por
+    el cliente asíncrono si USER_MODULE_ASYNC_ENRICHMENT está activo.
+
+    Args:
+        persona_externals: Iterable de UUIDs externos
+
+    Returns:
+        dict: persona_external -> datos de persona (o None si no se encontró)
+    """
+    pendientes = list(dict.fromkeys(p for p in persona_externals if p))
+    if not pendientes:
+        return {}
+
+    if getattr(settings, 'USER_MODULE_ASYNC_ENRICHMENT', False):
+        # Bajo ASGI la corrutina se ejecuta en el event loop del servidor
+        return async_to_sync(aget_personas_from_user_module)(pendientes)
+
+    # Obtener el token antes del fan-out para que todos los hilos lo reutilicen
+    if not get_user_module_token():
+        personas = {}
+        for persona_external in pendientes:
+            cached = _persona_cache.get(persona_external)
+            personas[persona_external] = cached if cached is not MISS else get_stale_persona(persona_external)
+        return personas
+
+    max_workers = min(getattr(settings, 'USER_MODULE_MAX_WORKERS', 8), len(pendientes))
+    if max_workers <= 1:
+        return {p: get_persona_from_user_module(p) for p in pendientes}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # bind_context: las llamadas de los hilos cuentan en las métricas de la petición
+        fetch = bind_context(get_persona_from_user_module)
+        return dict(zip(pendientes, executor.map(fetch, pendientes)))
+
+async def aget_personas_from_user_module(persona_externals):
+    """
+    Variante asíncrona de get_personas_from_user_module.
+
+    Consulta todas las personas que no están en cache con asyncio.gather,
+    acotando las conexiones con USER_MODULE_ASYNC_MAX_CONNECTIONS.
+
+    Args:
+        persona_externals: Iterable de UUIDs externos
+
+    Returns:
+        dict: persona_external -> datos de persona (o None si no se encontró)
+    """
+    personas = {}
+    pendientes = []
+    for persona_external in dict.fromkeys(p for p in persona_externals if p):
+        cached = _persona_cache.get(persona_external)
+        if cached is MISS:
+            pendientes.append(persona_external)
+        else:
+            personas[persona_external] = cached
+
+    try:
+        responses = await _async_user_module_client.get_personas(pendientes)
+    except Exception as e:
+        print(f"Error obteniendo datos de personas: {e}")
+        responses = {}
+
+    for persona_external in pendientes:
+        response = responses.get(persona_external)
+        if isinstance(response, Exception) and not isinstance(response, CircuitOpenError):
+            print(f"Error obteniendo datos de persona {persona_external}: {response}")
+        if response is None or isinstance(response, Exception) or response.status_code >= 500:
+            personas[persona_external] = get_stale_persona(persona_external)
+        elif response.status_code == 200:
+            persona_data = response.json().get('data', {})
+            _persona_cache.set(persona_external, persona_data)
+            personas[persona_external] = persona_data
+        else:
+            if response.status_code == 404:
+                _persona_cache.set_not_found(persona_external)
+            personas[persona_external] = None
+    return personas
+
+class PersonaListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer que enriquece en lote los datos de persona.
+
+    Recolecta todos los persona_external de la página antes de serializar y
+    los obtiene de una sola vez, en lugar de hacer una petición por fila.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        iterable = list(iterable)
+        externals = [obj.persona_external for obj in iterable if obj.persona_external]
+        self.child.prefetch_personas(externals)
+        return super().to_representation(iterable)
 
-class EntrenadorSerializer(serializers.ModelSerializer):
+
+class PersonaEnrichedSerializer(serializers.ModelSerializer):
+    """Serializer base que agrega los datos de persona del user_module"""
     nombre = serializers.SerializerMethodField()
     apellido = serializers.SerializerMethodField()
     dni = serializers.SerializerMethodField()
     email = serializers.SerializerMethodField()
     telefono = serializers.SerializerMethodField()
     direccion = serializers.SerializerMethodField()
-    
+    persona_desactualizada = serializers.SerializerMethodField()
+
     class Meta:
-        model = Entrenador
-        fields = ['id', 'persona_external', 'especialidad', 'club_asignado', 
-                  'fecha_registro', 'estado', 'nombre', 'apellido', 'dni', 
-                  'email', 'telefono', 'direccion']
-    
+        list_serializer_class = PersonaListSerializer
+
+    def prefetch_personas(self, persona_externals):
+        """Carga en el cache del serializer las personas que aún no tiene"""
+        if not hasattr(self, '_persona_cache'):
+            self._persona_cache = {}
+        pendientes = [p for p in persona_externals if p not in self._persona_cache]
+        if pendientes:
+            self._persona_cache.update(get_personas_from_user_module(pendientes))
+
     def get_persona_data(self, obj):
         """Obtiene datos de persona con cache"""
         if not hasattr(self, '_persona_cache'):
@@ -124,53 +225,24 @@ class EntrenadorSerializer(serializers.ModelSerializer):
         persona = self.get_persona_data(obj)
         return persona.get('direction', '') if persona else ''
 
-class PasanteSerializer(serializers.ModelSerializer):
-    nombre = serializers.SerializerMethodField()
-    apellido = serializers.SerializerMethodField()
-    dni = serializers.SerializerMethodField()
-    email = serializers.SerializerMethodField()
-    telefono = serializers.SerializerMethodField()
-    direccion = serializers.SerializerMethodField()
-    
-    class Meta:
+    def get_persona_desactualizada(self, obj):
+        persona = self.get_persona_data(obj)
+        return bool(persona and persona.get('_stale'))
+
+class EntrenadorSerializer(PersonaEnrichedSerializer):
+    class Meta(PersonaEnrichedSerializer.Meta):
+        model = Entrenador
+        fields = ['id', 'persona_external', 'especialidad', 'club_asignado', 
+                  'fecha_registro', 'estado', 'nombre', 'apellido', 'dni', 
+                  'email', 'telefono', 'direccion', 'persona_desactualizada']
+
+class PasanteSerializer(PersonaEnrichedSerializer):
+    class Meta(PersonaEnrichedSerializer.Meta):
         model = Pasante
         fields = ['id', 'persona_external', 'carrera', 'semestre', 'universidad',
                   'fecha_inicio', 'fecha_fin', 'fecha_registro', 'estado', 
-                  'nombre', 'apellido', 'dni', 'email', 'telefono', 'direccion']
-    
-    def get_persona_data(self, obj):
-        """Obtiene datos de persona con cache"""
-        if not hasattr(self, '_persona_cache'):
-            self._persona_cache = {}
-        
-        if obj.persona_external not in self._persona_cache:
-            self._persona_cache[obj.persona_external] = get_persona_from_user_module(obj.persona_external)
-        
-        return self._persona_cache[obj.persona_external]
-    
-    def get_nombre(self, obj):
-        persona = self.get_persona_data(obj)
-        return persona.get('first_name', '') if persona else ''
-    
-    def get_apellido(self, obj):
-        persona = self.get_persona_data(obj)
-        return persona.get('last_name', '') if persona else ''
-    
-    def get_dni(self, obj):
-        persona = self.get_persona_data(obj)
-        return persona.get('identification', '') if persona else ''
-    
-    def get_email(self, obj):
-        persona = self.get_persona_data(obj)
-        return persona.get('email', '') if persona else ''
-    
-    def get_telefono(self, obj):
-        persona = self.get_persona_data(obj)
-        return persona.get('phono', '') if persona else ''
-    
-    def get_direccion(self, obj):
-        persona = self.get_persona_data(obj)
-        return persona.get('direction', '') if persona else ''
+                  'nombre', 'apellido', 'dni', 'email', 'telefono', 'direccion',
+                  'persona_desactualizada']
 
 class AdministradorSerializer(serializers.ModelSerializer):
     class Meta:
@@ -201,3 +273,14 @@ class PruebaFisicaSerializer(serializers.ModelSerializer):
     class Meta:
         model = PruebaFisica
         fields = '__all__'
+
+class RankingPruebaFisicaSerializer(serializers.ModelSerializer):
+    nombre_atleta = serializers.CharField(source='atleta.nombre_atleta', read_only=True)
+    apellido_atleta = serializers.CharField(source='atleta.apellido_atleta', read_only=True)
+    unidad_medida = serializers.CharField(source='prueba.unidad_medida', read_only=True)
+    fecha_registro = serializers.DateField(source='prueba.fecha_registro', read_only=True)
+
+    class Meta:
+        model = RankingPruebaFisica
+        fields = ['posicion', 'atleta', 'nombre_atleta', 'apellido_atleta', 'resultado',
+                  'unidad_medida', 'fecha_registro', 'prueba', 'particion', 'nombre_prueba']
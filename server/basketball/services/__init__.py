@@ -5,6 +5,8 @@ from .grupo_atleta_service import GrupoAtletaService
 from .inscripcion_service import InscripcionService
 from .prueba_antropometrica_service import PruebaAntropometricaService
 from .prueba_fisica_service import PruebaFisicaService
+from .ranking_service import RankingService
+from .auth_service import AuthService
 
 __all__ = [
     'EntrenadorService',
@@ -14,4 +16,6 @@ __all__ = [
     'InscripcionService',
     'PruebaAntropometricaService',
     'PruebaFisicaService',
+    'RankingService',
+    'AuthService',
 ]
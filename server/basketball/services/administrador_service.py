@@ -73,6 +73,18 @@ class AdministradorService:
         """Obtiene todos los administradores activos"""
         return list(self.dao.get_by_filter(estado=True))
     
+    def get_validador_listado(self) -> Dict[str, Any]:
+        """Total y última modificación del listado de administradores activos (ETag/Last-Modified)"""
+        return self.dao.get_validador(estado=True)
+    
+    def get_validador(self, pk: int) -> Dict[str, Any]:
+        """Total y última modificación de un administrador (ETag/Last-Modified)"""
+        return self.dao.get_validador(pk=pk)
+    
+    def get_administradores_paginated(self, page: int, page_size: int) -> Dict[str, Any]:
+        """Obtiene una página de administradores activos"""
+        return self.dao.get_paginated(page, page_size, queryset=self.dao.get_by_filter(estado=True))
+    
     def get_by_persona_external(self, persona_external: str) -> Optional[Administrador]:
         """Obtiene administrador por persona_external"""
         return self.dao.get_first(persona_external=persona_external, estado=True)
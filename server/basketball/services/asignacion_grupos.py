@@ -0,0 +1,93 @@
+"""
+Asignación automática de atletas a grupos por rango de edad
+
+Los rangos [rango_edad_minima, rango_edad_maxima] de los grupos activos se
+cargan una vez y se convierten en un índice de intervalos ordenado: los
+extremos de todos los rangos parten la recta de edades en segmentos en los
+que el conjunto de grupos compatibles no cambia, así que ubicar una edad es
+una búsqueda binaria (bisect) y asignar N atletas cuesta O(N log G) sin
+ninguna consulta por atleta.
+"""
+
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Tuple
+
+# (id, rango_edad_minima, rango_edad_maxima)
+Rango = Tuple[int, int, int]
+
+
+class IndiceRangosEdad:
+    """
+    Índice de los grupos que aceptan cada edad.
+
+    Uso:
+        indice = IndiceRangosEdad([(1, 8, 10), (2, 10, 14)])
+        indice.candidatos(10)  # [1, 2]
+    """
+
+    def __init__(self, rangos: Iterable[Rango]):
+        """
+        Args:
+            rangos: (id, edad mínima, edad máxima) de cada grupo, extremos incluidos
+        """
+        rangos = [r for r in rangos if r[1] <= r[2]]
+        # Cada rango [min, max] abre un segmento en min y lo cierra en max + 1
+        self._inicios = sorted({minimo for _, minimo, _ in rangos} | {maximo + 1 for _, _, maximo in rangos})
+        # Más específico primero (rango más angosto), luego por id para que sea determinista
+        self._candidatos = [
+            [
+                grupo_id for grupo_id, minimo, maximo
+                in sorted(rangos, key=lambda r: (r[2] - r[1], r[0]))
+                if minimo <= inicio <= maximo
+            ]
+            for inicio in self._inicios
+        ]
+
+    def candidatos(self, edad: int) -> List[int]:
+        """
+        Grupos cuyo rango incluye la edad, del más específico al más amplio.
+
+        Args:
+            edad: Edad del atleta
+
+        Returns:
+            List[int]: IDs de grupo (vacía si ningún rango la incluye)
+        """
+        posicion = bisect_right(self._inicios, edad) - 1
+        return self._candidatos[posicion] if posicion >= 0 else []
+
+
+def planificar(rangos: Iterable[Rango], atletas: Iterable[Tuple[int, int]],
+               ocupacion: Dict[int, int]) -> Tuple[List[Tuple[int, int]], List[int]]:
+    """
+    Asigna cada atleta a un grupo compatible en una sola pasada.
+
+    Entre los grupos compatibles se elige el de rango más angosto y, si hay
+    varios igual de angostos, el que tiene menos atletas (contando los que
+    se van asignando), para repartir los grupos paralelos.
+
+    Args:
+        rangos: (id, edad mínima, edad máxima) de los grupos activos
+        atletas: (atleta_id, edad) de los atletas a asignar
+        ocupacion: Atletas actuales por grupo (se actualiza con los asignados)
+
+    Returns:
+        Tuple: (pares (atleta_id, grupo_id), IDs de atletas sin grupo compatible)
+    """
+    rangos = list(rangos)
+    ancho = {grupo_id: maximo - minimo for grupo_id, minimo, maximo in rangos}
+    indice = IndiceRangosEdad(rangos)
+    asignaciones, sin_rango = [], []
+    for atleta_id, edad in atletas:
+        candidatos = indice.candidatos(edad) if edad is not None else []
+        if not candidatos:
+            sin_rango.append(atleta_id)
+            continue
+        minimo_ancho = ancho[candidatos[0]]
+        elegido = min(
+            (grupo_id for grupo_id in candidatos if ancho[grupo_id] == minimo_ancho),
+            key=lambda grupo_id: (ocupacion.get(grupo_id, 0), grupo_id)
+        )
+        ocupacion[elegido] = ocupacion.get(elegido, 0) + 1
+        asignaciones.append((atleta_id, elegido))
+    return asignaciones, sin_rango
@@ -3,9 +3,12 @@ Servicio para la gestión de Atletas
 """
 
 import logging
-from typing import List, Optional, Dict, Any
+from datetime import date
+from typing import List, Optional, Dict, Any, Iterator, Set, Tuple
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from ..dao.atleta_dao import AtletaDAO
+from ..dao.grupo_atleta_dao import GrupoAtletaDAO
 from ..models import Atleta
 
 logger = logging.getLogger(__name__)
@@ -16,6 +19,7 @@ class AtletaService:
     
     def __init__(self):
         self.dao = AtletaDAO()
+        self.grupo_dao = GrupoAtletaDAO()
     
     def create_atleta(self, data: Dict[str, Any]) -> Atleta:
         """
@@ -76,6 +80,38 @@ class AtletaService:
         """Obtiene todos los atletas activos"""
         return list(self.dao.get_activos())
     
+    def get_validador_listado(self) -> Dict[str, Any]:
+        """Total y última modificación del listado de atletas activos (ETag/Last-Modified)"""
+        return self.dao.get_validador(estado=True)
+    
+    def get_validador(self, pk: int) -> Dict[str, Any]:
+        """Total y última modificación de un atleta (ETag/Last-Modified)"""
+        return self.dao.get_validador(pk=pk)
+    
+    def get_atletas_paginated(self, page: int, page_size: int) -> Dict[str, Any]:
+        """Obtiene una página de atletas activos"""
+        return self.dao.get_paginated(page, page_size, queryset=self.dao.get_activos())
+    
+    def exportar_atletas(self, **filtros) -> Tuple[List[str], Iterator[tuple]]:
+        """
+        Obtiene las columnas y las filas a exportar de los atletas.
+        
+        Args:
+            **filtros: Filtros de AtletaDAO.get_para_exportar
+            
+        Returns:
+            Tuple: (columnas, iterador de filas leídas por bloques de EXPORTACION_CHUNK_SIZE)
+        """
+        queryset = self.dao.get_para_exportar(**filtros)
+        filas = self.dao.iter_values(
+            queryset, self.dao.campos_exportacion, getattr(settings, 'EXPORTACION_CHUNK_SIZE', 2000)
+        )
+        return self.dao.campos_exportacion, filas
+    
+    def recalcular_edades(self, hoy: Optional[date] = None) -> int:
+        """Recalcula la edad de todos los atletas desde su fecha de nacimiento (ver AtletaDAO.recalcular_edades)"""
+        return self.dao.recalcular_edades(hoy)
+    
     def search_atletas(self, search_term: str) -> List[Atleta]:
         """Busca atletas por término"""
         return list(self.dao.search_atletas(search_term))
@@ -87,3 +123,54 @@ class AtletaService:
     def remover_grupo(self, atleta_id: int, grupo_id: int) -> bool:
         """Remueve un atleta de un grupo"""
         return self.dao.remover_grupo(atleta_id, grupo_id)
+    
+    def actualizar_membresias(self, agregar: List[Dict[str, Any]],
+                              quitar: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Agrega y quita atletas de grupos en lote.
+        
+        Args:
+            agregar: Pares {'atleta': id, 'grupo': id} a asociar
+            quitar: Pares {'atleta': id, 'grupo': id} a desasociar
+            
+        Returns:
+            Dict[str, int]: {'agregadas': n, 'quitadas': n}
+            
+        Raises:
+            ValidationError: Si un par es inválido, está en ambas listas o
+                referencia un atleta o grupo activo inexistente (al agregar)
+        """
+        agregar, quitar = self._leer_pares(agregar, 'agregar'), self._leer_pares(quitar, 'quitar')
+        maximo = getattr(settings, 'MEMBRESIAS_MAX_PARES', 10000)
+        if len(agregar) + len(quitar) > maximo:
+            raise ValidationError(f"Se admiten como máximo {maximo} pares por petición")
+        conflictos = agregar & quitar
+        if conflictos:
+            raise ValidationError(f"Pares en agregar y quitar a la vez: {sorted(conflictos)}")
+        
+        if agregar:
+            atletas = {atleta_id for atleta_id, _ in agregar}
+            grupos = {grupo_id for _, grupo_id in agregar}
+            faltantes_atletas = atletas - self.dao.get_ids_existentes(atletas, estado=True)
+            faltantes_grupos = grupos - self.grupo_dao.get_ids_existentes(grupos, estado=True)
+            errores = []
+            if faltantes_atletas:
+                errores.append(f"Atletas activos inexistentes: {sorted(faltantes_atletas)}")
+            if faltantes_grupos:
+                errores.append(f"Grupos activos inexistentes: {sorted(faltantes_grupos)}")
+            if errores:
+                raise ValidationError(errores)
+        
+        return self.dao.actualizar_grupos(agregar, quitar)
+    
+    @staticmethod
+    def _leer_pares(pares: List[Dict[str, Any]], nombre: str) -> Set[Tuple[int, int]]:
+        if not isinstance(pares, list):
+            raise ValidationError(f"'{nombre}' debe ser una lista de {{'atleta', 'grupo'}}")
+        leidos = set()
+        for par in pares:
+            try:
+                leidos.add((int(par['atleta']), int(par['grupo'])))
+            except (KeyError, TypeError, ValueError):
+                raise ValidationError(f"Par inválido en '{nombre}': {par}")
+        return leidos
@@ -0,0 +1,47 @@
+"""
+Servicio de resolución de roles para el login
+"""
+
+import hashlib
+import logging
+from typing import List
+from django.conf import settings
+from ..dao.generaciones import get_cache, get_generaciones
+from ..dao.rol_dao import RolDAO
+
+logger = logging.getLogger(__name__)
+
+
+class AuthService:
+    """Servicio que resuelve el rol de una persona al iniciar sesión"""
+
+    def __init__(self):
+        self.dao = RolDAO()
+
+    def get_roles(self, persona_external: str) -> List[str]:
+        """
+        Obtiene los roles activos de una persona, con un cache de vida corta.
+
+        En los picos de login (inicio de clases) la misma persona suele
+        reintentar varias veces; el directorio se guarda LOGIN_ROLE_CACHE_TTL
+        segundos con la generación de Administrador/Entrenador/Pasante en la
+        clave, así que cualquier alta o baja por los DAO lo invalida al instante.
+
+        Args:
+            persona_external: UUID externo de la persona
+
+        Returns:
+            List[str]: Roles en orden de prioridad (ADMIN, ENTRENADOR, PASANTE)
+        """
+        ttl = getattr(settings, 'LOGIN_ROLE_CACHE_TTL', 30)
+        if ttl <= 0:
+            return self.dao.get_roles(persona_external)
+
+        cache = get_cache()
+        generaciones = ','.join(str(g) for g in get_generaciones(self.dao.get_modelos()))
+        clave = f"roles:{generaciones}:{hashlib.md5(str(persona_external).encode()).hexdigest()}"
+        roles = cache.get(clave)
+        if roles is None:
+            roles = self.dao.get_roles(persona_external)
+            cache.set(clave, roles, ttl)
+        return roles
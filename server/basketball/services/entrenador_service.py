@@ -79,6 +79,18 @@ class EntrenadorService:
         """Obtiene todos los entrenadores activos"""
         return list(self.dao.get_activos())
     
+    def get_validador_listado(self) -> Dict[str, Any]:
+        """Total y última modificación del listado de entrenadores activos (ETag/Last-Modified)"""
+        return self.dao.get_validador(estado=True)
+    
+    def get_validador(self, pk: int) -> Dict[str, Any]:
+        """Total y última modificación de un entrenador (ETag/Last-Modified)"""
+        return self.dao.get_validador(pk=pk)
+    
+    def get_entrenadores_paginated(self, page: int, page_size: int) -> Dict[str, Any]:
+        """Obtiene una página de entrenadores activos"""
+        return self.dao.get_paginated(page, page_size, queryset=self.dao.get_activos())
+    
     def search_entrenadores(self, search_term: str) -> List[Entrenador]:
         """Busca entrenadores por término"""
         return list(self.dao.search_entrenadores(search_term))
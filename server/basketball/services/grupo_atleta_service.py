@@ -4,9 +4,14 @@ Servicio para la gestión de Grupos de Atletas
 
 import logging
 from typing import List, Optional, Dict, Any
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
 from ..dao.grupo_atleta_dao import GrupoAtletaDAO
+from ..dao.atleta_dao import AtletaDAO, calcular_edad
 from ..models import GrupoAtleta, Atleta
+from .asignacion_grupos import planificar
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +21,7 @@ class GrupoAtletaService:
     
     def __init__(self):
         self.dao = GrupoAtletaDAO()
+        self.atleta_dao = AtletaDAO()
     
     def create_grupo(self, data: Dict[str, Any]) -> GrupoAtleta:
         """
@@ -59,7 +65,7 @@ class GrupoAtletaService:
         atletas_ids = data.pop('atletas', None)
         grupo = self.dao.create(**data)
         if atletas_ids:
-            grupo.atletas.set(Atleta.objects.filter(id__in=atletas_ids))
+            self._reemplazar_atletas(grupo.pk, atletas_ids)
         return grupo
     
     def update_grupo(self, pk: int, data: Dict[str, Any]) -> Optional[GrupoAtleta]:
@@ -108,7 +114,7 @@ class GrupoAtletaService:
         atletas_ids = data.pop('atletas', None)
         grupo = self.dao.update(pk, **data)
         if grupo and atletas_ids is not None:
-            grupo.atletas.set(Atleta.objects.filter(id__in=atletas_ids))
+            self._reemplazar_atletas(grupo.pk, atletas_ids)
         return grupo
     
     def delete_grupo(self, pk: int) -> bool:
@@ -127,17 +133,109 @@ class GrupoAtletaService:
         """Obtiene un grupo por ID"""
         return self.dao.get_by_id(pk)
 
+    def get_atletas_de_grupo(self, pk: int) -> List[Atleta]:
+        """Obtiene los atletas asociados a un grupo"""
+        return list(self.atleta_dao.get_miembros_grupo(pk))
+
     def set_atletas(self, pk: int, atleta_ids: List[int]) -> Optional[GrupoAtleta]:
+        """Reemplaza los atletas del grupo (los IDs inexistentes se ignoran)"""
         grupo = self.dao.get_by_id(pk)
         if not grupo:
             return None
-        grupo.atletas.set(Atleta.objects.filter(id__in=atleta_ids))
+        self._reemplazar_atletas(grupo.pk, atleta_ids)
         return grupo
     
+    def _reemplazar_atletas(self, grupo_id: int, atleta_ids: List[int]) -> None:
+        # Diferencia por IDs contra la tabla intermedia, sin instanciar atletas
+        nuevos = self.atleta_dao.get_ids_existentes(atleta_ids)
+        actuales = self.atleta_dao.get_ids_atletas_de_grupo(grupo_id)
+        self.atleta_dao.actualizar_grupos(
+            agregar=((atleta_id, grupo_id) for atleta_id in nuevos - actuales),
+            quitar=((atleta_id, grupo_id) for atleta_id in actuales - nuevos),
+        )
+    
+    def asignar_por_edad(self, aplicar: bool = False) -> Dict[str, Any]:
+        """
+        Asigna los atletas activos sin grupo al grupo activo que acepta su edad.
+        
+        Los rangos de los grupos se cargan una vez en un índice de intervalos
+        y los atletas se recorren en una sola pasada (ver asignacion_grupos).
+        Sin aplicar solo se devuelve el plan; al aplicar, el plan se calcula
+        y se inserta en la tabla intermedia por lotes, en una transacción.
+        
+        Args:
+            aplicar: True para guardar las asignaciones, False para simularlas
+            
+        Returns:
+            Dict[str, Any]: Resumen por grupo, pares asignados y atletas sin grupo compatible
+        """
+        if not aplicar:
+            return self._planificar_por_edad()
+        
+        lote = max(getattr(settings, 'ASIGNACION_BATCH_SIZE', 2000), 1)
+        with transaction.atomic():
+            plan = self._planificar_por_edad()
+            pares = [(a['atleta'], a['grupo']) for a in plan['asignaciones']]
+            agregadas = 0
+            for inicio in range(0, len(pares), lote):
+                agregadas += self.atleta_dao.actualizar_grupos(agregar=pares[inicio:inicio + lote])['agregadas']
+        
+        logger.info(f"Asignación por edad: {agregadas} atletas asignados, {plan['sin_grupo_compatible']} sin grupo compatible")
+        return {**plan, 'aplicado': True, 'asignados': agregadas}
+    
+    def _planificar_por_edad(self) -> Dict[str, Any]:
+        grupos = self.dao.get_rangos_activos()
+        ocupacion = {grupo_id: cantidad for grupo_id, _, _, _, cantidad in grupos}
+        sin_grupo = self.atleta_dao.get_sin_grupo().order_by('id')
+        if getattr(settings, 'EDAD_POR_FECHA_NACIMIENTO', False):
+            hoy = timezone.localdate()
+            atletas = (
+                (atleta_id, calcular_edad(fecha_nacimiento, hoy))
+                for atleta_id, fecha_nacimiento in self.atleta_dao.iter_values(sin_grupo, ['id', 'fecha_nacimiento'])
+            )
+        else:
+            atletas = self.atleta_dao.iter_values(sin_grupo, ['id', 'edad'])
+        asignaciones, sin_rango = planificar(
+            ((grupo_id, minima, maxima) for grupo_id, _, minima, maxima, _ in grupos),
+            atletas, ocupacion
+        )
+        
+        nuevos = dict.fromkeys(ocupacion, 0)
+        for _, grupo_id in asignaciones:
+            nuevos[grupo_id] += 1
+        return {
+            'aplicado': False,
+            'total_atletas': len(asignaciones) + len(sin_rango),
+            'asignados': len(asignaciones),
+            'sin_grupo_compatible': len(sin_rango),
+            'grupos': [
+                {
+                    'id': grupo_id, 'nombre': nombre,
+                    'rango_edad_minima': minima, 'rango_edad_maxima': maxima,
+                    'atletas_actuales': cantidad, 'nuevos': nuevos[grupo_id],
+                }
+                for grupo_id, nombre, minima, maxima, cantidad in grupos
+            ],
+            'asignaciones': [{'atleta': atleta_id, 'grupo': grupo_id} for atleta_id, grupo_id in asignaciones],
+            'atletas_sin_grupo_compatible': sin_rango,
+        }
+    
     def get_all_grupos(self) -> List[GrupoAtleta]:
         """Obtiene todos los grupos activos"""
         return list(self.dao.get_activos())
     
+    def get_validador_listado(self) -> Dict[str, Any]:
+        """Total y última modificación del listado de grupos activos (ETag/Last-Modified)"""
+        return self.dao.get_validador(estado=True)
+    
+    def get_validador(self, pk: int) -> Dict[str, Any]:
+        """Total y última modificación de un grupo (ETag/Last-Modified)"""
+        return self.dao.get_validador(pk=pk)
+    
+    def get_grupos_paginated(self, page: int, page_size: int) -> Dict[str, Any]:
+        """Obtiene una página de grupos activos"""
+        return self.dao.get_paginated(page, page_size, queryset=self.dao.get_activos())
+    
     def get_grupos_by_entrenador(self, entrenador_id: int) -> List[GrupoAtleta]:
         """Obtiene grupos de un entrenador"""
         return list(self.dao.get_by_entrenador(entrenador_id))
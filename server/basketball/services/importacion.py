@@ -0,0 +1,232 @@
+"""
+Importación masiva de pruebas desde archivos CSV/XLSX
+
+El archivo se recorre fila a fila (CSV línea a línea sobre el archivo
+subido, XLSX con openpyxl en modo read_only), así que la memoria
+depende del tamaño del lote y no del archivo. Por cada lote se resuelven
+los DNI con una sola consulta, se validan las filas con los campos del
+modelo y las válidas se insertan con GenericDAO.bulk_create; todo el
+archivo se importa en una única transacción.
+"""
+
+import codecs
+import csv
+import logging
+import os
+import time
+import zipfile
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from ..dao.atleta_dao import AtletaDAO
+from ..dao.generic_dao import GenericDAO
+
+logger = logging.getLogger(__name__)
+
+FORMATOS = ('.csv', '.xlsx')
+
+Fila = Tuple[int, Dict[str, Any]]
+
+
+def leer_filas(archivo) -> Tuple[List[str], Iterator[Fila]]:
+    """
+    Abre un archivo subido y devuelve sus columnas y un iterador de filas.
+
+    Args:
+        archivo: UploadedFile (.csv o .xlsx) con encabezados en la primera fila
+
+    Returns:
+        Tuple: (columnas normalizadas, iterador de (número de fila, {columna: valor}))
+
+    Raises:
+        ValidationError: Si el formato no es soportado, el archivo está vacío o no se
+            puede decodificar (también al recorrer el iterador)
+    """
+    extension = os.path.splitext(archivo.name or '')[1].lower()
+    errores = (UnicodeDecodeError, csv.Error)
+    if extension == '.csv':
+        filas = csv.reader(codecs.iterdecode(archivo, 'utf-8-sig'))
+    elif extension == '.xlsx':
+        try:
+            from openpyxl import load_workbook
+            from openpyxl.utils.exceptions import InvalidFileException
+        except ImportError:
+            raise ValidationError("Para importar archivos XLSX instale openpyxl")
+        errores = (zipfile.BadZipFile, InvalidFileException, KeyError, ValueError)
+        try:
+            hoja = load_workbook(archivo, read_only=True, data_only=True).active
+        except errores as e:
+            raise _error_lectura(e)
+        filas = hoja.iter_rows(values_only=True)
+    else:
+        raise ValidationError(f"Formato no soportado, use {' o '.join(FORMATOS)}")
+
+    try:
+        encabezado = next(filas, None)
+    except errores as e:
+        raise _error_lectura(e, 1)
+    if not encabezado:
+        raise ValidationError("El archivo está vacío")
+    columnas = [str(c or '').strip().lower() for c in encabezado]
+
+    def iterar() -> Iterator[Fila]:
+        # La fila 1 es el encabezado, como en la hoja de cálculo
+        numero = 1
+        try:
+            for numero, valores in enumerate(filas, start=2):
+                if not any(v not in (None, '') for v in valores):
+                    continue
+                yield numero, dict(zip(columnas, valores))
+        except errores as e:
+            # Las filas se leen a medida que se importan: el error aparece a mitad del archivo
+            raise _error_lectura(e, numero + 1)
+
+    return columnas, iterar()
+
+
+def importar_archivo(archivo, dao: GenericDAO, campos: List[str],
+                     validar: Optional[Callable[[Dict[str, Any]], None]] = None,
+                     preparar_lote: Optional[Callable[[List[Dict[str, Any]]], Optional[Dict[int, Any]]]] = None,
+                     batch_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Importa un archivo de pruebas de atletas identificados por DNI.
+
+    Args:
+        archivo: UploadedFile con las columnas 'dni' y los campos del modelo
+        dao: DAO del modelo a importar
+        campos: Campos del modelo que se leen del archivo
+        validar: Validación adicional por fila sobre los campos ya convertidos (lanza ValidationError)
+        preparar_lote: Se llama con las filas válidas del lote antes de insertarlas; puede
+            devolver {posición en el lote: errores} para descartar filas
+        batch_size: Filas por lote (por defecto IMPORTACION_BATCH_SIZE)
+
+    Returns:
+        Dict: Reporte con totales, errores por fila y filas por segundo
+
+    Raises:
+        ValidationError: Si el archivo no se puede leer o faltan columnas obligatorias
+    """
+    batch_size = batch_size or getattr(settings, 'IMPORTACION_BATCH_SIZE', 1000)
+    max_errores = getattr(settings, 'IMPORTACION_MAX_ERRORES', 1000)
+    columnas, filas = leer_filas(archivo)
+
+    model = dao.model
+    obligatorias = ['dni'] + [
+        campo for campo in campos
+        if not (model._meta.get_field(campo).blank or model._meta.get_field(campo).has_default())
+    ]
+    faltantes = [c for c in obligatorias if c not in columnas]
+    if faltantes:
+        raise ValidationError(f"Faltan columnas obligatorias: {', '.join(faltantes)}")
+    campos = [c for c in campos if c in columnas]
+
+    reporte = {'total_filas': 0, 'importadas': 0, 'con_errores': 0, 'errores': [], 'errores_omitidos': 0}
+    atleta_dao = AtletaDAO()
+    inicio = time.perf_counter()
+    with transaction.atomic():
+        while True:
+            lote = list(islice(filas, batch_size))
+            if not lote:
+                break
+            dnis = [_dnis(fila.get('dni')) for _, fila in lote]
+            atletas = atleta_dao.get_ids_by_dni(dni for candidatos in dnis for dni in candidatos)
+            validas, origen = [], []
+            for (numero, fila), candidatos in zip(lote, dnis):
+                dni = next((dni for dni in candidatos if dni in atletas), candidatos[-1])
+                datos, errores = _limpiar(model, campos, fila)
+                if dni not in atletas:
+                    errores['dni'] = [f"No existe un atleta activo con DNI '{dni or ''}'"]
+                if validar:
+                    # Recibe solo los campos que se pudieron convertir
+                    try:
+                        validar(datos)
+                    except ValidationError as e:
+                        errores.update(e.message_dict if hasattr(e, 'error_dict') else {'__all__': e.messages})
+                if errores:
+                    _registrar_error(reporte, max_errores, numero, dni, errores)
+                    continue
+                datos['atleta_id'] = atletas[dni]
+                validas.append(datos)
+                origen.append((numero, dni))
+
+            reporte['total_filas'] += len(lote)
+            if validas and preparar_lote:
+                descartadas = preparar_lote(validas) or {}
+                for posicion in sorted(descartadas, reverse=True):
+                    _registrar_error(reporte, max_errores, *origen[posicion], descartadas[posicion])
+                    del validas[posicion]
+            if validas:
+                dao.bulk_create(validas, batch_size=batch_size)
+                reporte['importadas'] += len(validas)
+
+    duracion = time.perf_counter() - inicio
+    reporte['duracion_ms'] = round(duracion * 1000, 1)
+    reporte['filas_por_segundo'] = round(reporte['total_filas'] / duracion) if duracion else 0
+    logger.info(
+        f"Importación de {model.__name__}: {reporte['importadas']}/{reporte['total_filas']} filas "
+        f"en {reporte['duracion_ms']} ms ({reporte['filas_por_segundo']} filas/s)"
+    )
+    return reporte
+
+
+def _error_lectura(error: Exception, fila: Optional[int] = None) -> ValidationError:
+    """Error de decodificación o de formato del archivo, como ValidationError (400)"""
+    donde = f" (fila {fila})" if fila else ''
+    if isinstance(error, UnicodeDecodeError):
+        return ValidationError(f"El archivo CSV no está codificado en UTF-8{donde}; guárdelo como 'CSV UTF-8'")
+    return ValidationError(f"No se pudo leer el archivo{donde}: {error}")
+
+
+def _texto(valor: Any) -> str:
+    return '' if valor is None else str(valor).strip()
+
+
+def _dnis(valor: Any) -> List[str]:
+    """
+    DNI de la celda como texto y, si era numérica, también con ceros a la izquierda.
+
+    Las celdas numéricas de XLSX llegan como int/float y sin los ceros a la
+    izquierda, que se completan hasta IMPORTACION_DNI_LONGITUD.
+    """
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    if isinstance(valor, int) and not isinstance(valor, bool):
+        completo = str(valor).zfill(getattr(settings, 'IMPORTACION_DNI_LONGITUD', 10))
+        return list(dict.fromkeys([str(valor), completo]))
+    return [_texto(valor)]
+
+
+def _limpiar(model, campos: List[str], fila: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+    """Convierte y valida cada campo con la definición del modelo (tipo, longitud, choices)"""
+    errores, datos = {}, {}
+    for campo in campos:
+        field = model._meta.get_field(campo)
+        valor = fila.get(campo)
+        if isinstance(valor, str):
+            valor = valor.strip()
+            if field.choices:
+                valor = valor.upper()
+        elif isinstance(valor, float) and isinstance(field, models.DecimalField):
+            # Celda numérica de XLSX: 3.4 y no 3.39999999999999991118...
+            valor = str(valor)
+        if valor in (None, ''):
+            valor = None if field.null else ('' if field.blank else None)
+            if valor is None and field.has_default():
+                continue
+        try:
+            datos[campo] = field.clean(valor, None)
+        except ValidationError as e:
+            errores[campo] = e.messages
+    return datos, errores
+
+
+def _registrar_error(reporte: Dict[str, Any], max_errores: int, numero: int, dni: str,
+                     errores: Dict[str, List[str]]) -> None:
+    reporte['con_errores'] += 1
+    if len(reporte['errores']) < max_errores:
+        reporte['errores'].append({'fila': numero, 'dni': dni, 'errores': errores})
+    else:
+        # El detalle se limita para que un archivo erróneo no crezca en memoria
+        reporte['errores_omitidos'] += 1
@@ -3,7 +3,8 @@ Servicio para la gestión de Inscripciones
 """
 
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from ..dao.inscripcion_dao import InscripcionDAO
 from ..models import Inscripcion
@@ -76,6 +77,34 @@ class InscripcionService:
         """Obtiene todas las inscripciones habilitadas"""
         return list(self.dao.get_habilitadas())
     
+    def get_validador_listado(self) -> Dict[str, Any]:
+        """Total y última modificación del listado de inscripciones habilitadas (ETag/Last-Modified)"""
+        return self.dao.get_validador(habilitada=True)
+    
+    def get_validador(self, pk: int) -> Dict[str, Any]:
+        """Total y última modificación de una inscripción (ETag/Last-Modified)"""
+        return self.dao.get_validador(pk=pk)
+    
+    def get_inscripciones_paginated(self, page: int, page_size: int) -> Dict[str, Any]:
+        """Obtiene una página de inscripciones habilitadas"""
+        return self.dao.get_paginated(page, page_size, queryset=self.dao.get_habilitadas())
+    
+    def exportar_inscripciones(self, **filtros) -> Tuple[List[str], Iterator[tuple]]:
+        """
+        Obtiene las columnas y las filas a exportar de las inscripciones.
+        
+        Args:
+            **filtros: Filtros de InscripcionDAO.get_para_exportar
+            
+        Returns:
+            Tuple: (columnas, iterador de filas leídas por bloques de EXPORTACION_CHUNK_SIZE)
+        """
+        queryset = self.dao.get_para_exportar(**filtros)
+        filas = self.dao.iter_values(
+            queryset, self.dao.campos_exportacion, getattr(settings, 'EXPORTACION_CHUNK_SIZE', 2000)
+        )
+        return self.dao.campos_exportacion, filas
+    
     def search_inscripciones(self, search_term: str) -> List[Inscripcion]:
         """Busca inscripciones por término"""
         return list(self.dao.search_inscripciones(search_term))
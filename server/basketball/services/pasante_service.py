@@ -78,6 +78,18 @@ class PasanteService:
         """Obtiene todos los pasantes activos"""
         return list(self.dao.get_activos())
     
+    def get_validador_listado(self) -> Dict[str, Any]:
+        """Total y última modificación del listado de pasantes activos (ETag/Last-Modified)"""
+        return self.dao.get_validador(estado=True)
+    
+    def get_validador(self, pk: int) -> Dict[str, Any]:
+        """Total y última modificación de un pasante (ETag/Last-Modified)"""
+        return self.dao.get_validador(pk=pk)
+    
+    def get_pasantes_paginated(self, page: int, page_size: int) -> Dict[str, Any]:
+        """Obtiene una página de pasantes activos"""
+        return self.dao.get_paginated(page, page_size, queryset=self.dao.get_activos())
+    
     def search_pasantes(self, search_term: str) -> List[Pasante]:
         """Busca pasantes por término"""
         return list(self.dao.search_pasantes(search_term))
@@ -3,10 +3,12 @@ Servicio para la gestión de Pruebas Antropométricas
 """
 
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from ..dao.prueba_antropometrica_dao import PruebaAntropometricaDAO
 from ..models import PruebaAntropometrica
+from .importacion import importar_archivo
 
 logger = logging.getLogger(__name__)
 
@@ -75,10 +77,102 @@ class PruebaAntropometricaService:
         """Obtiene todas las pruebas activas"""
         return list(self.dao.get_activas())
     
+    def get_validador_listado(self) -> Dict[str, Any]:
+        """Total y última modificación del listado de pruebas activas (ETag/Last-Modified)"""
+        return self.dao.get_validador(estado=True)
+    
+    def get_validador(self, pk: int) -> Dict[str, Any]:
+        """Total y última modificación de una prueba (ETag/Last-Modified)"""
+        return self.dao.get_validador(pk=pk)
+    
+    def get_pruebas_paginated(self, page: int, page_size: int) -> Dict[str, Any]:
+        """Obtiene una página de pruebas activas"""
+        return self.dao.get_paginated(page, page_size, queryset=self.dao.get_activas())
+    
+    def get_pruebas_cursor(self, cursor: Optional[str], page_size: int,
+                           include_total: bool = False) -> Dict[str, Any]:
+        """Obtiene una página de pruebas activas por cursor (fecha_registro, id)"""
+        return self.dao.get_cursor_paginated(
+            cursor, page_size, queryset=self.dao.get_activas(), include_total=include_total
+        )
+    
     def get_pruebas_by_atleta(self, atleta_id: int) -> List[PruebaAntropometrica]:
         """Obtiene pruebas de un atleta"""
         return list(self.dao.get_by_atleta(atleta_id))
     
+    def get_estadisticas_grupo(self, grupo_id: int) -> Dict[str, Any]:
+        """Obtiene las estadísticas antropométricas de los atletas de un grupo"""
+        return self.dao.get_estadisticas_grupo(grupo_id)
+    
+    def importar_pruebas(self, archivo) -> Dict[str, Any]:
+        """
+        Importa pruebas desde un archivo CSV/XLSX con atletas identificados por DNI.
+        
+        Columnas: dni, fecha_registro, peso, estatura y opcionalmente
+        altura_sentado, envergadura, porcentaje_grasa, observaciones y
+        registrado_por. El IMC y el índice córnico se calculan por lote,
+        salvo que el archivo los traiga.
+        
+        Args:
+            archivo: Archivo subido
+            
+        Returns:
+            Dict: Reporte de la importación (ver importacion.importar_archivo)
+            
+        Raises:
+            ValidationError: Si el archivo no se puede leer o faltan columnas
+        """
+        return importar_archivo(
+            archivo, self.dao,
+            campos=['fecha_registro', 'peso', 'estatura', 'indice_masa_corporal', 'altura_sentado',
+                    'envergadura', 'indice_cornico', 'porcentaje_grasa', 'observaciones', 'registrado_por'],
+            validar=self._validar_medidas,
+            preparar_lote=self._calcular_indices,
+        )
+    
+    @staticmethod
+    def _validar_medidas(datos: Dict[str, Any]) -> None:
+        # Mismas reglas que create_prueba
+        errores = {
+            campo: [mensaje] for campo, mensaje in (
+                ('peso', "El peso debe ser mayor a 0"), ('estatura', "La estatura debe ser mayor a 0")
+            ) if datos.get(campo) is not None and datos[campo] <= 0
+        }
+        if errores:
+            raise ValidationError(errores)
+    
+    def _calcular_indices(self, lote: List[Dict[str, Any]]) -> Dict[int, Dict[str, List[str]]]:
+        """Calcula los índices del lote y descarta las filas cuyo índice no cabe en la columna"""
+        PruebaAntropometrica.calcular_indices_lote(lote)
+        errores = {}
+        for campo in PruebaAntropometrica.INDICES_DERIVADOS:
+            field = PruebaAntropometrica._meta.get_field(campo)
+            limite = 10 ** (field.max_digits - field.decimal_places)
+            for posicion, fila in enumerate(lote):
+                valor = fila.get(campo)
+                if valor is not None and abs(round(valor, field.decimal_places)) >= limite:
+                    # Suele ser la estatura en metros en lugar de centímetros
+                    errores.setdefault(posicion, {})[campo] = [
+                        f"Valor calculado fuera de rango ({valor:.2f}), revise las unidades"
+                    ]
+        return errores
+    
+    def exportar_pruebas(self, **filtros) -> Tuple[List[str], Iterator[tuple]]:
+        """
+        Obtiene las columnas y las filas a exportar de las pruebas.
+        
+        Args:
+            **filtros: Filtros de PruebaAntropometricaDAO.get_para_exportar
+            
+        Returns:
+            Tuple: (columnas, iterador de filas leídas por bloques de EXPORTACION_CHUNK_SIZE)
+        """
+        queryset = self.dao.get_para_exportar(**filtros)
+        filas = self.dao.iter_values(
+            queryset, self.dao.campos_exportacion, getattr(settings, 'EXPORTACION_CHUNK_SIZE', 2000)
+        )
+        return self.dao.campos_exportacion, filas
+    
     def search_pruebas(self, search_term: str) -> List[PruebaAntropometrica]:
         """Busca pruebas por término"""
         return list(self.dao.search_pruebas(search_term))
@@ -3,10 +3,14 @@ Servicio para la gestión de Pruebas Físicas
 """
 
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from ..dao.prueba_fisica_dao import PruebaFisicaDAO
 from ..models import PruebaFisica
+from .importacion import importar_archivo
+from .ranking_service import RankingService
 
 logger = logging.getLogger(__name__)
 
@@ -70,10 +74,96 @@ class PruebaFisicaService:
         """Obtiene todas las pruebas activas"""
         return list(self.dao.get_activas())
     
+    def get_validador_listado(self) -> Dict[str, Any]:
+        """Total y última modificación del listado de pruebas activas (ETag/Last-Modified)"""
+        return self.dao.get_validador(estado=True)
+    
+    def get_validador(self, pk: int) -> Dict[str, Any]:
+        """Total y última modificación de una prueba (ETag/Last-Modified)"""
+        return self.dao.get_validador(pk=pk)
+    
+    def get_pruebas_paginated(self, page: int, page_size: int) -> Dict[str, Any]:
+        """Obtiene una página de pruebas activas"""
+        return self.dao.get_paginated(page, page_size, queryset=self.dao.get_activas())
+    
+    def get_pruebas_cursor(self, cursor: Optional[str], page_size: int,
+                           include_total: bool = False) -> Dict[str, Any]:
+        """Obtiene una página de pruebas activas por cursor (fecha_registro, id)"""
+        return self.dao.get_cursor_paginated(
+            cursor, page_size, queryset=self.dao.get_activas(), include_total=include_total
+        )
+    
     def get_pruebas_by_atleta(self, atleta_id: int) -> List[PruebaFisica]:
         """Obtiene pruebas de un atleta"""
         return list(self.dao.get_by_atleta(atleta_id))
     
+    def get_estadisticas_atletas(self, atleta_ids: List[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+        """Obtiene las estadísticas por tipo de prueba de varios atletas"""
+        return self.dao.get_estadisticas_atletas(atleta_ids)
+    
+    def get_estadisticas_grupo(self, grupo_id: int) -> Dict[int, Dict[str, Any]]:
+        """Obtiene las estadísticas por tipo de prueba de los atletas de un grupo"""
+        return self.dao.get_estadisticas_grupo(grupo_id)
+    
+    def importar_pruebas(self, archivo) -> Dict[str, Any]:
+        """
+        Importa pruebas desde un archivo CSV/XLSX con atletas identificados por DNI.
+        
+        Columnas: dni, fecha_registro, tipo_prueba, nombre_prueba, resultado,
+        unidad_medida y opcionalmente valoracion, observaciones y registrado_por.
+        
+        Args:
+            archivo: Archivo subido
+            
+        Returns:
+            Dict: Reporte de la importación (ver importacion.importar_archivo)
+            
+        Raises:
+            ValidationError: Si el archivo no se puede leer o faltan columnas
+        """
+        pruebas_importadas = {}
+        
+        def registrar_pruebas(lote: List[Dict[str, Any]]) -> None:
+            for datos in lote:
+                pruebas_importadas[datos['nombre_prueba']] = datos['tipo_prueba']
+        
+        reporte = importar_archivo(
+            archivo, self.dao,
+            campos=['fecha_registro', 'tipo_prueba', 'nombre_prueba', 'resultado', 'unidad_medida',
+                    'valoracion', 'observaciones', 'registrado_por'],
+            validar=self._validar_resultado,
+            preparar_lote=registrar_pruebas,
+        )
+        
+        # bulk_create no dispara las señales: se recalcula una vez cada ranking afectado
+        if getattr(settings, 'RANKING_AUTO_REFRESH', True):
+            ranking = RankingService()
+            for nombre, tipo in pruebas_importadas.items():
+                transaction.on_commit(lambda n=nombre, t=tipo: ranking.recalcular_ranking(n, t))
+        return reporte
+    
+    @staticmethod
+    def _validar_resultado(datos: Dict[str, Any]) -> None:
+        # Misma regla que create_prueba
+        if datos.get('resultado') is not None and datos['resultado'] < 0:
+            raise ValidationError({'resultado': ["El resultado no puede ser negativo"]})
+    
+    def exportar_pruebas(self, **filtros) -> Tuple[List[str], Iterator[tuple]]:
+        """
+        Obtiene las columnas y las filas a exportar de las pruebas.
+        
+        Args:
+            **filtros: Filtros de PruebaFisicaDAO.get_para_exportar
+            
+        Returns:
+            Tuple: (columnas, iterador de filas leídas por bloques de EXPORTACION_CHUNK_SIZE)
+        """
+        queryset = self.dao.get_para_exportar(**filtros)
+        filas = self.dao.iter_values(
+            queryset, self.dao.campos_exportacion, getattr(settings, 'EXPORTACION_CHUNK_SIZE', 2000)
+        )
+        return self.dao.campos_exportacion, filas
+    
     def search_pruebas(self, search_term: str) -> List[PruebaFisica]:
         """Busca pruebas por término"""
         return list(self.dao.search_pruebas(search_term))
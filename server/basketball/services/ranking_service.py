@@ -0,0 +1,107 @@
+"""
+Servicio para los rankings de Pruebas Físicas
+"""
+
+import logging
+from typing import Iterable, List, Optional
+from django.conf import settings
+from ..dao.ranking_prueba_fisica_dao import RankingPruebaFisicaDAO
+from ..models import RankingPruebaFisica
+
+logger = logging.getLogger(__name__)
+
+
+class RankingService:
+    """Servicio que encapsula el cálculo y la lectura del leaderboard de pruebas físicas"""
+
+    def __init__(self):
+        self.dao = RankingPruebaFisicaDAO()
+
+    def menor_es_mejor(self, nombre_prueba: str, tipo_prueba: Optional[str] = None) -> bool:
+        """
+        Indica si en la prueba un resultado menor es mejor.
+
+        RANKING_DIRECCION_POR_PRUEBA (por nombre) tiene prioridad sobre
+        RANKING_DIRECCION_POR_TIPO; por defecto un resultado mayor es mejor.
+        """
+        por_prueba = getattr(settings, 'RANKING_DIRECCION_POR_PRUEBA', {})
+        if nombre_prueba in por_prueba:
+            return por_prueba[nombre_prueba].upper() == 'ASC'
+        if tipo_prueba is None:
+            tipo_prueba = self.dao.get_tipo_prueba(nombre_prueba)
+        por_tipo = getattr(settings, 'RANKING_DIRECCION_POR_TIPO', {'VELOCIDAD': 'ASC', 'AGILIDAD': 'ASC'})
+        return por_tipo.get(tipo_prueba, 'DESC').upper() == 'ASC'
+
+    def recalcular_ranking(self, nombre_prueba: str, tipo_prueba: Optional[str] = None,
+                           particiones: Optional[Iterable[str]] = None) -> int:
+        """
+        Recalcula el leaderboard de una prueba, completo o solo algunas particiones.
+
+        Returns:
+            int: Filas escritas en el leaderboard
+        """
+        filas = self.dao.recalcular(
+            nombre_prueba,
+            menor_es_mejor=self.menor_es_mejor(nombre_prueba, tipo_prueba),
+            banda_edad=getattr(settings, 'RANKING_BANDA_EDAD', 2),
+            particiones=particiones,
+        )
+        logger.info(f"Ranking de '{nombre_prueba}' recalculado ({filas} filas)")
+        return filas
+
+    def recalcular_por_atletas(self, atleta_ids: Iterable[int], particiones: Iterable[str] = (),
+                               actuales: bool = False, nombres_prueba: Optional[Iterable[str]] = None) -> int:
+        """
+        Recalcula las particiones afectadas por cambios en unos atletas o en sus pruebas.
+
+        Args:
+            atleta_ids: Atletas modificados
+            particiones: Particiones afectadas (p.ej. la banda de edad anterior y la nueva)
+            actuales: Añadir todas las particiones a las que pertenecen hoy los atletas
+            nombres_prueba: Pruebas a recalcular (None = las pruebas activas de los atletas)
+
+        Returns:
+            int: Filas escritas en el leaderboard
+        """
+        atleta_ids, particiones = set(atleta_ids), set(particiones)
+        if actuales:
+            particiones |= self.dao.get_particiones_de_atletas(
+                atleta_ids, getattr(settings, 'RANKING_BANDA_EDAD', 2)
+            )
+        if not particiones:
+            return 0
+        if nombres_prueba is None:
+            nombres_prueba = self.dao.get_nombres_prueba(atleta_ids)
+        return sum(self.recalcular_ranking(nombre, particiones=particiones) for nombre in nombres_prueba)
+
+    def recalcular_todos(self) -> int:
+        """Recalcula el leaderboard de todas las pruebas y descarta las que ya no existen"""
+        nombres = self.dao.get_nombres_prueba()
+        self.dao.get_all().exclude(nombre_prueba__in=nombres).delete()
+        return sum(self.recalcular_ranking(nombre) for nombre in nombres)
+
+    def get_particion(self, sexo: Optional[str] = None, edad: Optional[int] = None,
+                      grupo_id: Optional[int] = None) -> str:
+        """
+        Construye la clave de partición a partir de los filtros.
+
+        Raises:
+            ValueError: Si se indica más de un filtro
+        """
+        filtros = [f for f in (sexo, edad, grupo_id) if f is not None]
+        if len(filtros) > 1:
+            raise ValueError("Solo se puede filtrar por sexo, edad o grupo a la vez")
+        if sexo is not None:
+            return f'sexo:{sexo}'
+        if edad is not None:
+            banda = getattr(settings, 'RANKING_BANDA_EDAD', 2)
+            return f'edad:{edad // banda * banda}'
+        if grupo_id is not None:
+            return f'grupo:{grupo_id}'
+        return 'general'
+
+    def get_ranking(self, nombre_prueba: str, sexo: Optional[str] = None, edad: Optional[int] = None,
+                    grupo_id: Optional[int] = None, limit: int = 10) -> List[RankingPruebaFisica]:
+        """Obtiene las primeras posiciones del leaderboard precalculado"""
+        particion = self.get_particion(sexo, edad, grupo_id)
+        return list(self.dao.get_ranking(nombre_prueba, particion, limit))
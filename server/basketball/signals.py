@@ -0,0 +1,118 @@
+"""
+Señales del módulo Basketball
+
+Mantienen actualizado el leaderboard precalculado de pruebas físicas,
+después del commit de la transacción y solo en las particiones afectadas:
+al guardar o eliminar una PruebaFisica, las de su atleta en ese nombre de
+prueba; al cambiar el sexo, la edad, el estado o los grupos de un atleta,
+las que deja y a las que entra en todas sus pruebas.
+
+También marcan como modificados (fecha_actualizacion) a los atletas cuyos
+grupos cambian, ya que esos cambios no pasan por Atleta.save() y el ETag
+de sus listados depende de ese timestamp, e invalidan sus listados cacheados.
+
+Después de cada migrate vuelven a crear los triggers FTS5 de SQLite que una
+reconstrucción de tabla haya eliminado (ver dao/search_backends.py).
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed, post_migrate
+from django.dispatch import receiver
+from django.utils import timezone
+from .models import Atleta, PruebaFisica
+from .dao.generaciones import incrementar_generacion
+from .dao.search_backends import asegurar_triggers_fts
+
+
+def recalcular_rankings_de_atletas(atleta_ids, particiones=(), actuales=False, nombres_prueba=None):
+    """
+    Programa, para después del commit, el recálculo de las particiones del
+    leaderboard afectadas por cambios en unos atletas (ver
+    RankingService.recalcular_por_atletas).
+
+    Lo usan estas señales y las escrituras masivas de AtletaDAO, que no
+    pasan por save() ni por el manager del M2M.
+    """
+    if not atleta_ids or not getattr(settings, 'RANKING_AUTO_REFRESH', True):
+        return
+    from .services.ranking_service import RankingService
+
+    atleta_ids, particiones = set(atleta_ids), set(particiones)
+    transaction.on_commit(
+        lambda: RankingService().recalcular_por_atletas(atleta_ids, particiones, actuales, nombres_prueba)
+    )
+
+
+def _particiones_atleta(sexo, edad):
+    banda = getattr(settings, 'RANKING_BANDA_EDAD', 2)
+    return {f'sexo:{sexo}', f'edad:{int(edad) // banda * banda}'}
+
+
+@receiver(pre_save, sender=PruebaFisica)
+def recordar_nombre_prueba(sender, instance, **kwargs):
+    # Si la prueba cambia de nombre o de atleta también hay que recalcular el ranking anterior
+    instance._anterior = None
+    if instance.pk and getattr(settings, 'RANKING_AUTO_REFRESH', True):
+        instance._anterior = sender.objects.filter(pk=instance.pk).values_list(
+            'nombre_prueba', 'atleta_id'
+        ).first()
+
+
+@receiver(post_save, sender=PruebaFisica)
+def actualizar_ranking(sender, instance, **kwargs):
+    nombres, atletas = {instance.nombre_prueba}, {instance.atleta_id}
+    anterior = getattr(instance, '_anterior', None)
+    if anterior:
+        nombres.add(anterior[0])
+        atletas.add(anterior[1])
+    recalcular_rankings_de_atletas(atletas, actuales=True, nombres_prueba=nombres)
+
+
+@receiver(post_delete, sender=PruebaFisica)
+def actualizar_ranking_al_eliminar(sender, instance, **kwargs):
+    recalcular_rankings_de_atletas({instance.atleta_id}, actuales=True, nombres_prueba={instance.nombre_prueba})
+
+
+@receiver(pre_save, sender=Atleta)
+def recordar_particiones_atleta(sender, instance, **kwargs):
+    instance._anterior = None
+    if instance.pk and getattr(settings, 'RANKING_AUTO_REFRESH', True):
+        instance._anterior = sender.objects.filter(pk=instance.pk).values_list('sexo', 'edad', 'estado').first()
+
+
+@receiver(post_save, sender=Atleta)
+def actualizar_ranking_de_atleta(sender, instance, created, **kwargs):
+    # Un atleta nuevo no tiene pruebas; uno modificado solo cambia las particiones que deja o a las que entra
+    anterior = getattr(instance, '_anterior', None)
+    if created or not anterior:
+        return
+    sexo, edad, estado = anterior
+    particiones = _particiones_atleta(sexo, edad) ^ _particiones_atleta(instance.sexo, instance.edad)
+    if estado != instance.estado:
+        particiones |= _particiones_atleta(sexo, edad)
+    if particiones or estado != instance.estado:
+        recalcular_rankings_de_atletas({instance.pk}, particiones, actuales=estado != instance.estado)
+
+
+@receiver(m2m_changed, sender=Atleta.grupos.through)
+def marcar_atletas_modificados(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # Después del clear ya no se sabe qué atletas tenía el grupo (o qué grupos el atleta)
+        relacion = instance.atletas if reverse else instance.grupos
+        instance._antes_de_clear = list(relacion.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    otros = getattr(instance, '_antes_de_clear', []) if action == 'post_clear' else list(pk_set or [])
+    ids, grupos = (otros, [instance.pk]) if reverse else ([instance.pk], otros)
+    if ids and grupos:
+        Atleta.objects.filter(pk__in=ids).update(fecha_actualizacion=timezone.now())
+        incrementar_generacion(Atleta)
+        recalcular_rankings_de_atletas(ids, {f'grupo:{grupo_id}' for grupo_id in grupos})
+
+
+@receiver(post_migrate)
+def restaurar_triggers_fts(sender, using, **kwargs):
+    if sender.name == 'basketball':
+        asegurar_triggers_fts(using)
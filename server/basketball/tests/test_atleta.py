@@ -1,6 +1,13 @@
+import io
+import json
+from datetime import date, timedelta
+from unittest import mock
+from django.core.management import call_command
+from django.test import override_settings
 from rest_framework import status
 from .test_entrenador import BaseTestCase
-from ..models import Atleta
+from ..dao.atleta_dao import AtletaDAO, calcular_edad
+from ..models import Atleta, Entrenador, GrupoAtleta
 
 class AtletaTests(BaseTestCase):
     def setUp(self):
@@ -30,3 +37,175 @@ class AtletaTests(BaseTestCase):
         self.client.post('/api/v1/atletas/', self.atleta_data)
         response = self.client.post('/api/v1/atletas/', self.atleta_data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def _crear_atletas(self, cantidad):
+        for i in range(cantidad):
+            Atleta.objects.create(**{**self.atleta_data, 'dni': f'dni-{i:03d}', 'apellido_atleta': f'Perez {i:03d}'})
+
+    def test_list_atletas_sin_paginacion(self):
+        self.authenticate('ADMIN')
+        self._crear_atletas(3)
+        response = self.client.get('/api/v1/atletas/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+
+    def test_list_atletas_paginado(self):
+        self.authenticate('ADMIN')
+        self._crear_atletas(5)
+        response = self.client.get('/api/v1/atletas/', {'page': 2, 'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], 5)
+        self.assertEqual(response.data['total_pages'], 3)
+        self.assertEqual([a['dni'] for a in response.data['items']], ['dni-002', 'dni-003'])
+        self.assertTrue(response.data['has_next'])
+
+    @override_settings(PAGINATION_MAX_PAGE_SIZE=2)
+    def test_list_atletas_respeta_page_size_maximo(self):
+        self.authenticate('ADMIN')
+        self._crear_atletas(3)
+        response = self.client.get('/api/v1/atletas/', {'page_size': 50})
+        self.assertEqual(response.data['page_size'], 2)
+        self.assertEqual(len(response.data['items']), 2)
+
+    def test_list_atletas_page_invalida(self):
+        self.authenticate('ADMIN')
+        response = self.client.get('/api/v1/atletas/', {'page': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_atletas_consultas_constantes(self):
+        self.authenticate('ADMIN')
+        self._crear_atletas(10)
+        entrenador = Entrenador.objects.create(
+            persona_external='uuid-entrenador', especialidad='Basket', club_asignado='Club'
+        )
+        for nombre in ('Grupo A', 'Grupo B'):
+            grupo = GrupoAtleta.objects.create(
+                nombre=nombre, rango_edad_minima=10, rango_edad_maxima=20,
+                categoria='Juvenil', entrenador=entrenador
+            )
+            grupo.atletas.set(Atleta.objects.all())
+        # Validador del ETag + atletas + prefetch de grupos, sin importar cuántos atletas haya
+        with self.assertMaxQueries(3):
+            response = self.client.get('/api/v1/atletas/')
+        self.assertEqual(len(response.data), 10)
+        self.assertTrue(all(len(a['grupos']) == 2 for a in response.data))
+        with self.assertMaxQueries(4):
+            response = self.client.get('/api/v1/atletas/', {'page': 1, 'page_size': 5})
+        self.assertEqual(len(response.data['items']), 5)
+
+    def test_exportar_atletas_por_grupo(self):
+        entrenador = Entrenador.objects.create(persona_external='uuid-e', especialidad='B', club_asignado='C')
+        grupo = GrupoAtleta.objects.create(
+            nombre='G', rango_edad_minima=10, rango_edad_maxima=20, categoria='Juvenil', entrenador=entrenador
+        )
+        for i in range(3):
+            atleta = Atleta.objects.create(**{**self.atleta_data, 'dni': f'dni-{i}', 'estado': i != 1})
+            if i < 2:
+                atleta.grupos.add(grupo)
+        self.authenticate('ENTRENADOR')
+        response = self.client.get('/api/v1/atletas/exportar/', {'grupo': grupo.id, 'formato': 'ndjson'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lineas = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(linea)['dni'] for linea in lineas], ['dni-0'])
+
+
+    def test_list_atletas_condicional(self):
+        self.authenticate('ADMIN')
+        self._crear_atletas(3)
+        response = self.client.get('/api/v1/atletas/')
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        # Solo la consulta del validador, sin leer ni serializar los atletas
+        with self.assertMaxQueries(1):
+            response = self.client.get('/api/v1/atletas/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        response = self.client.get('/api/v1/atletas/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Cada página tiene su propio ETag
+        self.assertNotEqual(self.client.get('/api/v1/atletas/', {'page': 1, 'page_size': 2})['ETag'], etag)
+
+        atleta = Atleta.objects.first()
+        self.client.put(f'/api/v1/atletas/{atleta.id}/', {'telefono': '0999'})
+        response = self.client.get('/api/v1/atletas/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        # Un atleta desactivado sale del listado aunque el resto no cambie
+        etag = response['ETag']
+        self.client.delete(f'/api/v1/atletas/{atleta.id}/')
+        response = self.client.get('/api/v1/atletas/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+
+    def test_retrieve_atleta_condicional_cambia_con_grupos(self):
+        self.authenticate('ENTRENADOR')
+        atleta = Atleta.objects.create(**self.atleta_data)
+        entrenador = Entrenador.objects.create(persona_external='uuid-e', especialidad='B', club_asignado='C')
+        grupo = GrupoAtleta.objects.create(
+            nombre='G', rango_edad_minima=10, rango_edad_maxima=20, categoria='Juvenil', entrenador=entrenador
+        )
+        etag = self.client.get(f'/api/v1/atletas/{atleta.id}/')['ETag']
+        response = self.client.get(f'/api/v1/atletas/{atleta.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Los cambios de grupos no pasan por Atleta.save()
+        grupo.atletas.add(atleta)
+        response = self.client.get(f'/api/v1/atletas/{atleta.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['grupos'], [grupo.id])
+        # ...y también invalidan el listado cacheado
+        self.assertEqual(self.client.get('/api/v1/atletas/').data[0]['grupos'], [grupo.id])
+
+        etag = response['ETag']
+        grupo.atletas.clear()
+        response = self.client.get(f'/api/v1/atletas/{atleta.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['grupos'], [])
+        self.assertEqual(self.client.get('/api/v1/atletas/').data[0]['grupos'], [])
+
+        response = self.client.get('/api/v1/atletas/9999/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_recalcular_edades(self):
+        hoy = date(2027, 2, 28)
+        nacimientos = {
+            'al-dia': (date(2015, 2, 28), 12),         # ya correcta: no se escribe
+            'cumple-hoy': (date(2015, 2, 28), 11),
+            'cumple-manana': (date(2015, 3, 1), 12),
+            'bisiesto': (date(2016, 2, 29), 11),       # cumple el 1 de marzo
+            'mayor': (date(1950, 6, 1), 30),
+            'futuro': (date(2030, 1, 1), 5),
+        }
+        Atleta.objects.bulk_create([
+            Atleta(nombre_atleta='Juan', apellido_atleta=dni, dni=dni, fecha_nacimiento=fecha, edad=edad, sexo='M')
+            for dni, (fecha, edad) in nacimientos.items()
+        ])
+        antes = Atleta.objects.get(dni='al-dia').fecha_actualizacion
+
+        call_command('recalcular_edades', fecha=hoy.isoformat(), stdout=io.StringIO())
+        edades = dict(Atleta.objects.values_list('dni', 'edad'))
+        self.assertEqual(edades, {'al-dia': 12, 'cumple-hoy': 12, 'cumple-manana': 11,
+                                  'bisiesto': 10, 'mayor': 76, 'futuro': 0})
+        self.assertEqual(Atleta.objects.get(dni='al-dia').fecha_actualizacion, antes)
+        for dni, (fecha, _) in nacimientos.items():
+            self.assertEqual(edades[dni], calcular_edad(fecha, hoy))
+        # Sin cambios no escribe nada
+        self.assertEqual(AtletaDAO().recalcular_edades(hoy), 0)
+        self.assertEqual(AtletaDAO().recalcular_edades(hoy + timedelta(days=1)), 2)
+
+    def test_filtro_edad_por_fecha_nacimiento(self):
+        Atleta.objects.bulk_create([
+            Atleta(nombre_atleta='Juan', apellido_atleta=dni, dni=dni, fecha_nacimiento=fecha, edad=0, sexo='M')
+            for dni, fecha in [('9', date(2017, 6, 1)), ('10', date(2016, 6, 2)), ('12', date(2014, 6, 1)), ('13', date(2013, 1, 1))]
+        ])
+        dao = AtletaDAO()
+        with mock.patch('django.utils.timezone.localdate', return_value=date(2026, 6, 1)):
+            # La edad guardada (0, desactualizada) no afecta al modo por fecha de nacimiento
+            self.assertFalse(dao.get_by_rango_edad(10, 12).exists())
+            with override_settings(EDAD_POR_FECHA_NACIMIENTO=True):
+                self.assertEqual(set(dao.get_by_rango_edad(10, 12).values_list('dni', flat=True)), {'12'})
+                self.assertEqual(set(dao.get_by_rango_edad(9, 9).values_list('dni', flat=True)), {'9', '10'})
+                self.assertEqual(set(dao.get_para_exportar(edad_min=13).values_list('dni', flat=True)), {'13'})
@@ -0,0 +1,36 @@
+from rest_framework import status
+from .test_entrenador import BaseTestCase
+from ..dao import PasanteDAO
+from ..models import Administrador, Entrenador, Pasante
+
+
+class MockAuthTests(BaseTestCase):
+    def login(self, username, password):
+        return self.client.post('/api/auth/login', {'username': username, 'password': password}, format='json')
+
+    def test_login_pasante_una_consulta(self):
+        Pasante.objects.create(persona_external='uuid-p', carrera='Sistemas', semestre='5', universidad='UNL',
+                               fecha_inicio='2024-01-01')
+        with self.assertMaxQueries(1):
+            response = self.login('uuid-p', 'pasante123')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['role'], 'PASANTE')
+        # Reintentos del mismo usuario usan el directorio cacheado
+        with self.assertMaxQueries(0):
+            self.assertEqual(self.login('uuid-p', 'pasante123').status_code, status.HTTP_200_OK)
+
+    def test_login_prioridad_y_contrasena_por_rol(self):
+        Administrador.objects.create(persona_external='uuid-x', cargo='Director')
+        Entrenador.objects.create(persona_external='uuid-x', especialidad='B', club_asignado='C')
+        self.assertEqual(self.login('uuid-x', 'admin123').data['user']['role'], 'ADMIN')
+        self.assertEqual(self.login('uuid-x', 'entrenador123').data['user']['role'], 'ENTRENADOR')
+        self.assertEqual(self.login('uuid-x', 'pasante123').status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.login('otro', 'admin123').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_login_invalida_cache_al_desactivar(self):
+        pasante = Pasante.objects.create(
+            persona_external='uuid-p', carrera='S', semestre='5', universidad='UNL', fecha_inicio='2024-01-01'
+        )
+        self.assertEqual(self.login('uuid-p', 'pasante123').status_code, status.HTTP_200_OK)
+        PasanteDAO().soft_delete(pasante.pk)
+        self.assertEqual(self.login('uuid-p', 'pasante123').status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,72 @@
+from unittest.mock import patch
+from django.test import SimpleTestCase
+from .. import serializers
+from ..connection.circuit_breaker import CircuitBreaker, CircuitOpenError
+from ..connection.persona_cache import PersonaCache
+from ..models import Entrenador
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10, time_func=self.clock)
+
+    def test_abre_tras_n_fallos_y_falla_rapido(self):
+        for _ in range(3):
+            self.assertTrue(self.breaker.allow_request())
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(self.breaker.stats()['rejected'], 1)
+
+    def test_half_open_cierra_con_exito(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now += 10
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow_request())
+        self.assertFalse(self.breaker.allow_request())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.stats()['transitions'], {'open': 1, 'half_open': 1, 'closed': 1})
+
+    def test_half_open_reabre_con_fallo(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now += 10
+        self.breaker.allow_request()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+
+class PersonaStaleFallbackTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = PersonaCache(ttl=10, stale_ttl=100, time_func=self.clock)
+        patcher = patch.object(serializers, '_persona_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_circuito_abierto_sirve_dato_desactualizado(self):
+        self.cache.set('uuid-1', {'first_name': 'Ana'})
+        self.clock.now += 20
+        entrenador = Entrenador(id=1, persona_external='uuid-1', especialidad='B', club_asignado='C')
+        with patch.object(serializers._user_module_client, 'get_persona', side_effect=CircuitOpenError()):
+            data = serializers.EntrenadorSerializer(entrenador).data
+        self.assertEqual(data['nombre'], 'Ana')
+        self.assertTrue(data['persona_desactualizada'])
+
+    def test_sin_dato_previo_devuelve_vacio(self):
+        entrenador = Entrenador(id=1, persona_external='uuid-2', especialidad='B', club_asignado='C')
+        with patch.object(serializers._user_module_client, 'get_persona', side_effect=CircuitOpenError()):
+            data = serializers.EntrenadorSerializer(entrenador).data
+        self.assertEqual(data['nombre'], '')
+        self.assertFalse(data['persona_desactualizada'])
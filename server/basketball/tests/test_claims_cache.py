@@ -0,0 +1,80 @@
+import time
+from unittest.mock import patch
+import jwt
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+from .. import permissions
+from ..connection.claims_cache import ClaimsCache, MISS
+from ..permissions import IsAdmin, IsAdminOrEntrenadorOrPasante, get_request_role
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ClaimsCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ClaimsCache(max_size=2, ttl=10, time_func=self.clock)
+
+    def test_vence_en_exp_del_token(self):
+        self.cache.set('token-1', {'role': 'ADMIN', 'exp': 1005})
+        self.assertEqual(self.cache.get('token-1'), {'role': 'ADMIN', 'exp': 1005})
+        self.clock.now = 1005
+        self.assertIs(self.cache.get('token-1'), MISS)
+
+    def test_sin_exp_usa_ttl_y_no_guarda_expirados(self):
+        self.cache.set('token-1', {'role': 'ADMIN'})
+        self.cache.set('token-2', {'role': 'ADMIN', 'exp': 999})
+        self.assertIs(self.cache.get('token-2'), MISS)
+        self.clock.now = 1011
+        self.assertIs(self.cache.get('token-1'), MISS)
+
+    def test_evict_lru(self):
+        self.cache.set('token-1', {})
+        self.cache.set('token-2', {})
+        self.cache.get('token-1')
+        self.cache.set('token-3', {})
+        self.assertIs(self.cache.get('token-2'), MISS)
+        self.assertEqual(self.cache.get('token-1'), {})
+        stats = self.cache.stats()
+        self.assertEqual((stats['evictions'], stats['size']), (1, 2))
+
+
+class RolePermissionClaimsTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = ClaimsCache(max_size=10, ttl=60)
+        patcher = patch.object(permissions, '_claims_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _request(self, **payload):
+        token = jwt.encode(payload, '1234567FDUCAMETB', algorithm='HS256')
+        return Request(APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+
+    def test_decodifica_una_vez_por_token(self):
+        with patch.object(permissions.jwt, 'decode', wraps=jwt.decode) as decode:
+            for _ in range(3):
+                request = self._request(stament='ADMINISTRATIVO')
+                # Varias clases de permiso en la misma petición reutilizan el rol resuelto
+                self.assertTrue(IsAdmin().has_permission(request, None))
+                self.assertTrue(IsAdminOrEntrenadorOrPasante().has_permission(request, None))
+                self.assertEqual(get_request_role(request), 'ADMIN')
+        self.assertEqual(decode.call_count, 1)
+        self.assertEqual(self.cache.stats()['hits'], 2)
+
+    def test_token_expirado_rechazado(self):
+        request = self._request(role='ADMIN', exp=int(time.time()) - 10)
+        self.assertFalse(IsAdmin().has_permission(request, None))
+        self.assertEqual(self.cache.stats()['size'], 0)
+
+    def test_header_de_rol_antes_que_token(self):
+        request = Request(APIRequestFactory().get('/', HTTP_X_ROLE='docente'))
+        self.assertTrue(IsAdminOrEntrenadorOrPasante().has_permission(request, None))
+        self.assertFalse(IsAdmin().has_permission(request, None))
+        self.assertEqual(get_request_role(request), 'ENTRENADOR')
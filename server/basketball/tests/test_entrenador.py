@@ -1,12 +1,19 @@
+from contextlib import contextmanager
+from unittest.mock import patch
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 from rest_framework import status
 import jwt
 from django.conf import settings
+from ..dao.generaciones import get_cache
 from ..models import Entrenador
 
 class BaseTestCase(APITestCase):
     def setUp(self):
         self.secret_key = '1234567FDUCAMETB'
+        # Las respuestas cacheadas sobreviven al rollback de la base de datos de cada test
+        get_cache().clear()
         
     def get_token(self, role='ADMIN'):
         payload = {
@@ -20,6 +27,18 @@ class BaseTestCase(APITestCase):
         token = self.get_token(role)
         self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
 
+    @contextmanager
+    def assertMaxQueries(self, max_queries):
+        """Falla si el bloque ejecuta más de max_queries consultas SQL"""
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        executed = len(context.captured_queries)
+        self.assertLessEqual(
+            executed, max_queries,
+            f"Se ejecutaron {executed} consultas (máximo {max_queries}):\n"
+            + "\n".join(q['sql'] for q in context.captured_queries)
+        )
+
 class EntrenadorTests(BaseTestCase):
     def setUp(self):
         super().setUp()
@@ -47,3 +66,19 @@ class EntrenadorTests(BaseTestCase):
         response = self.client.get('/api/v1/entrenadores/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
+
+    def test_list_entrenadores_enriquece_personas_en_lote(self):
+        self.authenticate('ADMIN')
+        for i in range(3):
+            Entrenador.objects.create(
+                persona_external=f'uuid-{i}', especialidad='Baloncesto', club_asignado='Club A'
+            )
+        personas = {f'uuid-{i}': {'first_name': f'Nombre {i}'} for i in range(3)}
+        with patch('basketball.serializers.get_personas_from_user_module', return_value=personas) as batch, \
+                patch('basketball.serializers.get_persona_from_user_module') as single:
+            response = self.client.get('/api/v1/entrenadores/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        batch.assert_called_once()
+        self.assertEqual(sorted(batch.call_args[0][0]), ['uuid-0', 'uuid-1', 'uuid-2'])
+        single.assert_not_called()
+        self.assertEqual({e['nombre'] for e in response.data}, {'Nombre 0', 'Nombre 1', 'Nombre 2'})
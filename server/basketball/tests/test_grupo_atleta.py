@@ -1,6 +1,13 @@
+import tempfile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from .test_entrenador import BaseTestCase
-from ..models import GrupoAtleta, Entrenador
+from ..checks import check_cache_respuestas
+from ..controllers import cache_respuestas
+from ..models import GrupoAtleta, Entrenador, Atleta
+from ..services.asignacion_grupos import IndiceRangosEdad
 
 class GrupoAtletaTests(BaseTestCase):
     def setUp(self):
@@ -28,3 +35,216 @@ class GrupoAtletaTests(BaseTestCase):
         self.authenticate('PASANTE')
         response = self.client.post('/api/v1/grupos-atletas/', self.grupo_data)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_atletas_de_grupo_consultas_constantes(self):
+        self.authenticate('ADMIN')
+        grupo = GrupoAtleta.objects.create(**{**self.grupo_data, 'entrenador': self.entrenador})
+        for i in range(8):
+            atleta = Atleta.objects.create(
+                nombre_atleta='Juan', apellido_atleta=f'Perez {i}', dni=f'dni-{i}',
+                fecha_nacimiento='2012-01-01', edad=12, sexo='M'
+            )
+            atleta.grupos.add(grupo)
+        # Grupo + atletas + prefetch de grupos
+        with self.assertMaxQueries(3):
+            response = self.client.get(f'/api/v1/grupos-atletas/{grupo.pk}/atletas/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 8)
+        self.assertTrue(all(a['grupos'] == [grupo.pk] for a in response.data))
+
+    def test_list_grupos_sin_join_de_entrenador(self):
+        self.authenticate('ADMIN')
+        GrupoAtleta.objects.create(**{**self.grupo_data, 'entrenador': self.entrenador})
+        # El serializer expone entrenador como PK (entrenador_id)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/grupos-atletas/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['entrenador'], self.entrenador.id)
+        self.assertFalse(any('"entrenador"' in q['sql'] for q in context.captured_queries))
+
+    @override_settings(RESPONSE_CACHE_TTL=60)
+    def test_list_grupos_cacheado_por_generacion(self):
+        cache_respuestas.reset_stats()
+        self.authenticate('ADMIN')
+        GrupoAtleta.objects.create(**{**self.grupo_data, 'entrenador': self.entrenador})
+        self.client.get('/api/v1/grupos-atletas/')
+        # Solo el validador del ETag: sin leer ni serializar los grupos
+        with self.assertMaxQueries(1):
+            response = self.client.get('/api/v1/grupos-atletas/')
+        self.assertEqual(len(response.data), 1)
+
+        # Cada rol tiene su propia entrada
+        self.authenticate('ENTRENADOR')
+        self.client.get('/api/v1/grupos-atletas/')
+
+        # Una escritura por el DAO cambia la generación: la siguiente lectura va a la base de datos
+        self.authenticate('ADMIN')
+        response = self.client.post('/api/v1/grupos-atletas/', {**self.grupo_data, 'nombre': 'Grupo B'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.get('/api/v1/grupos-atletas/')
+        self.assertEqual(len(response.data), 2)
+
+        stats = cache_respuestas.stats()['listados']['grupo-atleta']
+        self.assertEqual((stats['hits'], stats['misses']), (1, 3))
+        self.assertEqual(stats['hit_ratio'], 0.25)
+        self.assertEqual(self.client.get('/api/v1/metrics/response-cache/').data['hits'], 1)
+
+    def test_cache_en_memoria_local_avisa_en_check(self):
+        self.assertEqual(check_cache_respuestas(None), [])
+        with override_settings(RESPONSE_CACHE_TTL=60, RESPONSE_CACHE_BACKEND=None):
+            self.assertEqual([w.id for w in check_cache_respuestas(None)], ['basketball.W001'])
+
+    def test_list_grupos_cache_en_archivo(self):
+        with tempfile.TemporaryDirectory() as directorio, override_settings(
+            CACHES={
+                'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'archivo': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directorio},
+            },
+            RESPONSE_CACHE_BACKEND='archivo',
+            RESPONSE_CACHE_TTL=60,
+        ):
+            cache_respuestas.reset_stats()
+            self.authenticate('ADMIN')
+            grupo = GrupoAtleta.objects.create(**{**self.grupo_data, 'entrenador': self.entrenador})
+            self.client.get('/api/v1/grupos-atletas/')
+            self.client.get('/api/v1/grupos-atletas/')
+            self.client.delete(f'/api/v1/grupos-atletas/{grupo.pk}/')
+            response = self.client.get('/api/v1/grupos-atletas/')
+            self.assertEqual(response.data, [])
+            self.assertEqual(cache_respuestas.stats()['hits'], 1)
+
+    def _crear_atletas(self, cantidad):
+        Atleta.objects.bulk_create([
+            Atleta(nombre_atleta='Juan', apellido_atleta=f'Perez {i}', dni=f'dni-{i}',
+                   fecha_nacimiento='2012-01-01', edad=12, sexo='M')
+            for i in range(cantidad)
+        ])
+        return list(Atleta.objects.order_by('id').values_list('id', flat=True))
+
+    def test_membresias_en_lote(self):
+        self.authenticate('ENTRENADOR')
+        origen = GrupoAtleta.objects.create(**{**self.grupo_data, 'entrenador': self.entrenador})
+        destino = GrupoAtleta.objects.create(**{**self.grupo_data, 'nombre': 'Grupo B', 'entrenador': self.entrenador})
+        ids = self._crear_atletas(1000)
+        origen.atletas.set(ids)
+        self.client.get('/api/v1/atletas/', {'page': 1})
+
+        # Reasignación de temporada: 1000 atletas de un grupo a otro en pocas consultas
+        payload = {
+            'agregar': [{'atleta': i, 'grupo': destino.pk} for i in ids],
+            'quitar': [{'atleta': i, 'grupo': origen.pk} for i in ids],
+        }
+        with self.assertMaxQueries(10):
+            response = self.client.post('/api/v1/atletas/membresias/', payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'agregadas': 1000, 'quitadas': 1000})
+        self.assertEqual(destino.atletas.count(), 1000)
+        self.assertEqual(origen.atletas.count(), 0)
+        # Los listados cacheados de atletas ven el cambio
+        response = self.client.get('/api/v1/atletas/', {'page': 1})
+        self.assertEqual(response.data['items'][0]['grupos'], [destino.pk])
+
+        # Repetir la misma operación no cambia nada
+        response = self.client.post('/api/v1/atletas/membresias/', payload, format='json')
+        self.assertEqual(response.data, {'agregadas': 0, 'quitadas': 0})
+
+    def test_membresias_invalidas_no_aplican_nada(self):
+        self.authenticate('ADMIN')
+        grupo = GrupoAtleta.objects.create(**{**self.grupo_data, 'entrenador': self.entrenador})
+        ids = self._crear_atletas(2)
+        response = self.client.post('/api/v1/atletas/membresias/', {
+            'agregar': [{'atleta': ids[0], 'grupo': grupo.pk}, {'atleta': 9999, 'grupo': grupo.pk}],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('9999', response.data['error'])
+        self.assertEqual(grupo.atletas.count(), 0)
+
+        response = self.client.post('/api/v1/atletas/membresias/', {
+            'agregar': [{'atleta': ids[0], 'grupo': grupo.pk}],
+            'quitar': [{'atleta': ids[0], 'grupo': grupo.pk}],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.authenticate('PASANTE')
+        response = self.client.post('/api/v1/atletas/membresias/', {'agregar': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_asignar_atletas_reemplaza_por_diferencia(self):
+        self.authenticate('ADMIN')
+        grupo = GrupoAtleta.objects.create(**{**self.grupo_data, 'entrenador': self.entrenador})
+        ids = self._crear_atletas(4)
+        grupo.atletas.set(ids[:3])
+        response = self.client.post(f'/api/v1/grupos-atletas/{grupo.pk}/asignar_atletas/',
+                                    {'atletas': ids[2:] + [9999]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(grupo.atletas.values_list('id', flat=True)), set(ids[2:]))
+
+    def test_asignacion_por_edad_entrenador(self):
+        GrupoAtleta.objects.create(**{**self.grupo_data, 'entrenador': self.entrenador})
+        Atleta.objects.create(nombre_atleta='Juan', apellido_atleta='Perez', dni='dni-0',
+                              fecha_nacimiento='2012-01-01', edad=12, sexo='M')
+        self.authenticate('ENTRENADOR')
+        response = self.client.post('/api/v1/grupos-atletas/asignacion_por_edad/', {'aplicar': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['asignados'], 1)
+        self.authenticate('PASANTE')
+        response = self.client.post('/api/v1/grupos-atletas/asignacion_por_edad/', {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_asignacion_por_edad(self):
+        self.authenticate('ADMIN')
+        crear = lambda nombre, minima, maxima, **extra: GrupoAtleta.objects.create(
+            **{**self.grupo_data, 'nombre': nombre, 'rango_edad_minima': minima,
+               'rango_edad_maxima': maxima, 'entrenador': self.entrenador, **extra}
+        )
+        amplio = crear('Amplio', 8, 16)
+        sub12_a = crear('Sub 12 A', 11, 12)
+        sub12_b = crear('Sub 12 B', 11, 12)
+        crear('Inactivo', 12, 12, estado=False)
+        edades = [12, 12, 12, 14, 20]
+        Atleta.objects.bulk_create([
+            Atleta(nombre_atleta='Juan', apellido_atleta=f'Perez {i}', dni=f'dni-{i}',
+                   fecha_nacimiento='2012-01-01', edad=edad, sexo='M')
+            for i, edad in enumerate(edades)
+        ])
+        ids = list(Atleta.objects.order_by('id').values_list('id', flat=True))
+        Atleta.objects.create(nombre_atleta='Ya', apellido_atleta='Asignado', dni='dni-x',
+                              fecha_nacimiento='2012-01-01', edad=12, sexo='M').grupos.add(amplio)
+
+        # Simulación: no escribe nada
+        response = self.client.post('/api/v1/grupos-atletas/asignacion_por_edad/', {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['aplicado'])
+        self.assertEqual(Atleta.objects.filter(grupos__isnull=True).count(), 5)
+        # El rango más angosto gana y los grupos iguales se reparten
+        esperadas = [
+            {'atleta': ids[0], 'grupo': sub12_a.pk},
+            {'atleta': ids[1], 'grupo': sub12_b.pk},
+            {'atleta': ids[2], 'grupo': sub12_a.pk},
+            {'atleta': ids[3], 'grupo': amplio.pk},
+        ]
+        self.assertEqual(response.data['asignaciones'], esperadas)
+        self.assertEqual(response.data['atletas_sin_grupo_compatible'], [ids[4]])
+        self.assertEqual([g['nuevos'] for g in response.data['grupos']], [1, 2, 1])
+
+        with self.assertMaxQueries(12):
+            response = self.client.post('/api/v1/grupos-atletas/asignacion_por_edad/',
+                                        {'aplicar': True}, format='json')
+        self.assertTrue(response.data['aplicado'])
+        self.assertEqual(response.data['asignados'], 4)
+        self.assertEqual(set(sub12_a.atletas.values_list('id', flat=True)), {ids[0], ids[2]})
+        self.assertEqual(list(Atleta.objects.filter(grupos__isnull=True).values_list('id', flat=True)), [ids[4]])
+
+        # Repetir no asigna de nuevo
+        response = self.client.post('/api/v1/grupos-atletas/asignacion_por_edad/', {'aplicar': True}, format='json')
+        self.assertEqual(response.data['asignados'], 0)
+
+    def test_indice_rangos_edad(self):
+        indice = IndiceRangosEdad([(1, 8, 16), (2, 11, 12), (3, 14, 14), (4, 30, 20)])
+        self.assertEqual(indice.candidatos(7), [])
+        self.assertEqual(indice.candidatos(8), [1])
+        self.assertEqual(indice.candidatos(12), [2, 1])
+        self.assertEqual(indice.candidatos(13), [1])
+        self.assertEqual(indice.candidatos(14), [3, 1])
+        self.assertEqual(indice.candidatos(17), [])
+        self.assertEqual(indice.candidatos(25), [])
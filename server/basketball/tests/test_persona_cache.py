@@ -0,0 +1,63 @@
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+from ..connection.persona_cache import PersonaCache, MISS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class PersonaCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = PersonaCache(max_size=2, ttl=10, negative_ttl=5, time_func=self.clock)
+
+    def test_get_miss_y_hit(self):
+        self.assertIs(self.cache.get('uuid-1'), MISS)
+        self.cache.set('uuid-1', {'first_name': 'Ana'})
+        self.assertEqual(self.cache.get('uuid-1'), {'first_name': 'Ana'})
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_expira_por_ttl(self):
+        self.cache.set('uuid-1', {'first_name': 'Ana'})
+        self.clock.now = 11
+        self.assertIs(self.cache.get('uuid-1'), MISS)
+
+    def test_cache_negativo(self):
+        self.cache.set_not_found('uuid-404')
+        self.assertIsNone(self.cache.get('uuid-404'))
+        self.clock.now = 6
+        self.assertIs(self.cache.get('uuid-404'), MISS)
+
+    def test_evict_lru(self):
+        self.cache.set('uuid-1', {})
+        self.cache.set('uuid-2', {})
+        self.cache.get('uuid-1')
+        self.cache.set('uuid-3', {})
+        self.assertIs(self.cache.get('uuid-2'), MISS)
+        self.assertEqual(self.cache.get('uuid-1'), {})
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_get_stale_tras_expirar(self):
+        cache = PersonaCache(ttl=10, stale_ttl=20, time_func=self.clock)
+        cache.set('uuid-1', {'first_name': 'Ana'})
+        self.clock.now = 15
+        self.assertIs(cache.get('uuid-1'), MISS)
+        self.assertEqual(cache.get_stale('uuid-1'), {'first_name': 'Ana'})
+        self.clock.now = 31
+        self.assertIs(cache.get_stale('uuid-1'), MISS)
+
+    def test_backend_django(self):
+        backend = LocMemCache('personas-test', {})
+        cache = PersonaCache(backend=backend)
+        cache.set('uuid-1', {'first_name': 'Ana'})
+        cache.set_not_found('uuid-404')
+        otro_proceso = PersonaCache(backend=backend)
+        self.assertEqual(otro_proceso.get('uuid-1'), {'first_name': 'Ana'})
+        self.assertIsNone(otro_proceso.get('uuid-404'))
+        self.assertIs(otro_proceso.get('uuid-2'), MISS)
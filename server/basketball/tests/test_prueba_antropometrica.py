@@ -0,0 +1,135 @@
+from decimal import Decimal
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework import status
+from .test_entrenador import BaseTestCase
+from ..dao.prueba_antropometrica_dao import PruebaAntropometricaDAO
+from ..models import Atleta, Entrenador, GrupoAtleta, PruebaAntropometrica
+
+
+class PruebaAntropometricaTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        entrenador = Entrenador.objects.create(persona_external='uuid-e', especialidad='B', club_asignado='C')
+        self.grupo = GrupoAtleta.objects.create(
+            nombre='Grupo A', rango_edad_minima=10, rango_edad_maxima=20, categoria='Juvenil', entrenador=entrenador
+        )
+        self.atletas = []
+        for i, nombre in enumerate(['Ana', 'Luis', 'Sin Pruebas']):
+            atleta = Atleta.objects.create(
+                nombre_atleta=nombre, apellido_atleta=f'Apellido {i}', dni=f'dni-{i}',
+                fecha_nacimiento='2008-01-01', edad=16, sexo='F'
+            )
+            atleta.grupos.add(self.grupo)
+            self.atletas.append(atleta)
+
+    def _crear_prueba(self, atleta, fecha, peso, estatura, **extra):
+        return PruebaAntropometrica.objects.create(
+            atleta=atleta, fecha_registro=fecha, peso=Decimal(peso), estatura=Decimal(estatura), **extra
+        )
+
+    def test_estadisticas_grupo_en_una_consulta(self):
+        ana, luis, _ = self.atletas
+        self._crear_prueba(ana, '2024-01-01', '50', '160', envergadura=Decimal('158'))
+        self._crear_prueba(ana, '2024-03-01', '54', '162', envergadura=Decimal('161'))
+        self._crear_prueba(luis, '2024-02-01', '70', '175', porcentaje_grasa=Decimal('12.5'))
+        self._crear_prueba(luis, '2024-04-01', '99', '175', estado=False)
+
+        with self.assertNumQueries(1):
+            stats = PruebaAntropometricaDAO().get_estadisticas_grupo(self.grupo.id)
+
+        por_atleta = {a['atleta_id']: a for a in stats['atletas']}
+        self.assertEqual(len(por_atleta), 3)
+        self.assertEqual(por_atleta[ana.id]['total_pruebas'], 2)
+        self.assertEqual(por_atleta[ana.id]['peso']['min'], Decimal('50'))
+        self.assertEqual(por_atleta[ana.id]['peso']['max'], Decimal('54'))
+        self.assertAlmostEqual(float(por_atleta[ana.id]['peso']['desviacion_estandar']), 2.0)
+        self.assertEqual(por_atleta[ana.id]['peso']['ultima'], Decimal('54'))
+        self.assertEqual(por_atleta[ana.id]['envergadura']['ultima'], Decimal('161'))
+        # La prueba desactivada no cuenta
+        self.assertEqual(por_atleta[luis.id]['total_pruebas'], 1)
+        self.assertEqual(por_atleta[luis.id]['peso']['ultima'], Decimal('70'))
+        self.assertEqual(por_atleta[self.atletas[2].id]['total_pruebas'], 0)
+
+        totales = stats['totales']
+        self.assertEqual(totales['atletas'], 3)
+        self.assertEqual(totales['atletas_con_pruebas'], 2)
+        self.assertEqual(totales['peso']['min'], Decimal('54'))
+        self.assertEqual(totales['peso']['max'], Decimal('70'))
+        self.assertAlmostEqual(totales['peso']['promedio'], 62)
+        self.assertAlmostEqual(totales['peso']['desviacion_estandar'], 8)
+        self.assertEqual(totales['porcentaje_grasa']['max'], Decimal('12.5'))
+
+    def test_estadisticas_grupo_endpoint(self):
+        self._crear_prueba(self.atletas[0], '2024-01-01', '50', '160')
+        self.authenticate('ENTRENADOR')
+        response = self.client.get('/api/v1/pruebas-antropometricas/estadisticas_grupo/', {'grupo': self.grupo.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['totales']['atletas_con_pruebas'], 1)
+        response = self.client.get('/api/v1/pruebas-antropometricas/estadisticas_grupo/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_estadisticas_atleta_en_una_consulta(self):
+        self._crear_prueba(self.atletas[0], '2024-01-01', '50', '160')
+        self._crear_prueba(self.atletas[0], '2024-02-01', '52', '161')
+        with self.assertNumQueries(1):
+            stats = PruebaAntropometricaDAO().get_estadisticas_atleta(self.atletas[0].id)
+        self.assertEqual(stats['total_pruebas'], 2)
+        self.assertEqual(stats['peso_max'], Decimal('52'))
+        self.assertIsNone(PruebaAntropometricaDAO().get_estadisticas_atleta(self.atletas[2].id))
+
+
+class CargaMasivaAntropometricaTests(BaseTestCase):
+    # (peso, estatura, altura_sentado): incluye valores con redondeo en el segundo decimal
+    MEDIDAS = [
+        ('70.00', '175.00', '91.00'), ('45.35', '152.40', None), ('88.88', '199.99', '101.11'),
+        ('30.01', '130.03', '70.07'), ('62.50', '166.66', '83.33'), ('99.99', '100.01', None),
+    ]
+
+    def setUp(self):
+        super().setUp()
+        self.atleta = Atleta.objects.create(
+            nombre_atleta='Ana', apellido_atleta='X', dni='111', fecha_nacimiento='2008-01-01', edad=16, sexo='F'
+        )
+
+    def _datos(self, peso, estatura, altura_sentado):
+        datos = {'atleta_id': self.atleta.id, 'fecha_registro': '2024-01-01',
+                 'peso': Decimal(peso), 'estatura': Decimal(estatura)}
+        if altura_sentado:
+            datos['altura_sentado'] = Decimal(altura_sentado)
+        return datos
+
+    def _indices(self, ids):
+        return list(PruebaAntropometrica.objects.filter(id__in=ids).order_by('id').values_list(
+            'indice_masa_corporal', 'indice_cornico'
+        ))
+
+    def test_bulk_create_calcula_los_mismos_indices_que_save(self):
+        individuales = [PruebaAntropometrica.objects.create(**self._datos(*m)).id for m in self.MEDIDAS]
+        with self.assertNumQueries(1):
+            masivas = PruebaAntropometricaDAO().bulk_create([self._datos(*m) for m in self.MEDIDAS])
+        esperado = self._indices(individuales)
+        self.assertEqual(self._indices([p.id for p in masivas]), esperado)
+        self.assertEqual(esperado[0], (Decimal('22.86'), Decimal('52.00')))
+        self.assertIsNone(esperado[1][1])
+
+    def test_importar_calcula_indices_y_respeta_los_del_archivo(self):
+        self.authenticate('ENTRENADOR')
+        contenido = (
+            'dni,fecha_registro,peso,estatura,altura_sentado,indice_masa_corporal\n'
+            '111,2024-01-01,70,175,91,\n'
+            '111,2024-01-02,70,175,,30.5\n'
+            '111,2024-01-03,70,1.75,,\n'
+            '111,2024-01-04,0,175,,\n'
+        )
+        archivo = SimpleUploadedFile('medidas.csv', contenido.encode(), content_type='text/csv')
+        response = self.client.post('/api/v1/pruebas-antropometricas/importar/', {'archivo': archivo},
+                                    format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['importadas'], response.data['con_errores']), (2, 2))
+        errores = {e['fila']: sorted(e['errores']) for e in response.data['errores']}
+        self.assertEqual(errores, {4: ['indice_masa_corporal'], 5: ['peso']})
+        self.assertEqual(
+            list(PruebaAntropometrica.objects.order_by('fecha_registro').values_list('indice_masa_corporal', flat=True)),
+            [Decimal('22.86'), Decimal('30.50')]
+        )
+
@@ -0,0 +1,383 @@
+import csv
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from importlib.util import find_spec
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import override_settings
+from rest_framework import status
+from .test_entrenador import BaseTestCase
+from ..dao.atleta_dao import AtletaDAO
+from ..dao.prueba_fisica_dao import PruebaFisicaDAO
+from ..models import Atleta, PruebaFisica, GrupoAtleta, Entrenador, RankingPruebaFisica
+
+
+class PruebaFisicaTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.atleta = Atleta.objects.create(
+            nombre_atleta='Juan', apellido_atleta='Perez', dni='1234567890',
+            fecha_nacimiento='2005-01-01', edad=18, sexo='M'
+        )
+
+    def _crear_pruebas(self, cantidad):
+        # Varias pruebas comparten fecha para ejercitar el desempate por id
+        for i in range(cantidad):
+            PruebaFisica.objects.create(
+                atleta=self.atleta, fecha_registro=date(2024, 1, 1) + timedelta(days=i // 3),
+                tipo_prueba='VELOCIDAD', nombre_prueba='Sprint 20m',
+                resultado=3 + i, unidad_medida='s'
+            )
+
+    def test_list_pruebas_por_cursor(self):
+        self.authenticate('ADMIN')
+        self._crear_pruebas(7)
+        esperado = list(PruebaFisica.objects.order_by('-fecha_registro', 'id').values_list('id', flat=True))
+
+        vistos = []
+        params = {'cursor': '', 'page_size': 3}
+        while True:
+            response = self.client.get('/api/v1/pruebas-fisicas/', params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('total', response.data)
+            vistos += [p['id'] for p in response.data['items']]
+            if not response.data['has_next']:
+                break
+            params['cursor'] = response.data['next_cursor']
+        self.assertEqual(vistos, esperado)
+
+    def test_list_pruebas_por_cursor_con_total(self):
+        self.authenticate('ADMIN')
+        self._crear_pruebas(2)
+        response = self.client.get('/api/v1/pruebas-fisicas/', {'cursor': '', 'include_total': 'true'})
+        self.assertEqual(response.data['total'], 2)
+
+    def test_list_pruebas_cursor_invalido(self):
+        self.authenticate('ADMIN')
+        response = self.client.get('/api/v1/pruebas-fisicas/', {'cursor': 'no-es-un-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_exportar_csv_en_streaming_con_filtros(self):
+        self.authenticate('ENTRENADOR')
+        self._crear_pruebas(5)
+        PruebaFisica.objects.create(
+            atleta=self.atleta, fecha_registro=date(2024, 1, 1), tipo_prueba='FUERZA',
+            nombre_prueba='Salto', resultado=40, unidad_medida='cm', observaciones='con, coma'
+        )
+        # Bloques de 2 filas: el resultado no depende del tamaño del bloque
+        with override_settings(EXPORTACION_CHUNK_SIZE=2):
+            response = self.client.get('/api/v1/pruebas-fisicas/exportar/', {'tipo': 'velocidad'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="pruebas_fisicas.csv"')
+        filas = list(csv.DictReader(StringIO(b''.join(response.streaming_content).decode())))
+        esperado = PruebaFisica.objects.filter(tipo_prueba='VELOCIDAD').order_by('-fecha_registro', 'id')
+        self.assertEqual([int(f['id']) for f in filas], list(esperado.values_list('id', flat=True)))
+        self.assertEqual(filas[0]['atleta__dni'], '1234567890')
+
+        response = self.client.get('/api/v1/pruebas-fisicas/exportar/', {
+            'formato': 'ndjson', 'fecha_desde': '2024-01-01', 'fecha_hasta': '2024-01-01', 'tipo': 'FUERZA'
+        })
+        filas = [json.loads(linea) for linea in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(filas), 1)
+        self.assertEqual((filas[0]['resultado'], filas[0]['observaciones']), ('40.00', 'con, coma'))
+
+    def test_exportar_parametros_invalidos(self):
+        self.authenticate('ENTRENADOR')
+        for params in ({'fecha_desde': '01/01/2024'}, {'grupo': 'x'}, {'formato': 'xml'}):
+            response = self.client.get('/api/v1/pruebas-fisicas/exportar/', params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def _crear_prueba(self, atleta, tipo, resultado):
+        PruebaFisica.objects.create(
+            atleta=atleta, fecha_registro=date(2024, 1, 1), tipo_prueba=tipo,
+            nombre_prueba='Prueba', resultado=resultado, unidad_medida='u'
+        )
+
+    def test_estadisticas_atleta_en_una_consulta(self):
+        for tipo, resultado in [('VELOCIDAD', 3), ('VELOCIDAD', 5), ('FUERZA', 40)]:
+            self._crear_prueba(self.atleta, tipo, resultado)
+        with self.assertNumQueries(1):
+            estadisticas = PruebaFisicaDAO().get_estadisticas_atleta(self.atleta.id)
+        self.assertEqual(estadisticas, {
+            'FUERZA': {'total': 1, 'resultado_min': Decimal('40'), 'resultado_max': Decimal('40'),
+                       'resultado_promedio': Decimal('40')},
+            'VELOCIDAD': {'total': 2, 'resultado_min': Decimal('3'), 'resultado_max': Decimal('5'),
+                          'resultado_promedio': Decimal('4')},
+        })
+        self.assertIsNone(PruebaFisicaDAO().get_estadisticas_atleta(999))
+
+    def test_estadisticas_por_lote_y_grupo(self):
+        otro = Atleta.objects.create(
+            nombre_atleta='Ana', apellido_atleta='Lopez', dni='999', fecha_nacimiento='2006-01-01',
+            edad=17, sexo='F'
+        )
+        self._crear_prueba(self.atleta, 'VELOCIDAD', 3)
+        self._crear_prueba(otro, 'FUERZA', 50)
+        dao = PruebaFisicaDAO()
+        with self.assertNumQueries(1):
+            lote = dao.get_estadisticas_atletas([self.atleta.id, otro.id, 999])
+        self.assertEqual(lote[self.atleta.id], dao.get_estadisticas_atleta(self.atleta.id))
+        self.assertEqual(lote[otro.id]['FUERZA']['total'], 1)
+        self.assertIsNone(lote[999])
+
+        entrenador = Entrenador.objects.create(persona_external='uuid-e', especialidad='B', club_asignado='C')
+        grupo = GrupoAtleta.objects.create(
+            nombre='G', rango_edad_minima=10, rango_edad_maxima=20, categoria='Juvenil', entrenador=entrenador
+        )
+        otro.grupos.add(grupo)
+        self.authenticate('ENTRENADOR')
+        response = self.client.get('/api/v1/pruebas-fisicas/estadisticas/', {'grupo': grupo.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data), [otro.id])
+        response = self.client.get('/api/v1/pruebas-fisicas/estadisticas/', {'atletas': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class RankingPruebaFisicaTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        entrenador = Entrenador.objects.create(persona_external='uuid-e', especialidad='B', club_asignado='C')
+        self.grupo = GrupoAtleta.objects.create(
+            nombre='G', rango_edad_minima=10, rango_edad_maxima=20, categoria='Juvenil', entrenador=entrenador
+        )
+        self.atletas = {}
+        for nombre, sexo, edad in [('Ana', 'F', 14), ('Luis', 'M', 14), ('Eva', 'F', 17)]:
+            self.atletas[nombre] = Atleta.objects.create(
+                nombre_atleta=nombre, apellido_atleta='X', dni=f'dni-{nombre}',
+                fecha_nacimiento='2008-01-01', edad=edad, sexo=sexo
+            )
+        self.atletas['Ana'].grupos.add(self.grupo)
+        self.atletas['Eva'].grupos.add(self.grupo)
+
+    def _registrar(self, nombre, resultado, prueba='Sprint 20m', tipo='VELOCIDAD', dia=1):
+        with self.captureOnCommitCallbacks(execute=True):
+            return PruebaFisica.objects.create(
+                atleta=self.atletas[nombre], fecha_registro=date(2024, 1, dia), tipo_prueba=tipo,
+                nombre_prueba=prueba, resultado=Decimal(resultado), unidad_medida='s'
+            )
+
+    def _ranking(self, **params):
+        self.authenticate('ENTRENADOR')
+        response = self.client.get('/api/v1/pruebas-fisicas/ranking/', {'nombre_prueba': 'Sprint 20m', **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(r['nombre_atleta'], r['posicion'], r['resultado']) for r in response.data]
+
+    def test_velocidad_menor_es_mejor_y_un_intento_por_atleta(self):
+        self._registrar('Ana', '3.40')
+        self._registrar('Ana', '3.10', dia=2)
+        self._registrar('Ana', '3.90', dia=3)
+        self._registrar('Luis', '3.20')
+        self._registrar('Eva', '3.50')
+        self.assertEqual(self._ranking(), [('Ana', 1, '3.10'), ('Luis', 2, '3.20'), ('Eva', 3, '3.50')])
+
+    def test_mayor_es_mejor_y_direccion_configurable(self):
+        for nombre, resultado in [('Ana', '30'), ('Luis', '45')]:
+            self._registrar(nombre, resultado, prueba='Salto', tipo='FUERZA')
+        self.authenticate('ENTRENADOR')
+        response = self.client.get('/api/v1/pruebas-fisicas/ranking/', {'nombre_prueba': 'Salto'})
+        self.assertEqual([r['nombre_atleta'] for r in response.data], ['Luis', 'Ana'])
+        with override_settings(RANKING_DIRECCION_POR_PRUEBA={'Salto': 'ASC'}):
+            call_command('recalcular_rankings', '--prueba', 'Salto', stdout=StringIO())
+        response = self.client.get('/api/v1/pruebas-fisicas/ranking/', {'nombre_prueba': 'Salto'})
+        self.assertEqual([r['nombre_atleta'] for r in response.data], ['Ana', 'Luis'])
+
+    def test_particiones_por_sexo_edad_y_grupo(self):
+        self._registrar('Ana', '3.40')
+        self._registrar('Luis', '3.20')
+        self._registrar('Eva', '3.10')
+        self.assertEqual(self._ranking(sexo='F'), [('Eva', 1, '3.10'), ('Ana', 2, '3.40')])
+        self.assertEqual(self._ranking(edad=15), [('Luis', 1, '3.20'), ('Ana', 2, '3.40')])
+        self.assertEqual(self._ranking(grupo=self.grupo.id), [('Eva', 1, '3.10'), ('Ana', 2, '3.40')])
+        self.authenticate('ENTRENADOR')
+        response = self.client.get('/api/v1/pruebas-fisicas/ranking/',
+                                   {'nombre_prueba': 'Sprint 20m', 'sexo': 'F', 'grupo': self.grupo.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_limite_invalido(self):
+        self._registrar('Ana', '3.40')
+        self.authenticate('ENTRENADOR')
+        for limite in ('-1', '0', 'abc'):
+            response = self.client.get('/api/v1/pruebas-fisicas/ranking/',
+                                       {'nombre_prueba': 'Sprint 20m', 'limite': limite})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, limite)
+            self.assertEqual(response.data['error'], 'limite debe ser un entero mayor o igual a 1')
+        self.assertEqual(self._ranking(limite=1), [('Ana', 1, '3.40')])
+
+    def test_se_actualiza_al_guardar_y_desactivar(self):
+        prueba = self._registrar('Luis', '3.20')
+        self._registrar('Ana', '3.40')
+        self.assertEqual(self._ranking()[0][0], 'Luis')
+        prueba.estado = False
+        with self.captureOnCommitCallbacks(execute=True):
+            prueba.save()
+        self.assertEqual(self._ranking(), [('Ana', 1, '3.40')])
+        self.assertFalse(RankingPruebaFisica.objects.filter(atleta=self.atletas['Luis']).exists())
+
+    def test_lectura_en_una_consulta(self):
+        for nombre in self.atletas:
+            self._registrar(nombre, '3.00')
+        self.assertEqual([p for _, p, _ in self._ranking()], [1, 1, 1])
+        with self.assertMaxQueries(1):
+            self.client.get('/api/v1/pruebas-fisicas/ranking/', {'nombre_prueba': 'Sprint 20m'})
+
+    def test_cambios_del_atleta_recalculan_sus_particiones(self):
+        for nombre, resultado in [('Ana', '3.40'), ('Luis', '3.20'), ('Eva', '3.10')]:
+            self._registrar(nombre, resultado)
+        general = set(RankingPruebaFisica.objects.filter(particion='general').values_list('pk', flat=True))
+        luis = self.atletas['Luis']
+        luis.sexo, luis.edad = 'F', 17
+        with self.captureOnCommitCallbacks(execute=True):
+            luis.save()
+        self.assertEqual(self._ranking(sexo='F'), [('Eva', 1, '3.10'), ('Luis', 2, '3.20'), ('Ana', 3, '3.40')])
+        self.assertEqual(self._ranking(sexo='M'), [])
+        self.assertEqual(self._ranking(edad=16), [('Eva', 1, '3.10'), ('Luis', 2, '3.20')])
+        self.assertEqual(self._ranking(edad=14), [('Ana', 1, '3.40')])
+        # Las particiones que no cambian no se reescriben
+        self.assertEqual(set(RankingPruebaFisica.objects.filter(particion='general').values_list('pk', flat=True)), general)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.atletas['Eva'].grupos.remove(self.grupo)
+        self.assertEqual(self._ranking(grupo=self.grupo.id), [('Ana', 1, '3.40')])
+        with self.captureOnCommitCallbacks(execute=True):
+            AtletaDAO().actualizar_grupos(agregar=[(luis.pk, self.grupo.pk)])
+        self.assertEqual(self._ranking(grupo=self.grupo.id), [('Luis', 1, '3.20'), ('Ana', 2, '3.40')])
+
+        # Todos nacieron el 2008-01-01: a mediados de 2026 pasan a la banda de 18
+        with self.captureOnCommitCallbacks(execute=True):
+            AtletaDAO().recalcular_edades(date(2026, 6, 1))
+        self.assertEqual(self._ranking(edad=18), [('Eva', 1, '3.10'), ('Luis', 2, '3.20'), ('Ana', 3, '3.40')])
+        self.assertEqual(self._ranking(edad=16), [])
+        self.assertEqual(self._ranking(edad=14), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AtletaDAO().soft_delete(self.atletas['Eva'].pk)
+        self.assertEqual(self._ranking(), [('Luis', 1, '3.20'), ('Ana', 2, '3.40')])
+        self.assertFalse(RankingPruebaFisica.objects.filter(atleta=self.atletas['Eva']).exists())
+
+
+class ImportacionPruebaFisicaTests(BaseTestCase):
+    ENCABEZADO = 'dni,fecha_registro,tipo_prueba,nombre_prueba,resultado,unidad_medida,observaciones\n'
+
+    def setUp(self):
+        super().setUp()
+        for dni, nombre in [('111', 'Ana'), ('222', 'Luis')]:
+            Atleta.objects.create(
+                nombre_atleta=nombre, apellido_atleta='X', dni=dni, fecha_nacimiento='2008-01-01',
+                edad=16, sexo='F'
+            )
+        Atleta.objects.create(
+            nombre_atleta='Inactivo', apellido_atleta='X', dni='333', fecha_nacimiento='2008-01-01',
+            edad=16, sexo='M', estado=False
+        )
+
+    def _importar(self, contenido, nombre='pruebas.csv'):
+        self.authenticate('ENTRENADOR')
+        archivo = SimpleUploadedFile(nombre, contenido.encode('utf-8-sig'), content_type='text/csv')
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/api/v1/pruebas-fisicas/importar/', {'archivo': archivo}, format='multipart')
+
+    def test_importa_por_lotes_y_reporta_errores_por_fila(self):
+        contenido = self.ENCABEZADO + (
+            '111,2024-03-01,velocidad,Sprint 20m,3.40,s,\n'
+            '222,2024-03-01,VELOCIDAD,Sprint 20m,3.10,s,"con, coma"\n'
+            '\n'
+            '999,2024-03-01,VELOCIDAD,Sprint 20m,3.00,s,\n'
+            '333,2024-03-01,VELOCIDAD,Sprint 20m,3.00,s,\n'
+            '111,01/03/2024,SALTO,Sprint 20m,-1,s,\n'
+            '222,2024-03-02,FUERZA,Salto,45,cm,\n'
+        )
+        # Por lote: una consulta de DNI y un INSERT (más el savepoint de la transacción)
+        with override_settings(IMPORTACION_BATCH_SIZE=2, RANKING_AUTO_REFRESH=False), self.assertMaxQueries(7):
+            response = self._importar(contenido)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {k: response.data[k] for k in ('total_filas', 'importadas', 'con_errores')},
+            {'total_filas': 6, 'importadas': 3, 'con_errores': 3}
+        )
+        errores = {e['fila']: e['errores'] for e in response.data['errores']}
+        self.assertEqual(sorted(errores), [5, 6, 7])
+        self.assertIn('dni', errores[5])
+        self.assertIn('dni', errores[6])
+        self.assertEqual(sorted(errores[7]), ['fecha_registro', 'resultado', 'tipo_prueba'])
+        self.assertGreater(response.data['filas_por_segundo'], 0)
+        self.assertEqual(PruebaFisica.objects.get(atleta__dni='222', tipo_prueba='VELOCIDAD').observaciones,
+                         'con, coma')
+        self.assertFalse(RankingPruebaFisica.objects.exists())
+
+    def test_recalcula_rankings_al_terminar(self):
+        # bulk_create no dispara señales: el ranking se recalcula una vez por prueba
+        self._importar(self.ENCABEZADO + (
+            '111,2024-03-01,VELOCIDAD,Sprint 20m,3.40,s,\n'
+            '222,2024-03-01,VELOCIDAD,Sprint 20m,3.10,s,\n'
+            '222,2024-03-02,FUERZA,Salto,45,cm,\n'
+        ))
+        ranking = RankingPruebaFisica.objects.filter(nombre_prueba='Sprint 20m', particion='general')
+        self.assertEqual(list(ranking.order_by('posicion').values_list('atleta__dni', flat=True)), ['222', '111'])
+        self.assertTrue(RankingPruebaFisica.objects.filter(nombre_prueba='Salto').exists())
+
+    def test_columnas_faltantes_y_formato_no_soportado(self):
+        response = self._importar('dni,resultado\n111,3\n')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fecha_registro', response.data['error'])
+        response = self._importar(self.ENCABEZADO, nombre='pruebas.txt')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(PruebaFisica.objects.exists())
+
+    def test_csv_no_utf8_responde_400(self):
+        # Excel guarda los CSV en Windows-1252: el error aparece en una fila intermedia
+        contenido = (self.ENCABEZADO + '111,2024-03-01,VELOCIDAD,Sprint 20m,3.40,s,\n'
+                     + '222,2024-03-01,VELOCIDAD,Sprint 20m,3.10,s,Buena ejecución\n').encode('cp1252')
+        self.authenticate('ENTRENADOR')
+        archivo = SimpleUploadedFile('pruebas.csv', contenido, content_type='text/csv')
+        with override_settings(IMPORTACION_BATCH_SIZE=1):
+            response = self.client.post('/api/v1/pruebas-fisicas/importar/', {'archivo': archivo}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('UTF-8', response.data['error'])
+        self.assertIn('fila 3', response.data['error'])
+        self.assertFalse(PruebaFisica.objects.exists())
+
+    def test_csv_mal_formado_responde_400(self):
+        contenido = self.ENCABEZADO + '111,2024-03-01,VELOCIDAD,Sprint 20m,3.40,s,"%s"\n' % ('x' * 200000)
+        response = self._importar(contenido)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(PruebaFisica.objects.exists())
+
+    def test_xlsx_corrupto_responde_400(self):
+        self.authenticate('ENTRENADOR')
+        archivo = SimpleUploadedFile('pruebas.xlsx', b'no es un zip', content_type='application/octet-stream')
+        response = self.client.post('/api/v1/pruebas-fisicas/importar/', {'archivo': archivo}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @skipUnless(find_spec('openpyxl'), 'requiere openpyxl')
+    def test_xlsx_dni_numerico(self):
+        from openpyxl import Workbook
+        Atleta.objects.create(nombre_atleta='Cero', apellido_atleta='X', dni='0912345678',
+                              fecha_nacimiento='2008-01-01', edad=16, sexo='M')
+        libro = Workbook()
+        hoja = libro.active
+        hoja.append(self.ENCABEZADO.strip().split(','))
+        # Excel guarda los DNI como números: sin ceros a la izquierda y a veces como float
+        hoja.append([912345678, '2024-03-01', 'VELOCIDAD', 'Sprint 20m', 3.4, 's', None])
+        hoja.append([111.0, '2024-03-01', 'VELOCIDAD', 'Sprint 20m', 3.1, 's', None])
+        contenido = BytesIO()
+        libro.save(contenido)
+        self.authenticate('ENTRENADOR')
+        archivo = SimpleUploadedFile('pruebas.xlsx', contenido.getvalue(), content_type='application/octet-stream')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/v1/pruebas-fisicas/importar/', {'archivo': archivo}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['importadas'], 2, response.data['errores'])
+        self.assertEqual(set(PruebaFisica.objects.values_list('atleta__dni', flat=True)), {'0912345678', '111'})
+
+    def test_error_de_base_de_datos_revierte_todo_el_archivo(self):
+        contenido = self.ENCABEZADO + '111,2024-03-01,VELOCIDAD,Sprint 20m,3.40,s,\n' * 3
+        with override_settings(IMPORTACION_BATCH_SIZE=1), \
+                mock.patch.object(PruebaFisicaDAO, 'bulk_create', side_effect=[[None], IntegrityError('x')]):
+            with self.assertRaises(IntegrityError):
+                self._importar(contenido)
+        self.assertFalse(PruebaFisica.objects.exists())
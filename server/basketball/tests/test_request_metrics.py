@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from .test_entrenador import BaseTestCase
+from .. import request_metrics
+from ..models import Atleta
+from ..request_metrics import RequestMetrics, RouteMetricsStore, build_report
+
+
+class RequestMetricsMiddlewareTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        request_metrics.store.reset()
+        self.addCleanup(request_metrics.store.reset)
+        Atleta.objects.create(
+            nombre_atleta='Juan', apellido_atleta='Perez', dni='123', fecha_nacimiento='2005-01-01',
+            edad=18, sexo='M'
+        )
+
+    def test_agrega_server_timing_y_metricas_por_ruta(self):
+        self.authenticate('ADMIN')
+        for _ in range(3):
+            response = self.client.get('/api/v1/atletas/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+        report = request_metrics.store.report()
+        self.assertEqual(report['GET atleta-list']['count'], 3)
+        self.assertGreaterEqual(report['GET atleta-list']['db_queries']['p50'], 1)
+        self.assertEqual(report['GET atleta-list']['http_calls']['max'], 0)
+
+    def test_agrupa_por_patron_de_url(self):
+        self.authenticate('ADMIN')
+        atleta = Atleta.objects.get()
+        self.client.get(f'/api/v1/atletas/{atleta.pk}/')
+        self.client.get('/api/v1/atletas/999/')
+        self.assertEqual(request_metrics.store.report()['GET atleta-detail']['count'], 2)
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=0)
+    def test_sin_muestreo_no_mide(self):
+        self.authenticate('ADMIN')
+        response = self.client.get('/api/v1/atletas/')
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(request_metrics.store.report(), {})
+
+    def test_persiste_y_reporta_con_management_command(self):
+        self.authenticate('ADMIN')
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(REQUEST_METRICS_DIR=directory, REQUEST_METRICS_FLUSH_INTERVAL=0):
+                self.client.get('/api/v1/atletas/')
+            self.assertEqual(len(os.listdir(directory)), 1)
+
+            out = StringIO()
+            call_command('request_metrics_report', '--dir', directory, '--json', stdout=out)
+            self.assertEqual(json.loads(out.getvalue())['GET atleta-list']['count'], 1)
+
+            call_command('request_metrics_report', '--dir', directory, '--reset', stdout=StringIO())
+            self.assertEqual(os.listdir(directory), [])
+
+
+class RequestMetricsTests(SimpleTestCase):
+    def test_llamadas_http_desde_hilos_cuentan_en_la_peticion(self):
+        metrics = RequestMetrics()
+        token = request_metrics.activate(metrics)
+        try:
+            call = request_metrics.bind_context(lambda _: request_metrics.record_http_call(0.01))
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(call, range(8)))
+        finally:
+            request_metrics.deactivate(token)
+        sample = metrics.sample()
+        self.assertEqual(sample['http_calls'], 8)
+        self.assertAlmostEqual(sample['http_ms'], 80, places=3)
+
+    def test_fuera_de_una_peticion_no_registra(self):
+        request_metrics.record_http_call(0.01)
+
+    def test_percentiles_y_ventana(self):
+        store = RouteMetricsStore(window=100)
+        for i in range(1, 201):
+            store.add('GET ruta', {'total_ms': i, 'db_ms': 0, 'db_queries': 1, 'http_ms': 0, 'http_calls': 0})
+        report = store.report()['GET ruta']
+        self.assertEqual(report['count'], 200)
+        self.assertEqual(report['window'], 100)
+        self.assertEqual(report['total_ms']['p50'], 150)
+        self.assertEqual(report['total_ms']['p99'], 199)
+        self.assertEqual(report['total_ms']['max'], 200)
+
+    def test_fusiona_snapshots_de_varios_procesos(self):
+        sample = {'total_ms': 10, 'db_ms': 1, 'db_queries': 2, 'http_ms': 0, 'http_calls': 0}
+        a, b = RouteMetricsStore(), RouteMetricsStore()
+        a.add('GET ruta', sample)
+        b.add('GET ruta', {**sample, 'total_ms': 30})
+        report = build_report([a.snapshot(), b.snapshot()])
+        self.assertEqual(report['GET ruta']['count'], 2)
+        self.assertEqual(report['GET ruta']['total_ms']['avg'], 20)
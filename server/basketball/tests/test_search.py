@@ -0,0 +1,83 @@
+from datetime import date
+from django.db import connection
+from django.test import TestCase, override_settings
+from ..dao.atleta_dao import AtletaDAO
+from ..dao.prueba_fisica_dao import PruebaFisicaDAO
+from ..dao.search_backends import SEARCH_INDEXES, asegurar_triggers_fts, get_search_backend
+from ..models import Atleta, PruebaFisica
+
+
+class SearchBackendTests(TestCase):
+    TERMINOS = ['pér', 'PEREZ', 'ez', '0917', 'gmail', 'sprint', 'velocidad', 'no-existe', 'a"b', 'lóp']
+
+    @classmethod
+    def setUpTestData(cls):
+        datos = [
+            ('José', 'Pérez', '0917000001', 'jose@gmail.com'),
+            ('Ana', 'Perez', '0917000002', None),
+            ('Luis', 'López', '1100000003', 'luis@mail.com'),
+        ]
+        for nombre, apellido, dni, email in datos:
+            atleta = Atleta.objects.create(
+                nombre_atleta=nombre, apellido_atleta=apellido, dni=dni, email=email,
+                fecha_nacimiento='2008-01-01', edad=16, sexo='M'
+            )
+            PruebaFisica.objects.create(
+                atleta=atleta, fecha_registro=date(2024, 1, 1), tipo_prueba='VELOCIDAD',
+                nombre_prueba='Sprint 20m', resultado=3, unidad_medida='s'
+            )
+
+    def _ids(self, queryset):
+        return sorted(queryset.values_list('id', flat=True))
+
+    def test_backend_por_defecto_en_sqlite(self):
+        self.assertEqual(connection.vendor, 'sqlite')
+        self.assertEqual(get_search_backend().name, 'sqlite_fts5')
+
+    def test_mismos_resultados_que_icontains(self):
+        for termino in self.TERMINOS:
+            fts_atletas = self._ids(AtletaDAO().search_atletas(termino))
+            fts_pruebas = self._ids(PruebaFisicaDAO().search_pruebas(termino))
+            with override_settings(SEARCH_BACKEND='basic'):
+                self.assertEqual(fts_atletas, self._ids(AtletaDAO().search_atletas(termino)), termino)
+                self.assertEqual(fts_pruebas, self._ids(PruebaFisicaDAO().search_pruebas(termino)), termino)
+
+    def test_indice_se_mantiene_al_actualizar_y_eliminar(self):
+        atleta = Atleta.objects.get(dni='1100000003')
+        atleta.apellido_atleta = 'Martínez'
+        atleta.save()
+        self.assertEqual(self._ids(AtletaDAO().search_atletas('martín')), [atleta.id])
+        self.assertEqual(self._ids(AtletaDAO().search_atletas('lópez')), [])
+        atleta.delete()
+        self.assertEqual(self._ids(AtletaDAO().search_atletas('martín')), [])
+
+    def test_usa_la_tabla_fts(self):
+        sql = str(AtletaDAO().search_atletas('perez').query)
+        self.assertIn('atleta_fts', sql)
+        self.assertNotIn('LIKE', sql)
+
+    def _triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE '%_fts_%'")
+            return {nombre for nombre, in cursor.fetchall()}
+
+    def test_triggers_existen_despues_de_migrar(self):
+        esperados = {f'{tabla}_fts_{sufijo}' for tabla in SEARCH_INDEXES for sufijo in ('ai', 'ad', 'au')}
+        self.assertEqual(self._triggers(), esperados)
+        self.assertEqual(asegurar_triggers_fts(), [])
+
+    def test_recrea_triggers_perdidos(self):
+        # Lo que deja una migración que reconstruye la tabla
+        with connection.cursor() as cursor:
+            for sufijo in ('ai', 'ad', 'au'):
+                cursor.execute(f'DROP TRIGGER atleta_fts_{sufijo}')
+        atleta = Atleta.objects.create(
+            nombre_atleta='Marta', apellido_atleta='Quiroga', dni='0100000004',
+            fecha_nacimiento='2008-01-01', edad=16, sexo='F'
+        )
+        self.assertEqual(asegurar_triggers_fts(), ['atleta'])
+        self.assertIn('atleta_fts_au', self._triggers())
+        self.assertEqual(self._ids(AtletaDAO().search_atletas('quiroga')), [atleta.id])
+        atleta.apellido_atleta = 'Zambrano'
+        atleta.save()
+        self.assertEqual(self._ids(AtletaDAO().search_atletas('zambr')), [atleta.id])
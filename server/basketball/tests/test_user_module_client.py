@@ -0,0 +1,120 @@
+import asyncio
+import json
+import socket
+import threading
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from django.test import SimpleTestCase
+import httpx
+import requests
+from ..connection.user_module_client import UserModuleClient
+from ..connection.async_user_module_client import AsyncUserModuleClient
+
+
+class StubUserModuleHandler(BaseHTTPRequestHandler):
+    """Simula los endpoints de login y búsqueda de personas del user_module"""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status_code, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.logins += 1
+        self.server.client_ports.add(self.client_address[1])
+        self._send(200, {'data': {'token': f'Bearer token-{self.server.logins}'}})
+
+    def do_GET(self):
+        self.server.requests += 1
+        self.server.client_ports.add(self.client_address[1])
+        persona_external = self.path.rsplit('/', 1)[-1]
+        if self.headers.get('Authorization') in self.server.expired_tokens:
+            self._send(401, {'message': 'token expirado'})
+        elif persona_external == 'boom':
+            self._send(500, {'message': 'error'})
+        elif persona_external == 'missing':
+            self._send(404, {'message': 'no encontrado'})
+        else:
+            self._send(200, {'data': {'external_id': persona_external, 'first_name': 'Ana'}})
+
+
+class UserModuleClientTests(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubUserModuleHandler)
+        self.server.logins = 0
+        self.server.requests = 0
+        self.server.client_ports = set()
+        self.server.expired_tokens = set()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = UserModuleClient(
+            f'http://127.0.0.1:{self.server.server_port}', pool_size=2, backoff_factor=0
+        )
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_get_persona_reutiliza_conexion(self):
+        for i in range(5):
+            response = self.client.get_persona(f'uuid-{i}')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['data']['external_id'], f'uuid-{i}')
+        self.assertEqual(self.server.logins, 1)
+        self.assertEqual(len(self.server.client_ports), 1)
+
+    def test_reintenta_login_con_401(self):
+        self.client.get_persona('uuid-1')
+        self.server.expired_tokens.add('Bearer token-1')
+        response = self.client.get_persona('uuid-2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.logins, 2)
+
+    def test_no_reintenta_errores_http(self):
+        self.assertEqual(self.client.get_persona('boom').status_code, 500)
+        self.assertEqual(self.client.get_persona('missing').status_code, 404)
+        self.assertEqual(self.server.requests, 2)
+
+    def test_error_de_conexion_tras_reintentos(self):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        client = UserModuleClient(f'http://127.0.0.1:{port}', max_retries=2, backoff_factor=0)
+        with self.assertRaises(requests.ConnectionError):
+            client.login()
+
+    def test_async_get_personas_concurrente(self):
+        async_client = AsyncUserModuleClient(self.client, max_connections=4)
+
+        responses = asyncio.run(async_client.get_personas(['uuid-1', 'uuid-2', 'missing']))
+        self.assertEqual(responses['uuid-1'].json()['data']['external_id'], 'uuid-1')
+        self.assertEqual(responses['uuid-2'].status_code, 200)
+        self.assertEqual(responses['missing'].status_code, 404)
+        self.assertEqual(self.server.logins, 1)
+
+    def test_async_cierra_el_cliente_de_cada_llamada(self):
+        # Como bajo WSGI (async_to_sync): cada llamada corre en un event loop nuevo
+        async_client = AsyncUserModuleClient(self.client, max_connections=4)
+        creados = []
+        original = httpx.AsyncClient
+
+        def crear(*args, **kwargs):
+            creados.append(original(*args, **kwargs))
+            return creados[-1]
+
+        with mock.patch.object(httpx, 'AsyncClient', side_effect=crear):
+            for _ in range(3):
+                responses = asyncio.run(async_client.get_personas(['uuid-1', 'uuid-2']))
+                self.assertEqual(responses['uuid-2'].status_code, 200)
+            asyncio.run(async_client.get_persona('uuid-1', self.client.get_token()))
+        self.assertEqual(len(creados), 4)
+        self.assertTrue(all(client.is_closed for client in creados))
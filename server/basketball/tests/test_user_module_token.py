@@ -0,0 +1,83 @@
+import threading
+import time
+import jwt
+from django.test import SimpleTestCase
+from ..connection.user_module_token import TokenManager
+
+
+class FakeLogin:
+    """Login simulado que emite JWT con exp relativo al reloj del test"""
+
+    def __init__(self, clock, ttl=600, delay=0):
+        self.clock = clock
+        self.ttl = ttl
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            n = self.calls
+        time.sleep(self.delay)
+        token = jwt.encode({'sub': f'login-{n}', 'exp': int(self.clock() + self.ttl)}, 'secret', algorithm='HS256')
+        self.done.set()
+        return token
+
+
+class TokenManagerTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1_000_000.0
+        self.clock = lambda: self.now
+
+    def test_login_single_flight(self):
+        login = FakeLogin(self.clock, delay=0.05)
+        manager = TokenManager(login, time_func=self.clock)
+        tokens = []
+        threads = [threading.Thread(target=lambda: tokens.append(manager.get_token())) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(login.calls, 1)
+        self.assertEqual(len(set(tokens)), 1)
+
+    def test_renueva_en_segundo_plano_antes_de_expirar(self):
+        login = FakeLogin(self.clock, ttl=600)
+        manager = TokenManager(login, refresh_margin=60, time_func=self.clock)
+        first = manager.get_token()
+        login.done.clear()
+        self.now += 570
+        # Dentro del margen: se devuelve el token actual sin esperar el login
+        self.assertEqual(manager.get_token(), first)
+        self.assertTrue(login.done.wait(2))
+        for _ in range(100):
+            if manager.get_token() != first:
+                break
+            time.sleep(0.01)
+        self.assertNotEqual(manager.get_token(), first)
+        self.assertEqual(login.calls, 2)
+
+    def test_token_expirado_hace_login(self):
+        login = FakeLogin(self.clock, ttl=600)
+        manager = TokenManager(login, time_func=self.clock)
+        first = manager.get_token()
+        self.now += 601
+        self.assertNotEqual(manager.get_token(), first)
+        self.assertEqual(login.calls, 2)
+
+    def test_invalidate_solo_descarta_token_vigente(self):
+        login = FakeLogin(self.clock)
+        manager = TokenManager(login, time_func=self.clock)
+        first = manager.get_token()
+        manager.invalidate(first)
+        second = manager.get_token()
+        manager.invalidate(first)
+        self.assertEqual(manager.get_token(), second)
+        self.assertEqual(login.calls, 2)
+
+    def test_token_sin_exp(self):
+        manager = TokenManager(lambda: 'opaque-token', time_func=self.clock)
+        self.assertEqual(manager.get_token(), 'opaque-token')
+        self.assertIsNone(TokenManager.get_expiration('opaque-token'))
@@ -8,6 +8,7 @@ from .controllers.grupo_atleta_controller import GrupoAtletaController
 from .controllers.inscripcion_controller import InscripcionController
 from .controllers.prueba_antropometrica_controller import PruebaAntropometricaController
 from .controllers.prueba_fisica_controller import PruebaFisicaController
+from .views import UserModuleMetricsView, RequestMetricsView, ResponseCacheMetricsView
 
 router = DefaultRouter()
 router.register(r'entrenadores', EntrenadorController, basename='entrenador')
@@ -21,4 +22,7 @@ router.register(r'pruebas-fisicas', PruebaFisicaController, basename='prueba-fis
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('metrics/user-module/', UserModuleMetricsView.as_view(), name='user-module-metrics'),
+    path('metrics/requests/', RequestMetricsView.as_view(), name='request-metrics'),
+    path('metrics/response-cache/', ResponseCacheMetricsView.as_view(), name='response-cache-metrics'),
 ]
@@ -16,6 +16,13 @@ class MockAuthView(APIView):
     authentication_classes = []
     permission_classes = []
 
+    # Contraseña de demo por rol
+    PASSWORDS = {
+        'ADMIN': 'admin123',
+        'ENTRENADOR': 'entrenador123',
+        'PASANTE': 'pasante123',
+    }
+
     def post(self, request):
         username = request.data.get('username')
         password = request.data.get('password')
@@ -26,44 +33,19 @@ class MockAuthView(APIView):
                 'error': 'Usuario y contraseña son requeridos'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        # Buscar usuario en las tablas correspondientes
-        from .models import Administrador, Entrenador, Pasante
-        
+        # Roles activos de la persona (una sola consulta UNION, con cache de vida corta)
+        from .services.auth_service import AuthService
+
         user = None
         role = None
         persona_external = None
-        
-        # Buscar en Administrador
-        try:
-            admin = Administrador.objects.get(persona_external=username, estado=True)
-            if username and password == 'admin123':  # Simplificado para demo
+
+        for rol in AuthService().get_roles(username):
+            if password == self.PASSWORDS[rol]:  # Simplificado para demo
                 user = {'username': username}
-                role = 'ADMIN'
-                persona_external = admin.persona_external
-        except Administrador.DoesNotExist:
-            pass
-        
-        # Buscar en Entrenador
-        if not user:
-            try:
-                entrenador = Entrenador.objects.get(persona_external=username, estado=True)
-                if username and password == 'entrenador123':  # Simplificado para demo
-                    user = {'username': username}
-                    role = 'ENTRENADOR'
-                    persona_external = entrenador.persona_external
-            except Entrenador.DoesNotExist:
-                pass
-        
-        # Buscar en Pasante
-        if not user:
-            try:
-                pasante = Pasante.objects.get(persona_external=username, estado=True)
-                if username and password == 'pasante123':  # Simplificado para demo
-                    user = {'username': username}
-                    role = 'PASANTE'
-                    persona_external = pasante.persona_external
-            except Pasante.DoesNotExist:
-                pass
+                role = rol
+                persona_external = username
+                break
 
         if user and role and persona_external:
             payload = {
@@ -90,3 +72,50 @@ class MockAuthView(APIView):
 
         return Response({'error': 'Credenciales inválidas'}, status=status.HTTP_401_UNAUTHORIZED)
 
+
+class UserModuleMetricsView(APIView):
+    """
+    Métricas de la integración con el user_module.
+    Expone el estado del circuit breaker y los contadores del cache de personas.
+    """
+    authentication_classes = []
+
+    def get_permissions(self):
+        from .permissions import IsAdmin
+        return [IsAdmin()]
+
+    def get(self, request):
+        from .serializers import get_user_module_metrics
+        return Response(get_user_module_metrics(), status=status.HTTP_200_OK)
+
+
+class RequestMetricsView(APIView):
+    """
+    Métricas por ruta de las peticiones medidas por RequestMetricsMiddleware.
+    Reporta el agregado en memoria del proceso que atiende la petición.
+    """
+    authentication_classes = []
+
+    def get_permissions(self):
+        from .permissions import IsAdmin
+        return [IsAdmin()]
+
+    def get(self, request):
+        from .request_metrics import store
+        return Response(store.report(), status=status.HTTP_200_OK)
+
+
+class ResponseCacheMetricsView(APIView):
+    """
+    Aciertos del cache de respuestas de los listados (ver controllers/cache_respuestas.py).
+    Reporta los contadores del proceso que atiende la petición.
+    """
+    authentication_classes = []
+
+    def get_permissions(self):
+        from .permissions import IsAdmin
+        return [IsAdmin()]
+
+    def get(self, request):
+        from .controllers.cache_respuestas import stats
+        return Response(stats(), status=status.HTTP_200_OK)
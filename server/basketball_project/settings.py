@@ -53,6 +53,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'basketball.middleware.RequestMetricsMiddleware',
 ]
 
 ROOT_URLCONF = 'basketball_project.urls'
@@ -160,3 +161,95 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [],
     'DEFAULT_PERMISSION_CLASSES': [],
 }
+
+# User Module Configuration
+USER_MODULE_URL = os.environ.get('USER_MODULE_URL', 'http://localhost:8096')
+USER_MODULE_EMAIL = os.environ.get('USER_MODULE_EMAIL', 'admin@admin.com')
+USER_MODULE_PASSWORD = os.environ.get('USER_MODULE_PASSWORD', 'admin123')
+# Conexiones keep-alive del pool HTTP hacia el user_module
+USER_MODULE_POOL_SIZE = int(os.environ.get('USER_MODULE_POOL_SIZE', '10'))
+USER_MODULE_TIMEOUT = float(os.environ.get('USER_MODULE_TIMEOUT', '5'))
+# Reintentos con backoff exponencial, solo ante errores de conexión
+USER_MODULE_MAX_RETRIES = int(os.environ.get('USER_MODULE_MAX_RETRIES', '3'))
+USER_MODULE_RETRY_BACKOFF = float(os.environ.get('USER_MODULE_RETRY_BACKOFF', '0.2'))
+# Segundos antes de la expiración (exp del JWT) en que se renueva el token de servicio
+USER_MODULE_TOKEN_REFRESH_MARGIN = int(os.environ.get('USER_MODULE_TOKEN_REFRESH_MARGIN', '60'))
+# Circuit breaker: fallos consecutivos que abren el circuito y segundos hasta reintentar
+USER_MODULE_BREAKER_FAILURE_THRESHOLD = int(os.environ.get('USER_MODULE_BREAKER_FAILURE_THRESHOLD', '5'))
+USER_MODULE_BREAKER_RECOVERY_TIMEOUT = int(os.environ.get('USER_MODULE_BREAKER_RECOVERY_TIMEOUT', '30'))
+# Máximo de peticiones concurrentes al enriquecer listados con datos de persona
+USER_MODULE_MAX_WORKERS = int(os.environ.get('USER_MODULE_MAX_WORKERS', '8'))
+# Enriquecimiento asíncrono (httpx + asyncio.gather), recomendado al desplegar con ASGI
+USER_MODULE_ASYNC_ENRICHMENT = os.environ.get('USER_MODULE_ASYNC_ENRICHMENT', 'false').lower() == 'true'
+USER_MODULE_ASYNC_MAX_CONNECTIONS = int(os.environ.get('USER_MODULE_ASYNC_MAX_CONNECTIONS', '20'))
+
+# Cache de personas del user_module (LRU con TTL por entrada)
+PERSONA_CACHE_MAX_SIZE = int(os.environ.get('PERSONA_CACHE_MAX_SIZE', '2048'))
+PERSONA_CACHE_TTL = int(os.environ.get('PERSONA_CACHE_TTL', '300'))
+PERSONA_CACHE_NEGATIVE_TTL = int(os.environ.get('PERSONA_CACHE_NEGATIVE_TTL', '60'))
+# Tiempo que se conserva el último dato conocido para servirlo durante caídas del user_module
+PERSONA_CACHE_STALE_TTL = int(os.environ.get('PERSONA_CACHE_STALE_TTL', '86400'))
+# Alias de settings.CACHES para compartir el cache entre procesos (None = memoria local)
+PERSONA_CACHE_BACKEND = os.environ.get('PERSONA_CACHE_BACKEND') or None
+
+# Claims de JWT decodificados por token (LRU); vencen en el exp del token o tras el TTL si no tiene
+JWT_CLAIMS_CACHE_MAX_SIZE = int(os.environ.get('JWT_CLAIMS_CACHE_MAX_SIZE', '1024'))
+JWT_CLAIMS_CACHE_TTL = int(os.environ.get('JWT_CLAIMS_CACHE_TTL', '300'))
+
+# Segundos que se cachean los roles resueltos en el login (0 = desactivado)
+LOGIN_ROLE_CACHE_TTL = int(os.environ.get('LOGIN_ROLE_CACHE_TTL', '30'))
+
+# Máximo de pares atleta-grupo por petición a /atletas/membresias/
+MEMBRESIAS_MAX_PARES = int(os.environ.get('MEMBRESIAS_MAX_PARES', '10000'))
+
+# Asignación automática por edad: pares atleta-grupo insertados por lote
+ASIGNACION_BATCH_SIZE = int(os.environ.get('ASIGNACION_BATCH_SIZE', '2000'))
+
+# Filtros de edad (y asignación por edad) sobre fecha_nacimiento en lugar de la edad guardada,
+# que solo se actualiza al ejecutar recalcular_edades
+EDAD_POR_FECHA_NACIMIENTO = os.environ.get('EDAD_POR_FECHA_NACIMIENTO', 'false').lower() == 'true'
+
+# Cache de respuestas de los listados, invalidado por generación del modelo
+# Alias de settings.CACHES (None = 'default'); use uno compartido (archivo, redis) con varios procesos
+RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND') or None
+# Segundos de vida de una respuesta cacheada (0 = desactivado). Por defecto solo se activa con un
+# backend compartido: en memoria local cada proceso (workers, servicio edades) tiene sus propias
+# generaciones y una escritura en uno no invalida los listados de los demás
+RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', '60' if RESPONSE_CACHE_BACKEND else '0'))
+
+# Paginación opcional de los listados (?page=&page_size=)
+PAGINATION_DEFAULT_PAGE_SIZE = int(os.environ.get('PAGINATION_DEFAULT_PAGE_SIZE', '20'))
+PAGINATION_MAX_PAGE_SIZE = int(os.environ.get('PAGINATION_MAX_PAGE_SIZE', '100'))
+
+# Métricas por petición (consultas SQL, llamadas al user_module, latencia)
+# Fracción de peticiones medidas: 1.0 = todas, 0 = desactivado
+REQUEST_METRICS_SAMPLE_RATE = float(os.environ.get('REQUEST_METRICS_SAMPLE_RATE', '1.0'))
+REQUEST_METRICS_PATH_PREFIX = os.environ.get('REQUEST_METRICS_PATH_PREFIX', '/api/')
+# Muestras por ruta usadas para p50/p95/p99
+REQUEST_METRICS_WINDOW = int(os.environ.get('REQUEST_METRICS_WINDOW', '1000'))
+# Directorio donde cada proceso persiste su agregado para `manage.py request_metrics_report`
+# (vacío = solo en memoria, consultable en /api/v1/metrics/requests/)
+REQUEST_METRICS_DIR = os.environ.get('REQUEST_METRICS_DIR') or None
+REQUEST_METRICS_FLUSH_INTERVAL = int(os.environ.get('REQUEST_METRICS_FLUSH_INTERVAL', '60'))
+
+# Ranking de pruebas físicas (leaderboard precalculado)
+# Dirección por tipo de prueba: ASC = menor es mejor (tiempos), DESC = mayor es mejor
+RANKING_DIRECCION_POR_TIPO = {'VELOCIDAD': 'ASC', 'AGILIDAD': 'ASC'}
+# Excepciones por nombre de prueba, p.ej. {'Course Navette': 'DESC'}
+RANKING_DIRECCION_POR_PRUEBA = {}
+# Años por banda de edad de las particiones por edad
+RANKING_BANDA_EDAD = int(os.environ.get('RANKING_BANDA_EDAD', '2'))
+# Recalcular el ranking al guardar una PruebaFisica (desactivar para cargas masivas)
+RANKING_AUTO_REFRESH = os.environ.get('RANKING_AUTO_REFRESH', 'true').lower() == 'true'
+
+# Importación masiva de pruebas (CSV/XLSX): filas por lote y errores detallados en el reporte
+IMPORTACION_BATCH_SIZE = int(os.environ.get('IMPORTACION_BATCH_SIZE', '1000'))
+IMPORTACION_MAX_ERRORES = int(os.environ.get('IMPORTACION_MAX_ERRORES', '1000'))
+# Dígitos del DNI (cédula): las celdas numéricas de XLSX se completan con ceros a la izquierda (0 = no completar)
+IMPORTACION_DNI_LONGITUD = int(os.environ.get('IMPORTACION_DNI_LONGITUD', '10'))
+
+# Exportación CSV/NDJSON en streaming: filas leídas de la base de datos por bloque
+EXPORTACION_CHUNK_SIZE = int(os.environ.get('EXPORTACION_CHUNK_SIZE', '2000'))
+
+# Backend de GenericDAO.search: auto (según motor), basic, postgres_trigram o sqlite_fts5
+SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'auto')
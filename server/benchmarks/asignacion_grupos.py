@@ -0,0 +1,96 @@
+"""
+Benchmark de la asignación automática de atletas a grupos por edad
+
+Crea una base de datos de prueba (no toca la de desarrollo) con --grupos
+grupos de rangos de edad solapados y --atletas atletas sin grupo. Compara
+el enfoque atleta por atleta (GrupoAtletaDAO.get_by_rango_edad y
+AtletaDAO.asignar_grupo por cada atleta, medido sobre una muestra y
+extrapolado) con GrupoAtletaService.asignar_por_edad: índice de
+intervalos en memoria, una pasada y un INSERT masivo por lote.
+
+Ejecutar: python benchmarks/asignacion_grupos.py [--atletas 50000] [--grupos 24] [--muestra 500]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'basketball_project.settings')
+import django
+django.setup()
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from basketball.dao.atleta_dao import AtletaDAO
+from basketball.dao.grupo_atleta_dao import GrupoAtletaDAO
+from basketball.models import Atleta, Entrenador, GrupoAtleta
+from basketball.services.grupo_atleta_service import GrupoAtletaService
+
+
+def medir(funcion):
+    with CaptureQueriesContext(connection) as consultas:
+        start = time.perf_counter()
+        resultado = funcion()
+        segundos = time.perf_counter() - start
+    return resultado, segundos, len(consultas.captured_queries)
+
+
+def atleta_por_atleta(muestra):
+    atleta_dao, grupo_dao = AtletaDAO(), GrupoAtletaDAO()
+    asignados = 0
+    with transaction.atomic():
+        for atleta in atleta_dao.get_sin_grupo().order_by('id')[:muestra]:
+            grupo = grupo_dao.get_by_rango_edad(atleta.edad).first()
+            if grupo:
+                asignados += atleta_dao.asignar_grupo(atleta.pk, grupo.pk)
+        transaction.set_rollback(True)
+    return asignados
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--atletas', type=int, default=50000)
+    parser.add_argument('--grupos', type=int, default=24)
+    parser.add_argument('--muestra', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        rnd = random.Random(7)
+        entrenador = Entrenador.objects.create(persona_external='e-1', especialidad='B', club_asignado='C')
+        # Categorías de 2 años solapadas y algunos grupos amplios
+        GrupoAtleta.objects.bulk_create([
+            GrupoAtleta(nombre=f'Grupo {i}', rango_edad_minima=minima, rango_edad_maxima=minima + ancho,
+                        categoria='Sub', entrenador=entrenador)
+            for i in range(args.grupos)
+            for minima, ancho in [(6 + (i * 3) % 14, 2 if i % 4 else 6)]
+        ])
+        Atleta.objects.bulk_create([
+            Atleta(nombre_atleta='A', apellido_atleta=f'B {i}', dni=f'dni-{i}', fecha_nacimiento='2012-01-01',
+                   edad=rnd.randint(5, 24), sexo='M')
+            for i in range(args.atletas)
+        ], batch_size=5000)
+        print(f"{connection.vendor}, {args.atletas} atletas sin grupo, {args.grupos} grupos")
+
+        service = GrupoAtletaService()
+        asignados, segundos, consultas = medir(lambda: atleta_por_atleta(args.muestra))
+        print(f"  atleta por atleta: {segundos / args.muestra * 1000:7.3f} ms/atleta, "
+              f"{consultas / args.muestra:.1f} consultas/atleta -> {segundos / args.muestra * args.atletas:7.2f} s estimados")
+
+        plan, segundos, consultas = medir(lambda: service.asignar_por_edad(aplicar=False))
+        print(f"  simulación:        {segundos:7.2f} s, {consultas} consultas, "
+              f"{plan['asignados']} asignados, {plan['sin_grupo_compatible']} sin grupo compatible")
+
+        resultado, segundos, consultas = medir(lambda: service.asignar_por_edad(aplicar=True))
+        print(f"  aplicar:           {segundos:7.2f} s, {consultas} consultas, {resultado['asignados']} asignados")
+        assert resultado['asignados'] == plan['asignados']
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Microbenchmark del costo de autorización por petición (BaseRolePermission)
+
+Evalúa dos clases de permiso por petición (como un get_permissions() que
+devuelve varias) con el mismo JWT, que es lo que envían las tablets durante
+toda una sesión, y compara:
+  - sin cache de claims (JWT_CLAIMS_CACHE_MAX_SIZE=0): jwt.decode en cada petición
+  - con cache de claims: jwt.decode solo la primera vez que se ve el token
+
+Ejecutar: python benchmarks/auth_permisos.py [--peticiones 20000]
+"""
+import os
+import sys
+import time
+import argparse
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'basketball_project.settings')
+import django
+django.setup()
+
+import jwt
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from basketball import permissions
+from basketball.connection.claims_cache import ClaimsCache
+from basketball.permissions import IsAdmin, IsAdminOrEntrenadorOrPasante
+
+
+def medir(peticiones, http_request):
+    clases = (IsAdminOrEntrenadorOrPasante(), IsAdmin())
+    start = time.perf_counter()
+    for _ in range(peticiones):
+        # Un Request de DRF nuevo por petición, como en el servidor
+        request = Request(http_request)
+        for permiso in clases:
+            permiso.has_permission(request, None)
+    return (time.perf_counter() - start) / peticiones * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--peticiones', type=int, default=20_000)
+    args = parser.parse_args()
+
+    token = jwt.encode({'stament': 'ADMINISTRATIVO', 'exp': int(time.time()) + 3600},
+                       permissions.JWT_SECRET_KEY, algorithm='HS256')
+    http_request = APIRequestFactory().get('/api/v1/atletas/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    print(f"{args.peticiones} peticiones, 2 clases de permiso por petición")
+    resultados = {}
+    for nombre, cache in (('sin cache', ClaimsCache(max_size=0)), ('con cache', ClaimsCache(max_size=1024))):
+        permissions._claims_cache = cache
+        medir(100, http_request)
+        resultados[nombre] = medir(args.peticiones, http_request)
+        print(f"  {nombre:<10} {resultados[nombre]:7.2f} µs/petición, hit ratio {cache.stats()['hit_ratio']:.2f}")
+    print(f"  x{resultados['sin cache'] / resultados['con cache']:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark del cache de respuestas de los listados (invalidación por generación)
+
+Crea una base de datos de prueba (no toca la de desarrollo) con N atletas en
+grupos y simula una carga de lectura intensa: --lecturas GET de
+/api/v1/atletas/ y /api/v1/grupos-atletas/ (roles alternados) por cada
+escritura por la API. Compara el tiempo medio por petición sin cache, con
+el cache en memoria local y con el cache en archivo, y reporta el hit ratio.
+
+Ejecutar: python benchmarks/cache_respuestas.py [--atletas 2000] [--escrituras 10] [--lecturas 100]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'basketball_project.settings')
+import django
+django.setup()
+
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment
+from basketball.controllers import cache_respuestas
+from basketball.dao.generaciones import get_cache
+from basketball.models import Atleta, Entrenador, GrupoAtleta
+
+RUTAS = ('/api/v1/atletas/', '/api/v1/grupos-atletas/')
+ROLES = ('ADMIN', 'ENTRENADOR', 'ESTUDIANTE_VINCULACION')
+
+
+def carga(client, escrituras, lecturas, atleta_id):
+    peticiones = 0
+    start = time.perf_counter()
+    for escritura in range(escrituras):
+        client.put(f'/api/v1/atletas/{atleta_id}/', {'telefono': str(escritura)},
+                   content_type='application/json', HTTP_X_ROLE='ADMIN')
+        for lectura in range(lecturas):
+            client.get(RUTAS[lectura % 2], HTTP_X_ROLE=ROLES[lectura % 3])
+        peticiones += lecturas + 1
+    return (time.perf_counter() - start) / peticiones * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--atletas', type=int, default=2000)
+    parser.add_argument('--escrituras', type=int, default=10)
+    parser.add_argument('--lecturas', type=int, default=100)
+    args = parser.parse_args()
+
+    # Con DEBUG el log de consultas falsea el tiempo
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(verbosity=0)
+    directorio = tempfile.mkdtemp()
+    try:
+        Atleta.objects.bulk_create([
+            Atleta(nombre_atleta='A', apellido_atleta=str(i), dni=f'{i:010d}', fecha_nacimiento='2008-01-01',
+                   edad=16, sexo='MF'[i % 2])
+            for i in range(args.atletas)
+        ])
+        entrenador = Entrenador.objects.create(persona_external='bench', especialidad='B', club_asignado='C')
+        for i in range(20):
+            grupo = GrupoAtleta.objects.create(
+                nombre=f'G{i}', rango_edad_minima=10, rango_edad_maxima=20, categoria='Juvenil',
+                entrenador=entrenador
+            )
+            grupo.atletas.set(Atleta.objects.filter(id__in=range(i * 100, i * 100 + 100)))
+        atleta_id = Atleta.objects.values_list('id', flat=True).first()
+        client = Client()
+        print(f"{connection.vendor}, {args.atletas} atletas, {args.lecturas} lecturas por escritura")
+
+        caches = {
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'archivo': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directorio},
+        }
+        escenarios = [
+            ('sin cache', {'RESPONSE_CACHE_TTL': 0}),
+            ('memoria local', {'RESPONSE_CACHE_BACKEND': None, 'RESPONSE_CACHE_TTL': 60}),
+            ('archivo', {'RESPONSE_CACHE_BACKEND': 'archivo', 'RESPONSE_CACHE_TTL': 60}),
+        ]
+        for nombre, opciones in escenarios:
+            with override_settings(CACHES=caches, **opciones):
+                get_cache().clear()
+                cache_respuestas.reset_stats()
+                ms = carga(client, args.escrituras, args.lecturas, atleta_id)
+                stats = cache_respuestas.stats()
+                ratio = f", hit ratio {stats['hit_ratio']:.2f}" if stats['hits'] + stats['misses'] else ''
+                print(f"  {nombre:<14} {ms:8.2f} ms/petición{ratio}")
+    finally:
+        for nombre in os.listdir(directorio):
+            os.remove(os.path.join(directorio, nombre))
+        os.rmdir(directorio)
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
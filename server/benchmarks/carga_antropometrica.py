@@ -0,0 +1,87 @@
+"""
+Benchmark de la carga de pruebas antropométricas: create() fila a fila vs bulk_create
+
+Crea una base de datos de prueba (no toca la de desarrollo) y carga las
+mismas N mediciones con PruebaAntropometricaDAO.create en un bucle (save()
+calcula el IMC por fila) y con PruebaAntropometricaDAO.bulk_create (índices
+calculados por lote), verificando que ambos caminos guardan los mismos IMC.
+
+Ejecutar: python benchmarks/carga_antropometrica.py [--filas 20000] [--batch 1000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from decimal import Decimal
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'basketball_project.settings')
+import django
+django.setup()
+
+from django.db import connection, transaction
+from django.test.utils import setup_test_environment
+from basketball.dao import PruebaAntropometricaDAO
+from basketball.models import Atleta, PruebaAntropometrica
+
+
+def generar(filas, atleta_ids):
+    rnd = random.Random(3)
+    return [
+        {'atleta_id': rnd.choice(atleta_ids), 'fecha_registro': '2024-01-01',
+         'peso': Decimal(f'{rnd.uniform(30, 100):.2f}'), 'estatura': Decimal(f'{rnd.uniform(130, 205):.2f}'),
+         'altura_sentado': Decimal(f'{rnd.uniform(65, 105):.2f}')}
+        for _ in range(filas)
+    ]
+
+
+def indices():
+    return list(PruebaAntropometrica.objects.order_by('id').values_list('indice_masa_corporal', 'indice_cornico'))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--filas', type=int, default=20_000)
+    parser.add_argument('--batch', type=int, default=1000)
+    args = parser.parse_args()
+
+    # Con DEBUG el log de consultas guarda cada INSERT y falsea el tiempo
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        Atleta.objects.bulk_create([
+            Atleta(nombre_atleta='A', apellido_atleta=str(i), dni=f'{i:010d}', fecha_nacimiento='2008-01-01',
+                   edad=16, sexo='F')
+            for i in range(500)
+        ])
+        atleta_ids = list(Atleta.objects.values_list('id', flat=True))
+        dao = PruebaAntropometricaDAO()
+        print(f"{connection.vendor}, {args.filas} mediciones")
+
+        # Ambos caminos en una transacción para medir el costo por fila y no el de los commits
+        start = time.perf_counter()
+        with transaction.atomic():
+            for datos in generar(args.filas, atleta_ids):
+                dao.create(**datos)
+        bucle = time.perf_counter() - start
+        por_fila = indices()
+        PruebaAntropometrica.objects.all().delete()
+
+        start = time.perf_counter()
+        with transaction.atomic():
+            lote = generar(args.filas, atleta_ids)
+            for inicio in range(0, len(lote), args.batch):
+                dao.bulk_create(lote[inicio:inicio + args.batch])
+        masivo = time.perf_counter() - start
+
+        print(f"  create() en bucle: {args.filas / bucle:8.0f} filas/s ({bucle:.2f} s)")
+        print(f"  bulk_create:       {args.filas / masivo:8.0f} filas/s ({masivo:.2f} s, x{bucle / masivo:.1f})")
+        print(f"  índices idénticos: {indices() == por_fila}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""
+Planes de ejecución (EXPLAIN) de las consultas de los DAO
+
+Crea una base de datos de prueba (no toca la de desarrollo), la llena con un
+volumen realista, ejecuta ANALYZE e imprime el plan de cada método de DAO
+junto con el índice que usa, para verificar que los índices de la migración
+0004_dao_access_indexes se aprovechan.
+
+Ejecutar: python benchmarks/explain_dao.py [--atletas 20000] [--pruebas 10] [--verbose]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import date, timedelta
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'basketball_project.settings')
+import django
+django.setup()
+
+from django.db import connection
+from django.test.utils import setup_test_environment
+from basketball.dao import (
+    AtletaDAO, GrupoAtletaDAO, InscripcionDAO, PruebaAntropometricaDAO, PruebaFisicaDAO
+)
+from basketball.models import (
+    Atleta, Entrenador, GrupoAtleta, Inscripcion, PruebaAntropometrica, PruebaFisica,
+    TipoPrueba, TipoInscripcion
+)
+
+INICIO = date(2022, 1, 1)
+
+
+def sembrar(atletas, pruebas_por_atleta):
+    rnd = random.Random(7)
+    entrenador = Entrenador.objects.create(persona_external='bench-e', especialidad='B', club_asignado='C')
+    GrupoAtleta.objects.bulk_create([
+        GrupoAtleta(nombre=f'Grupo {i}', rango_edad_minima=8 + i, rango_edad_maxima=10 + i,
+                    categoria='Formativa', entrenador=entrenador, estado=i % 5 != 0)
+        for i in range(40)
+    ])
+    Atleta.objects.bulk_create([
+        Atleta(nombre_atleta=f'Nombre {i}', apellido_atleta=f'Apellido {rnd.randrange(5000):04d}',
+               dni=f'{i:010d}', fecha_nacimiento='2008-01-01', edad=rnd.randint(8, 20),
+               sexo=rnd.choice('MF'), estado=rnd.random() > 0.1)
+        for i in range(atletas)
+    ], batch_size=2000)
+    ids = list(Atleta.objects.values_list('id', flat=True))
+
+    Inscripcion.objects.bulk_create([
+        Inscripcion(atleta_id=atleta_id, fecha_inscripcion=INICIO + timedelta(days=rnd.randrange(900)),
+                    tipo_inscripcion=rnd.choice(TipoInscripcion.values), habilitada=rnd.random() > 0.1,
+                    registrado_por=f'user-{rnd.randrange(50)}')
+        for atleta_id in ids
+    ], batch_size=2000)
+
+    tipos = TipoPrueba.values
+    lote_f, lote_a = [], []
+    for atleta_id in ids:
+        for _ in range(pruebas_por_atleta):
+            fecha = INICIO + timedelta(days=rnd.randrange(900))
+            tipo = rnd.choice(tipos)
+            lote_f.append(PruebaFisica(
+                atleta_id=atleta_id, fecha_registro=fecha, tipo_prueba=tipo, nombre_prueba=f'{tipo} {rnd.randrange(4)}',
+                resultado=rnd.uniform(1, 100), unidad_medida='u', estado=rnd.random() > 0.05,
+                registrado_por=f'user-{rnd.randrange(50)}'
+            ))
+        for _ in range(max(1, pruebas_por_atleta // 3)):
+            lote_a.append(PruebaAntropometrica(
+                atleta_id=atleta_id, fecha_registro=INICIO + timedelta(days=rnd.randrange(900)),
+                peso=rnd.uniform(30, 90), estatura=rnd.uniform(130, 200), indice_masa_corporal=20,
+                estado=rnd.random() > 0.05, registrado_por=f'user-{rnd.randrange(50)}'
+            ))
+        if len(lote_f) >= 20000:
+            PruebaFisica.objects.bulk_create(lote_f)
+            PruebaAntropometrica.objects.bulk_create(lote_a)
+            lote_f, lote_a = [], []
+    PruebaFisica.objects.bulk_create(lote_f)
+    PruebaAntropometrica.objects.bulk_create(lote_a)
+
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return ids
+
+
+def consultas(atleta_id, grupo_id):
+    """(etiqueta, queryset) por método de DAO; los que devuelven un objeto usan el queryset equivalente"""
+    atletas, grupos = AtletaDAO(), GrupoAtletaDAO()
+    inscripciones = InscripcionDAO()
+    antropometricas, fisicas = PruebaAntropometricaDAO(), PruebaFisicaDAO()
+    desde, hasta = date(2023, 1, 1), date(2023, 1, 31)
+    return [
+        ('AtletaDAO.get_activos', atletas.get_activos()[:20]),
+        ('AtletaDAO.get_by_sexo', atletas.get_by_sexo('F')[:20]),
+        ('AtletaDAO.get_by_rango_edad', atletas.get_by_rango_edad(12, 13)),
+        ('AtletaDAO.get_by_dni', atletas.get_by_filter(dni='0000000042')[:1]),
+        ('AtletaDAO.get_by_grupo', atletas.get_by_grupo(grupo_id)),
+        ('GrupoAtletaDAO.get_by_rango_edad', grupos.get_by_rango_edad(12)),
+        ('GrupoAtletaDAO.get_by_entrenador', grupos.get_by_entrenador(1)),
+        ('InscripcionDAO.get_habilitadas', inscripciones.get_habilitadas()[:20]),
+        ('InscripcionDAO.get_by_tipo', inscripciones.get_by_tipo('FEDERADO')[:20]),
+        ('InscripcionDAO.get_by_fecha_range', inscripciones.get_by_fecha_range(desde, hasta)),
+        ('InscripcionDAO.get_by_registrador', inscripciones.get_by_registrador('user-7')),
+        ('PruebaAntropometricaDAO.get_by_atleta', antropometricas.get_by_atleta(atleta_id)),
+        ('PruebaAntropometricaDAO.get_ultima_by_atleta',
+         antropometricas.get_by_atleta(atleta_id).order_by('-fecha_registro')[:1]),
+        ('PruebaAntropometricaDAO.get_activas', antropometricas.get_activas().order_by('-fecha_registro', 'id')[:20]),
+        ('PruebaAntropometricaDAO.get_by_fecha_range', antropometricas.get_by_fecha_range(desde, hasta)),
+        ('PruebaAntropometricaDAO.get_by_registrador', antropometricas.get_by_registrador('user-7')),
+        ('PruebaFisicaDAO.get_by_atleta', fisicas.get_by_atleta(atleta_id)),
+        ('PruebaFisicaDAO.get_by_atleta_y_tipo', fisicas.get_by_atleta_y_tipo(atleta_id, 'VELOCIDAD')),
+        ('PruebaFisicaDAO.get_ultima_by_atleta', fisicas.get_by_atleta(atleta_id).order_by('-fecha_registro')[:1]),
+        ('PruebaFisicaDAO.get_activas', fisicas.get_activas().order_by('-fecha_registro', 'id')[:20]),
+        ('PruebaFisicaDAO.get_by_tipo', fisicas.get_by_tipo('FUERZA')[:20]),
+        ('PruebaFisicaDAO.get_by_fecha_range', fisicas.get_by_fecha_range(desde, hasta)),
+        ('PruebaFisicaDAO.get_by_registrador', fisicas.get_by_registrador('user-7')),
+        ('PruebaFisicaDAO.get_ranking_by_tipo', fisicas.get_ranking_by_tipo('FUERZA')),
+        ('PruebaFisicaDAO.get_estadisticas_atleta',
+         fisicas.get_by_atleta(atleta_id).values('atleta_id', 'tipo_prueba').order_by('atleta_id', 'tipo_prueba')),
+    ]
+
+
+def indices_usados(plan):
+    usados = []
+    for palabra in ('INDEX', 'index', 'Index'):
+        for linea in plan.splitlines():
+            if palabra in linea and linea not in usados:
+                usados.append(linea.strip())
+    return usados
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--atletas', type=int, default=20_000)
+    parser.add_argument('--pruebas', type=int, default=10, help='Pruebas físicas por atleta')
+    parser.add_argument('--verbose', action='store_true', help='Imprime el plan completo')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        start = time.perf_counter()
+        ids = sembrar(args.atletas, args.pruebas)
+        print(f"{args.atletas} atletas / {PruebaFisica.objects.count()} pruebas físicas "
+              f"sembrados en {time.perf_counter() - start:.1f} s ({connection.vendor})\n")
+
+        grupo = GrupoAtleta.objects.filter(estado=True).first()
+        grupo.atletas.add(*ids[:500])
+        for etiqueta, queryset in consultas(ids[len(ids) // 2], grupo.id):
+            plan = queryset.explain()
+            usados = indices_usados(plan)
+            estado = ', '.join(usados) if usados else 'SIN ÍNDICE (recorrido completo)'
+            print(f"{etiqueta:<46} {estado}")
+            if args.verbose:
+                print(f"    {queryset.query}\n    " + plan.replace('\n', '\n    ') + '\n')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
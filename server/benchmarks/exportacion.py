@@ -0,0 +1,89 @@
+"""
+Benchmark de la exportación en streaming de pruebas físicas
+
+Crea una base de datos de prueba (no toca la de desarrollo), carga N pruebas
+y descarga /api/v1/pruebas-fisicas/exportar/ (CSV y NDJSON) consumiendo la
+respuesta por bloques, reportando filas por segundo y el pico de memoria de
+Python (tracemalloc) con un volumen 10 veces menor y con el completo.
+
+Ejecutar: python benchmarks/exportacion.py [--pruebas 200000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from datetime import date, timedelta
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'basketball_project.settings')
+import django
+django.setup()
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment
+from basketball.models import Atleta, PruebaFisica
+
+
+def cargar_pruebas(cantidad, atleta_ids):
+    rnd = random.Random(5)
+    lote = []
+    for _ in range(cantidad):
+        lote.append(PruebaFisica(
+            atleta_id=rnd.choice(atleta_ids), fecha_registro=date(2023, 1, 1) + timedelta(days=rnd.randrange(500)),
+            tipo_prueba='VELOCIDAD', nombre_prueba='Sprint 20m', resultado=rnd.uniform(2, 6), unidad_medida='s'
+        ))
+        if len(lote) == 5000:
+            PruebaFisica.objects.bulk_create(lote)
+            lote = []
+    PruebaFisica.objects.bulk_create(lote)
+
+
+def descargar(client, formato):
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get('/api/v1/pruebas-fisicas/exportar/', {'formato': formato}, HTTP_X_ROLE='ADMIN')
+    total = sum(len(bloque) for bloque in response.streaming_content)
+    segundos = time.perf_counter() - start
+    pico = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return total, segundos, pico
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pruebas', type=int, default=200_000)
+    args = parser.parse_args()
+
+    # Con DEBUG el log de consultas falsea memoria y tiempo
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        Atleta.objects.bulk_create([
+            Atleta(nombre_atleta='A', apellido_atleta=str(i), dni=f'{i:010d}', fecha_nacimiento='2008-01-01',
+                   edad=16, sexo='F')
+            for i in range(1000)
+        ])
+        atleta_ids = list(Atleta.objects.values_list('id', flat=True))
+        client = Client()
+        # Primera petición fuera de la medición (imports perezosos, resolver de URLs)
+        descargar(client, 'csv')
+        print(connection.vendor)
+
+        cargadas = 0
+        for cantidad in (args.pruebas // 10, args.pruebas):
+            cargar_pruebas(cantidad - cargadas, atleta_ids)
+            cargadas = cantidad
+            for formato in ('csv', 'ndjson'):
+                total, segundos, pico = descargar(client, formato)
+                print(f"  {cantidad:>8} filas {formato:<6} {total / 2 ** 20:7.1f} MB, "
+                      f"{cantidad / segundos:8.0f} filas/s, pico de memoria {pico:5.1f} MB")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark de las respuestas condicionales (ETag) del listado de atletas
+
+Crea una base de datos de prueba (no toca la de desarrollo), carga N atletas
+con grupos y compara el GET /api/v1/atletas/ completo (consulta, prefetch y
+serialización) con la revalidación por If-None-Match que responde 304 solo
+con la consulta del validador (COUNT + MAX(fecha_actualizacion)).
+
+Ejecutar: python benchmarks/get_condicional.py [--atletas 5000] [--repeticiones 20]
+"""
+import os
+import sys
+import time
+import argparse
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'basketball_project.settings')
+import django
+django.setup()
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment
+from basketball.models import Atleta, Entrenador, GrupoAtleta
+
+
+def medir(client, repeticiones, **headers):
+    start = time.perf_counter()
+    for _ in range(repeticiones):
+        response = client.get('/api/v1/atletas/', HTTP_X_ROLE='ADMIN', **headers)
+    return (time.perf_counter() - start) / repeticiones * 1000, response
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--atletas', type=int, default=5000)
+    parser.add_argument('--repeticiones', type=int, default=20)
+    args = parser.parse_args()
+
+    # Con DEBUG el log de consultas falsea el tiempo
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        Atleta.objects.bulk_create([
+            Atleta(nombre_atleta='A', apellido_atleta=str(i), dni=f'{i:010d}', fecha_nacimiento='2008-01-01',
+                   edad=16, sexo='MF'[i % 2])
+            for i in range(args.atletas)
+        ])
+        entrenador = Entrenador.objects.create(persona_external='bench', especialidad='B', club_asignado='C')
+        grupo = GrupoAtleta.objects.create(
+            nombre='G', rango_edad_minima=10, rango_edad_maxima=20, categoria='Juvenil', entrenador=entrenador
+        )
+        grupo.atletas.set(Atleta.objects.all())
+        client = Client()
+        medir(client, 1)
+
+        completo, response = medir(client, args.repeticiones)
+        etag = response['ETag']
+        revalidacion, response = medir(client, args.repeticiones, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, response.status_code
+
+        print(f"{connection.vendor}, {args.atletas} atletas")
+        print(f"  GET completo (200): {completo:8.1f} ms")
+        print(f"  If-None-Match (304): {revalidacion:7.1f} ms (x{completo / revalidacion:.0f})")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
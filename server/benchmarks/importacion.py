@@ -0,0 +1,99 @@
+"""
+Benchmark de la importación masiva de pruebas físicas (CSV)
+
+Crea una base de datos de prueba (no toca la de desarrollo), genera archivos
+CSV en disco y los importa con PruebaFisicaService.importar_pruebas,
+reportando filas por segundo y el pico de memoria de Python (tracemalloc)
+para comprobar que no crece con el tamaño del archivo.
+
+Ejecutar: python benchmarks/importacion.py [--filas 200000] [--atletas 2000] [--batch 1000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'basketball_project.settings')
+import django
+django.setup()
+
+from django.core.files.uploadedfile import UploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import setup_test_environment
+from basketball.models import Atleta, PruebaFisica
+from basketball.services import PruebaFisicaService
+
+PRUEBAS = [('VELOCIDAD', 'Sprint 20m', 's'), ('FUERZA', 'Salto largo', 'cm'), ('RESISTENCIA', 'Course Navette', 'nivel')]
+
+
+def generar_csv(ruta, filas, atletas):
+    rnd = random.Random(1)
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        archivo.write('dni,fecha_registro,tipo_prueba,nombre_prueba,resultado,unidad_medida,observaciones\n')
+        for i in range(filas):
+            tipo, nombre, unidad = rnd.choice(PRUEBAS)
+            # 1% de filas con DNI inexistente para ejercitar el reporte de errores
+            dni = f'{rnd.randrange(atletas):010d}' if rnd.random() > 0.01 else 'no-existe'
+            archivo.write(f'{dni},2024-{rnd.randint(1, 12):02d}-15,{tipo},{nombre},'
+                          f'{rnd.uniform(1, 300):.2f},{unidad},Fila {i}\n')
+
+
+def importar(ruta, memoria):
+    with open(ruta, 'rb') as archivo:
+        if memoria:
+            tracemalloc.start()
+        start = time.perf_counter()
+        reporte = PruebaFisicaService().importar_pruebas(UploadedFile(archivo, name='pruebas.csv'))
+        segundos = time.perf_counter() - start
+        pico = tracemalloc.get_traced_memory()[1] / 2 ** 20 if memoria else None
+        tracemalloc.stop()
+    return reporte, segundos, pico
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--filas', type=int, default=200_000)
+    parser.add_argument('--atletas', type=int, default=2000)
+    parser.add_argument('--batch', type=int, default=1000)
+    args = parser.parse_args()
+
+    # Con DEBUG el log de consultas guarda cada INSERT y falsea memoria y tiempo
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(verbosity=0)
+    directorio = tempfile.mkdtemp()
+    try:
+        Atleta.objects.bulk_create([
+            Atleta(nombre_atleta='A', apellido_atleta=str(i), dni=f'{i:010d}', fecha_nacimiento='2008-01-01',
+                   edad=16, sexo='MF'[i % 2])
+            for i in range(args.atletas)
+        ])
+        print(f"{connection.vendor}, lotes de {args.batch} filas")
+
+        with override_settings(IMPORTACION_BATCH_SIZE=args.batch, RANKING_AUTO_REFRESH=False):
+            # Pico de memoria con un archivo 10 veces menor y con el completo
+            for filas in (args.filas // 10, args.filas):
+                ruta = os.path.join(directorio, f'pruebas_{filas}.csv')
+                generar_csv(ruta, filas, args.atletas)
+                tamano = os.path.getsize(ruta) / 2 ** 20
+                _, _, pico = importar(ruta, memoria=True)
+                PruebaFisica.objects.all().delete()
+                reporte, segundos, _ = importar(ruta, memoria=False)
+                print(f"  {filas:>8} filas ({tamano:6.1f} MB): {reporte['importadas']} importadas, "
+                      f"{reporte['con_errores']} con error, {filas / segundos:8.0f} filas/s, "
+                      f"pico de memoria {pico:6.1f} MB")
+                PruebaFisica.objects.all().delete()
+    finally:
+        for nombre in os.listdir(directorio):
+            os.remove(os.path.join(directorio, nombre))
+        os.rmdir(directorio)
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark de una ráfaga de logins (MockAuthView)
+
+Crea una base de datos de prueba (no toca la de desarrollo) con
+administradores, entrenadores y pasantes, y simula el inicio de clases:
+cada persona inicia sesión --reintentos veces en orden aleatorio. Compara
+logins por segundo y consultas SQL por login sin el cache de roles
+(LOGIN_ROLE_CACHE_TTL=0, una consulta UNION por login) y con el cache.
+
+Ejecutar: python benchmarks/login_rafaga.py [--personas 300] [--reintentos 3]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'basketball_project.settings')
+import django
+django.setup()
+
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from basketball.dao.generaciones import get_cache
+from basketball.models import Administrador, Entrenador, Pasante
+
+PASSWORDS = {'admin': 'admin123', 'entrenador': 'entrenador123', 'pasante': 'pasante123'}
+
+
+def rafaga(client, logins):
+    with CaptureQueriesContext(connection) as consultas:
+        start = time.perf_counter()
+        for username, password in logins:
+            response = client.post('/api/auth/login', {'username': username, 'password': password},
+                                   content_type='application/json')
+            assert response.status_code == 200, response.content
+        segundos = time.perf_counter() - start
+    return len(logins) / segundos, len(consultas.captured_queries) / len(logins)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--personas', type=int, default=300)
+    parser.add_argument('--reintentos', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        # Mayoría de pasantes: el peor caso de la resolución por tablas
+        tercio = args.personas // 10
+        Administrador.objects.bulk_create([Administrador(persona_external=f'admin-{i}') for i in range(tercio)])
+        Entrenador.objects.bulk_create([
+            Entrenador(persona_external=f'entrenador-{i}', especialidad='B', club_asignado='C') for i in range(tercio)
+        ])
+        Pasante.objects.bulk_create([
+            Pasante(persona_external=f'pasante-{i}', carrera='S', semestre='5', fecha_inicio='2024-01-01')
+            for i in range(args.personas - 2 * tercio)
+        ])
+        personas = [(p, PASSWORDS['admin']) for p in Administrador.objects.values_list('persona_external', flat=True)]
+        personas += [(p, PASSWORDS['entrenador']) for p in Entrenador.objects.values_list('persona_external', flat=True)]
+        personas += [(p, PASSWORDS['pasante']) for p in Pasante.objects.values_list('persona_external', flat=True)]
+        logins = personas * args.reintentos
+        random.Random(7).shuffle(logins)
+
+        client = Client()
+        print(f"{connection.vendor}, {len(personas)} personas x {args.reintentos} intentos")
+        for nombre, ttl in (('sin cache', 0), ('con cache', 30)):
+            with override_settings(LOGIN_ROLE_CACHE_TTL=ttl):
+                get_cache().clear()
+                por_segundo, consultas = rafaga(client, logins)
+                print(f"  {nombre:<10} {por_segundo:8.0f} logins/s, {consultas:.2f} consultas/login")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
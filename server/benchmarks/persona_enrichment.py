@@ -0,0 +1,129 @@
+"""
+Benchmark del enriquecimiento de personas en el listado de entrenadores
+
+Compara p50/p99 de serializar 500 entrenadores con el camino síncrono
+(fan-out con hilos) y con el camino asíncrono (httpx + asyncio.gather),
+contra un user_module simulado con latencia fija.
+
+Ejecutar: python benchmarks/persona_enrichment.py [--coaches 500] [--rounds 20] [--latency-ms 20]
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'basketball_project.settings')
+import django
+django.setup()
+
+from asgiref.sync import sync_to_async
+from django.test import override_settings
+from basketball import serializers
+from basketball.models import Entrenador
+from basketball.connection import UserModuleClient, AsyncUserModuleClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    latency = 0.02
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._send({'data': {'token': 'Bearer benchmark-token'}})
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        persona_external = self.path.rsplit('/', 1)[-1]
+        self._send({'data': {'external_id': persona_external, 'first_name': 'Nombre', 'last_name': 'Apellido'}})
+
+
+def serve_stub(latency, ports):
+    StubHandler.latency = latency
+    ThreadingHTTPServer.request_queue_size = 1024
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    ports.put(server.server_port)
+    server.serve_forever()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def serialize(coaches):
+    serializers._persona_cache.clear()
+    start = time.perf_counter()
+    data = serializers.EntrenadorSerializer(coaches, many=True).data
+    elapsed = (time.perf_counter() - start) * 1000
+    assert all(row['nombre'] for row in data)
+    return elapsed
+
+
+async def run(coaches, rounds, async_enrichment):
+    # Igual que bajo ASGI: la vista síncrona corre en un hilo y las corrutinas
+    # de enriquecimiento vuelven al event loop principal
+    timings = []
+    with override_settings(USER_MODULE_ASYNC_ENRICHMENT=async_enrichment):
+        # Ronda de calentamiento para abrir el pool de conexiones
+        await sync_to_async(serialize)(coaches)
+        for _ in range(rounds):
+            timings.append(await sync_to_async(serialize)(coaches))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--coaches', type=int, default=500)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    args = parser.parse_args()
+
+    # El user_module simulado corre en otro proceso para no competir por el GIL
+    ports = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve_stub, args=(args.latency_ms / 1000, ports), daemon=True)
+    server.start()
+    port = ports.get()
+
+    # Apuntar los clientes del serializer al user_module simulado
+    client = UserModuleClient(f'http://127.0.0.1:{port}',
+                              pool_size=serializers.settings.USER_MODULE_POOL_SIZE)
+    serializers._user_module_client = client
+    serializers._async_user_module_client = AsyncUserModuleClient.from_settings(client)
+
+    coaches = [
+        Entrenador(id=i, persona_external=f'coach-{i:04d}', especialidad='Baloncesto', club_asignado='Club')
+        for i in range(args.coaches)
+    ]
+
+    print(f"{args.coaches} entrenadores, {args.rounds} rondas, latencia user_module {args.latency_ms} ms")
+    for label, async_enrichment in (('sync (hilos)', False), ('async (httpx)', True)):
+        timings = asyncio.run(run(coaches, args.rounds, async_enrichment))
+        print(f"  {label:<14} p50={statistics.median(timings):8.1f} ms  "
+              f"p99={percentile(timings, 99):8.1f} ms")
+
+    server.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark del recálculo de Atleta.edad desde fecha_nacimiento
+
+Crea una base de datos de prueba (no toca la de desarrollo) con --atletas
+atletas de edad desactualizada un año y compara el recálculo fila a fila
+(leer cada atleta, calcular la edad en Python y save(), medido sobre una
+muestra y extrapolado) con AtletaDAO.recalcular_edades (UPDATE con CASE por
+bloque de edades, solo filas cambiadas). También mide una segunda pasada
+sin cambios y una pasada al día siguiente (solo los que cumplen años).
+
+Ejecutar: python benchmarks/recalcular_edades.py [--atletas 100000] [--muestra 1000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import date, timedelta
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'basketball_project.settings')
+import django
+django.setup()
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from basketball.dao.atleta_dao import AtletaDAO, calcular_edad
+from basketball.models import Atleta
+
+
+def medir(funcion):
+    with CaptureQueriesContext(connection) as consultas:
+        start = time.perf_counter()
+        resultado = funcion()
+        segundos = time.perf_counter() - start
+    return resultado, segundos, len(consultas.captured_queries)
+
+
+def fila_a_fila(hoy, muestra):
+    actualizados = 0
+    with transaction.atomic():
+        for atleta in Atleta.objects.order_by('id')[:muestra]:
+            edad = calcular_edad(atleta.fecha_nacimiento, hoy)
+            if edad != atleta.edad:
+                atleta.edad = edad
+                atleta.save()
+                actualizados += 1
+        transaction.set_rollback(True)
+    return actualizados
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--atletas', type=int, default=100000)
+    parser.add_argument('--muestra', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        rnd = random.Random(7)
+        hoy = date(2026, 10, 18)
+        atletas = []
+        for i in range(args.atletas):
+            fecha = hoy - timedelta(days=rnd.randint(5 * 365, 25 * 365))
+            # Edad cargada hace un año
+            atletas.append(Atleta(nombre_atleta='A', apellido_atleta=f'B {i}', dni=f'dni-{i}', fecha_nacimiento=fecha,
+                                  edad=calcular_edad(fecha, hoy - timedelta(days=365)), sexo='M'))
+        Atleta.objects.bulk_create(atletas, batch_size=5000)
+        print(f"{connection.vendor}, {args.atletas} atletas")
+
+        dao = AtletaDAO()
+        _, segundos, consultas = medir(lambda: fila_a_fila(hoy, args.muestra))
+        print(f"  fila a fila:         {segundos / args.muestra * args.atletas:7.2f} s estimados, "
+              f"{consultas / args.muestra:.2f} consultas/atleta")
+        for nombre, fecha in [('recalcular_edades', hoy), ('sin cambios', hoy), ('al día siguiente', hoy + timedelta(days=1))]:
+            actualizados, segundos, consultas = medir(lambda: dao.recalcular_edades(fecha))
+            print(f"  {nombre + ':':20} {segundos:7.2f} s, {consultas} consultas, {actualizados} filas escritas")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
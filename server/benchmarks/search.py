@@ -0,0 +1,94 @@
+"""
+Benchmark de GenericDAO.search con 100k atletas
+
+Crea una base de datos de prueba (no toca la de desarrollo), carga N atletas
+y compara p50/p99 de search_atletas con el backend básico (__icontains)
+y con el backend del motor (FTS5 en SQLite, pg_trgm en PostgreSQL).
+
+Ejecutar: python benchmarks/search.py [--atletas 100000] [--rounds 20]
+"""
+import os
+import sys
+import time
+import random
+import string
+import argparse
+import statistics
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'basketball_project.settings')
+import django
+django.setup()
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import setup_test_environment
+from basketball.dao import AtletaDAO
+from basketball.dao.search_backends import get_search_backend
+from basketball.models import Atleta
+
+NOMBRES = ['Juan', 'Ana', 'Luis', 'María', 'José', 'Carla', 'Pedro', 'Lucía', 'Diego', 'Sofía']
+APELLIDOS = ['Pérez', 'López', 'Gómez', 'Torres', 'Ramírez', 'Vera', 'Castro', 'Ortiz', 'Ruiz', 'Mora']
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def cargar_atletas(cantidad):
+    rnd = random.Random(42)
+    lote = []
+    for i in range(cantidad):
+        sufijo = ''.join(rnd.choices(string.ascii_lowercase, k=6))
+        lote.append(Atleta(
+            nombre_atleta=rnd.choice(NOMBRES), apellido_atleta=f'{rnd.choice(APELLIDOS)} {sufijo}',
+            dni=f'{i:010d}', email=f'atleta{i}@{sufijo}.com', fecha_nacimiento='2008-01-01',
+            edad=16, sexo=rnd.choice('MF')
+        ))
+        if len(lote) == 5000:
+            Atleta.objects.bulk_create(lote)
+            lote = []
+    Atleta.objects.bulk_create(lote)
+
+
+def medir(termino, rounds):
+    dao = AtletaDAO()
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        # Igual que la página de búsqueda: primeros 20 resultados
+        list(dao.search_atletas(termino)[:20])
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--atletas', type=int, default=100_000)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        start = time.perf_counter()
+        cargar_atletas(args.atletas)
+        print(f"{args.atletas} atletas cargados en {time.perf_counter() - start:.1f} s "
+              f"({connection.vendor}, backend auto: {get_search_backend().name})")
+
+        # Término frecuente, término raro (sufijo aleatorio), fragmento de DNI y sin resultados
+        for termino in ('pérez', 'qzx', '0000123', 'no-existe'):
+            for backend in ('basic', 'auto'):
+                with override_settings(SEARCH_BACKEND=backend):
+                    timings = medir(termino, args.rounds)
+                print(f"  {termino:<10} {backend:<6} p50={statistics.median(timings):8.2f} ms  "
+                      f"p99={percentile(timings, 99):8.2f} ms")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()